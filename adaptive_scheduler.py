@@ -0,0 +1,142 @@
+# adaptive_scheduler.py
+# 법령별 우선순위에 따라 개별 확인을 하루에 고르게 나눠 실행하는 예약 확인 계획
+#
+# 실행 주기(tick)마다 감지 엔진이 공포일자 기간 조회로 새로 공포된 법령을 확인하고,
+# 여기서 고른 법령(최대 간격에 닿는 법령 전부 + 개별 확인 시기가 된 법령 중 예정 시각이 이른 순으로 budget개)을 함께 확인한다.
+#
+#   법령별 확인 간격 = 기본 간격(마지막 공포 후 경과 기간, check_ledger) / 우선순위  (최소~최대 간격)
+#   우선순위 = 중요도(priority 컬럼: high/medium/low) × 최근 1년 개정 횟수 × 다가오는 시행일자
+#   budget = 전체 법령의 평균 확인 속도 × 주기 × catch_up_factor
+#
+# 최대 간격(CHECK_MAX_INTERVAL_HOURS)이 법령별 최대 확인 지연이다. 다음 주기까지 기다리면 최대 간격을 넘는 법령은
+# budget과 관계없이 이번 주기에 확인하고, 그 밖의 밀린 확인은 주기당 budget개까지만 나눠서 확인한다.
+# (서버가 최대 간격 이상 중단된 뒤에는 재시작 후 첫 주기에 해당 법령을 모두 확인)
+
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+from check_ledger import has_error
+
+IMPORTANCE_WEIGHTS = {'high': 2.0, 'medium': 1.0, 'low': 0.5}
+AMENDMENT_COUNT_DAYS = 365  # 개정 빈도를 계산할 기간
+
+
+class AdaptiveScheduler:
+    def __init__(self, ledger, scope, law_key, load_amendment_counts=None, tick_seconds=900,
+                 min_interval_hours=6, max_interval_hours=168, catch_up_factor=2.0, counts_ttl_hours=6):
+        """ledger: CheckLedger, scope/law_key: 감지 엔진 스키마의 run_log_code/law_key
+        load_amendment_counts(since): 법령별 개정 횟수 조회 ({법령 키: 건수}), counts_ttl_hours마다 갱신
+        """
+        self.ledger = ledger
+        self.scope = scope
+        self.law_key = law_key
+        self.load_amendment_counts = load_amendment_counts
+        self.tick_seconds = tick_seconds
+        self.min_interval = min_interval_hours * 3600
+        self.max_interval = max(min_interval_hours, max_interval_hours) * 3600
+        self.catch_up_factor = catch_up_factor
+        self.counts_ttl = counts_ttl_hours * 3600
+
+        self.last_plan = None
+        self._counts = {}
+        self._counts_loaded_at = None
+        self._lock = threading.Lock()
+
+    def plan(self, laws, now=None):
+        """이번 주기에 개별 확인할 법령 목록
+
+        최대 간격에 닿는 법령은 모두, 나머지는 오류 → 미확인 → 예정 시각이 이른 순으로 최대 budget개
+        """
+        now = now or time.time()
+        entries = self.ledger.entries(self.scope)
+        counts = self._amendment_counts(now)
+
+        due = []
+        overdue = []
+        rate = 0.0
+        for index, law in enumerate(laws):
+            key = str(self.law_key(law))
+            entry = entries.get(key)
+            interval = self.interval_seconds(law, entry, counts.get(key, 0), now)
+            rate += 1 / interval
+
+            if entry and has_error(entry) and entry['last_error_at'] + self.tick_seconds > now:
+                # 오류 후 한 주기가 지나면 다시 확인
+                continue
+            if entry and entry['last_success_at'] and entry['last_success_at'] + self.max_interval <= now + self.tick_seconds:
+                # 다음 주기까지 미루면 최대 확인 지연을 넘음
+                overdue.append(law)
+            elif entry and has_error(entry):
+                due.append((0, entry['last_error_at'], index, law))
+            elif not entry or not entry['last_success_at']:
+                due.append((1, 0.0, index, law))
+            elif entry['last_success_at'] + interval <= now:
+                due.append((2, entry['last_success_at'] + interval, index, law))
+
+        budget = max(1, math.ceil(rate * self.tick_seconds * self.catch_up_factor))
+        due.sort(key=lambda item: item[:3])
+        selected = overdue + [law for _, _, _, law in due[:budget]]
+
+        self.last_plan = {
+            'planned_at': datetime.fromtimestamp(now).isoformat(),
+            'laws': len(laws),
+            'due': len(due) + len(overdue),
+            'overdue': len(overdue),
+            'budget': budget,
+            'selected': len(selected),
+            'checks_per_day': round(rate * 86400, 1)
+        }
+        return selected
+
+    def interval_seconds(self, law, entry, amendment_count=0, now=None):
+        """법령별 개별 확인 간격 (초)"""
+        if entry and entry['amend_date']:
+            base = self.ledger.interval_seconds(entry['amend_date'], now)
+        else:
+            # 아직 확인하지 않은 법령은 가장 짧은 기본 간격으로 계산 (첫 확인을 하루 안에 나눠서 끝내도록)
+            base = self.ledger.min_interval_hours * 3600
+
+        interval = base / self.priority(law, entry, amendment_count, now)
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def priority(self, law, entry, amendment_count=0, now=None):
+        """우선순위 (1이 보통, 클수록 자주 확인)"""
+        weight = IMPORTANCE_WEIGHTS.get(str(law.get('priority') or 'medium').lower(), 1.0)
+        weight *= 1 + min(amendment_count, 4) * 0.5
+
+        days = _days_until(entry['enf_date'] if entry else None, now)
+        if days is not None and 0 <= days <= 7:
+            weight *= 3
+        elif days is not None and 0 <= days <= 30:
+            weight *= 2
+        return weight
+
+    def status(self):
+        return self.last_plan
+
+    def _amendment_counts(self, now):
+        """법령별 최근 개정 횟수 (counts_ttl마다 다시 조회, 실패 시 이전 값 사용)"""
+        if not self.load_amendment_counts:
+            return {}
+
+        with self._lock:
+            if self._counts_loaded_at is not None and now - self._counts_loaded_at < self.counts_ttl:
+                return self._counts
+
+            try:
+                self._counts = self.load_amendment_counts(datetime.fromtimestamp(now) - timedelta(days=AMENDMENT_COUNT_DAYS))
+            except Exception as e:
+                print(f"⚠️ 개정 횟수 조회 실패 (이전 값 사용): {e}")
+            self._counts_loaded_at = now
+            return self._counts
+
+
+def _days_until(date_str, now=None):
+    """YYYYMMDD 날짜까지 남은 일수 (지났으면 음수, 알 수 없으면 None)"""
+    try:
+        target = datetime.strptime(str(date_str)[:8], '%Y%m%d')
+    except (TypeError, ValueError):
+        return None
+    return (target - datetime.fromtimestamp(now or time.time())).days
@@ -1,25 +1,23 @@
 # ai_analyzer.py
+import hashlib
+import re
+import time
 from anthropic import Anthropic
-from config import CLAUDE_API_KEY
+from analysis_cache import AnalysisCache
+from metrics import registry
+from config import (
+    CLAUDE_API_KEY, ANALYSIS_CACHE_ENABLED, ANALYSIS_CACHE_PATH,
+    ANALYSIS_BATCH_TOKEN_BUDGET, ANALYSIS_BATCH_MAX_ITEMS
+)
 
-class AIAnalyzer:
-    def __init__(self):
-        if not CLAUDE_API_KEY:
-            print("경고: Claude API Key가 설정되지 않았습니다.")
-            self.client = None
-        else:
-            self.client = Anthropic(api_key=CLAUDE_API_KEY)
-    
-    def analyze_amendment(self, law_name, amendment_content, law_type="산업안전보건"):
-        """법령 개정 내용 분석"""
-        if not self.client:
-            return {
-                'summary': '(AI 분석 비활성화) 개정 내용을 확인하세요.',
-                'impact_analysis': '',
-                'tasks': []
-            }
-        
-        prompt = f"""
+MODEL = "claude-sonnet-4-20250514"
+
+# 분석 1건의 최대 응답 토큰 (묶음 요청은 건수만큼 늘림)
+MAX_TOKENS_PER_ANALYSIS = 2000
+# 묶음 요청 1회의 최대 응답 토큰 (스트리밍 없이 요청할 수 있는 범위), 묶음 건수도 이 한도로 제한
+BATCH_MAX_TOKENS = 16000
+
+PROMPT_TEMPLATE = """
 당신은 {law_type} 전문가입니다. 의왕도시공사 안전감사팀을 위해 법령 개정 내용을 분석해주세요.
 
 **법령명**: {law_name}
@@ -39,22 +37,115 @@ class AIAnalyzer:
 
 간결하고 실무적으로 작성해주세요.
 """
+
+# 여러 개정 내용을 한 번에 분석할 때 사용 (지시문은 한 번만 포함)
+BATCH_PROMPT_TEMPLATE = """
+당신은 {law_type} 전문가입니다. 의왕도시공사 안전감사팀을 위해 아래 {count}건의 법령 개정 내용을 각각 분석해주세요.
+
+{amendments}
+
+각 개정 건마다 반드시 "### 결과 [번호]" 줄로 시작하여 다음 형식으로 분석해주세요:
+
+1. **주요 변경사항 요약** (3-5줄로 핵심만)
+2. **공사 업무에 미치는 영향** (구체적으로)
+3. **필요한 후속 조치** (우선순위별로, 각 항목은 "-"로 시작)
+   - 매뉴얼/절차서 수정 필요 사항
+   - 직원 교육 필요 사항
+   - ISO 문서 개정 필요 사항
+   - 시설물 점검 항목 변경 사항
+
+간결하고 실무적으로 작성해주세요.
+"""
+
+BATCH_ITEM_TEMPLATE = """### 개정 [{number}]
+**법령명**: {law_name}
+
+**개정 내용**:
+{amendment_content}
+"""
+
+BATCH_RESULT_HEADER = re.compile(r'^\W*결과\s*\[(\d+)\]', re.M)
+
+# 프롬프트가 바뀌면 버전이 달라져 이전 분석 결과 캐시가 무효화됨
+PROMPT_VERSION = hashlib.sha256((PROMPT_TEMPLATE + BATCH_PROMPT_TEMPLATE + BATCH_ITEM_TEMPLATE).encode('utf-8')).hexdigest()[:12]
+
+class AIAnalyzer:
+    def __init__(self, use_cache=ANALYSIS_CACHE_ENABLED):
+        if not CLAUDE_API_KEY:
+            print("경고: Claude API Key가 설정되지 않았습니다.")
+            self.client = None
+        else:
+            self.client = Anthropic(api_key=CLAUDE_API_KEY)
         
+        self.cache = self._create_cache() if use_cache else None
+    
+    def _create_cache(self):
+        """분석 결과 캐시 생성 (이전 프롬프트 버전 결과는 삭제)"""
         try:
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            cache = AnalysisCache(ANALYSIS_CACHE_PATH)
+            removed = cache.invalidate(keep_prompt_version=PROMPT_VERSION)
+            if removed:
+                print(f"프롬프트 변경으로 이전 분석 결과 {removed}건을 삭제했습니다.")
+            return cache
+        except Exception as e:
+            print(f"분석 결과 캐시 사용 불가: {e}")
+            return None
+    
+    def cache_stats(self):
+        """분석 결과 캐시 적중/미적중 통계"""
+        return self.cache.stats() if self.cache else None
+    
+    def get_cached_analysis(self, law_name, amendment_content, law_type="산업안전보건"):
+        """저장된 분석 결과 조회 (없으면 None)"""
+        if not self.cache:
+            return None
+        
+        cache_key = AnalysisCache.make_key(law_name, law_type, amendment_content, PROMPT_VERSION, MODEL)
+        return self.cache.get(cache_key)
+    
+    def analyze_amendment(self, law_name, amendment_content, law_type="산업안전보건",
+                          raise_errors=False, check_cache=True):
+        """법령 개정 내용 분석 (같은 입력은 저장된 결과 사용)
+
+        raise_errors=True이면 API 오류를 오류 요약으로 바꾸지 않고 그대로 발생시킨다. (재시도용)
+        """
+        if check_cache:
+            cached = self.get_cached_analysis(law_name, amendment_content, law_type)
+            if cached:
+                return cached
+        
+        if not self.client:
+            return {
+                'summary': '(AI 분석 비활성화) 개정 내용을 확인하세요.',
+                'impact_analysis': '',
+                'tasks': []
+            }
+        
+        prompt = PROMPT_TEMPLATE.format(
+            law_type=law_type,
+            law_name=law_name,
+            amendment_content=amendment_content
+        )
+        
+        try:
+            message = self._create_message(prompt, max_tokens=MAX_TOKENS_PER_ANALYSIS, mode='single')
             
             response_text = message.content[0].text
             
             # 응답 파싱
-            return self._parse_analysis(response_text)
+            analysis = self._parse_analysis(response_text)
+            
+            # 응답 길이 한도에서 잘린 분석은 저장하지 않음 (다음에 다시 분석)
+            if self._is_truncated(message):
+                print(f"⚠️  AI 분석 응답이 길이 한도에서 잘렸습니다: {law_name}")
+            else:
+                self._store_analysis(law_name, amendment_content, law_type, analysis)
+            
+            return analysis
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"AI 분석 오류: {e}")
             return {
                 'summary': f'분석 오류: {str(e)}',
@@ -62,6 +153,149 @@ class AIAnalyzer:
                 'tasks': []
             }
     
+    def analyze_batch(self, items, law_type="산업안전보건", token_budget=None, max_items=None):
+        """여러 개정 내용을 묶어서 분석
+
+        items: [{'law_name': ..., 'content': ...}] 순서대로 분석 결과 목록을 반환한다.
+        묶음 응답에서 결과를 찾지 못한 항목은 개별 요청으로 다시 분석한다.
+        """
+        token_budget = token_budget or ANALYSIS_BATCH_TOKEN_BUDGET
+        max_items = min(max_items or ANALYSIS_BATCH_MAX_ITEMS, BATCH_MAX_TOKENS // MAX_TOKENS_PER_ANALYSIS)
+        results = [None] * len(items)
+        
+        # 저장된 결과 먼저 사용
+        pending = []
+        for i, item in enumerate(items):
+            cached = self.get_cached_analysis(item['law_name'], item['content'], law_type)
+            if cached:
+                results[i] = cached
+            else:
+                pending.append(i)
+        
+        if not self.client:
+            for i in pending:
+                results[i] = self.analyze_amendment(items[i]['law_name'], items[i]['content'], law_type, check_cache=False)
+            return results
+        
+        for group in self._pack_batches(items, pending, token_budget, max_items):
+            if len(group) > 1:
+                parsed = self._request_batch([items[i] for i in group], law_type)
+                for i, analysis in zip(group, parsed):
+                    if analysis:
+                        results[i] = analysis
+                        self._store_analysis(items[i]['law_name'], items[i]['content'], law_type, analysis)
+            
+            # 묶음으로 처리하지 못한 항목은 개별 요청
+            for i in group:
+                if results[i] is None:
+                    results[i] = self.analyze_amendment(
+                        items[i]['law_name'], items[i]['content'], law_type, check_cache=False
+                    )
+        
+        return results
+    
+    def _pack_batches(self, items, indexes, token_budget, max_items):
+        """예상 토큰 수가 token_budget을 넘지 않도록 묶음 구성"""
+        groups = []
+        current = []
+        current_tokens = 0
+        
+        for i in indexes:
+            tokens = self._estimate_tokens(items[i]['content']) + self._estimate_tokens(items[i]['law_name'])
+            if current and (current_tokens + tokens > token_budget or len(current) >= max_items):
+                groups.append(current)
+                current = []
+                current_tokens = 0
+            current.append(i)
+            current_tokens += tokens
+        
+        if current:
+            groups.append(current)
+        return groups
+    
+    def _request_batch(self, batch, law_type):
+        """묶음 요청 후 항목별 결과 목록 반환 (찾지 못했거나 응답이 잘린 항목은 None)"""
+        amendments = '\n'.join(
+            BATCH_ITEM_TEMPLATE.format(
+                number=number,
+                law_name=item['law_name'],
+                amendment_content=item['content']
+            )
+            for number, item in enumerate(batch, 1)
+        )
+        prompt = BATCH_PROMPT_TEMPLATE.format(law_type=law_type, count=len(batch), amendments=amendments)
+        
+        try:
+            # 항목마다 개별 요청과 같은 응답 토큰 한도
+            message = self._create_message(prompt, max_tokens=MAX_TOKENS_PER_ANALYSIS * len(batch), mode='batch')
+            truncated = self._is_truncated(message)
+            if truncated:
+                print("⚠️  AI 묶음 분석 응답이 길이 한도에서 잘려 마지막 항목은 개별 분석으로 전환합니다.")
+            return self._split_batch_response(message.content[0].text, len(batch), truncated=truncated)
+        except Exception as e:
+            print(f"AI 묶음 분석 오류 (개별 분석으로 전환): {e}")
+            return [None] * len(batch)
+    
+    def _create_message(self, prompt, max_tokens, mode):
+        """API 요청 (응답 시간/사용 토큰 기록)"""
+        started = time.perf_counter()
+        try:
+            message = self.client.messages.create(
+                model=MODEL,
+                max_tokens=max_tokens,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+        except Exception:
+            registry.counter('ai_analysis_errors_total', 'AI 분석 요청 오류 수').inc(mode=mode)
+            raise
+        finally:
+            registry.histogram('ai_analysis_seconds', 'AI 분석 요청 시간').observe(time.perf_counter() - started, mode=mode)
+        
+        usage = getattr(message, 'usage', None)
+        if usage is not None:
+            tokens = registry.counter('ai_tokens_total', 'AI 분석 사용 토큰 수')
+            tokens.inc(getattr(usage, 'input_tokens', 0) or 0, type='input', mode=mode)
+            tokens.inc(getattr(usage, 'output_tokens', 0) or 0, type='output', mode=mode)
+        return message
+    
+    def _split_batch_response(self, response_text, count, truncated=False):
+        """'결과 [번호]' 단위로 응답을 나눠 항목별로 파싱
+
+        truncated=True(응답 길이 한도 도달)이면 응답 끝까지 이어지는 마지막 항목은 완성되지 않은 것으로 보고 제외한다.
+        """
+        results = [None] * count
+        headers = list(BATCH_RESULT_HEADER.finditer(response_text))
+        
+        for h, header in enumerate(headers):
+            number = int(header.group(1))
+            if not 1 <= number <= count or results[number - 1]:
+                continue
+            if truncated and h == len(headers) - 1:
+                break
+            
+            end = headers[h + 1].start() if h + 1 < len(headers) else len(response_text)
+            analysis = self._parse_analysis(response_text[header.end():end])
+            if analysis['summary']:
+                results[number - 1] = analysis
+        
+        return results
+    
+    def _is_truncated(self, message):
+        """응답이 최대 토큰 수에서 끊겼는지"""
+        return getattr(message, 'stop_reason', None) == 'max_tokens'
+    
+    def _store_analysis(self, law_name, amendment_content, law_type, analysis):
+        """분석 결과 캐시에 저장"""
+        if self.cache:
+            cache_key = AnalysisCache.make_key(law_name, law_type, amendment_content, PROMPT_VERSION, MODEL)
+            self.cache.put(cache_key, PROMPT_VERSION, MODEL, analysis)
+    
+    def _estimate_tokens(self, text):
+        """토큰 수 추정 (한글 기준 보수적으로 1글자 = 1토큰)"""
+        return len(text or '')
+    
     def _parse_analysis(self, response_text):
         """AI 응답 파싱"""
         lines = response_text.split('\n')
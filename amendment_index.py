@@ -0,0 +1,68 @@
+# amendment_index.py
+# 기존 개정 이력 중복 확인용 메모리 인덱스
+
+import threading
+
+
+class AmendmentIndex:
+    def __init__(self, supabase, key_column, date_column, date_format='%Y-%m-%d', table='law_amendments'):
+        self.supabase = supabase
+        self.table = table
+        self.key_column = key_column
+        self.date_column = date_column
+        self.date_format = date_format
+        self._keys = set()
+        self._lock = threading.Lock()
+
+    def load(self, start_date, end_date, page_size=1000):
+        """기간 내 (법령 키, 날짜) 목록을 한 번에 읽어옴"""
+        offset = 0
+        loaded = 0
+
+        while True:
+            result = self.supabase.table(self.table)\
+                .select(f'{self.key_column},{self.date_column}')\
+                .gte(self.date_column, start_date.strftime(self.date_format))\
+                .lte(self.date_column, end_date.strftime(self.date_format))\
+                .range(offset, offset + page_size - 1)\
+                .execute()
+
+            rows = result.data or []
+            with self._lock:
+                for row in rows:
+                    self._keys.add(self._make_key(row.get(self.key_column), row.get(self.date_column)))
+
+            loaded += len(rows)
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+        return loaded
+
+    def add(self, key, date):
+        """이번 실행에서 저장한 개정 이력 추가"""
+        with self._lock:
+            self._keys.add(self._make_key(key, date))
+
+    def claim(self, key, date):
+        """없으면 추가하고 True, 이미 있으면 False (동시 실행 시 중복 저장 방지)"""
+        index_key = self._make_key(key, date)
+        with self._lock:
+            if index_key in self._keys:
+                return False
+            self._keys.add(index_key)
+            return True
+
+    def discard(self, key, date):
+        """저장에 실패한 항목을 다시 저장할 수 있도록 제거"""
+        with self._lock:
+            self._keys.discard(self._make_key(key, date))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._keys)
+
+    def _make_key(self, key, date):
+        """날짜 형식(2024-01-09 / 20240109)과 관계없이 같은 키 생성"""
+        digits = ''.join(ch for ch in str(date or '') if ch.isdigit())[:8]
+        return (str(key), digits)
@@ -0,0 +1,81 @@
+# analysis_cache.py
+# AI 분석 결과 캐시 (법령명/유형/내용/프롬프트 버전/모델 해시 기준)
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class AnalysisCache:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS analyses (
+                key TEXT PRIMARY KEY,
+                prompt_version TEXT NOT NULL,
+                model TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(law_name, law_type, content, prompt_version, model):
+        """분석 입력 전체의 해시"""
+        payload = json.dumps(
+            [law_name, law_type, content, prompt_version, model],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """저장된 분석 결과 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute('SELECT result FROM analyses WHERE key = ?', (key,)).fetchone()
+            self._stats['hits' if row else 'misses'] += 1
+
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, prompt_version, model, result):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO analyses (key, prompt_version, model, result, created_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, prompt_version, model, json.dumps(result, ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
+
+    def invalidate(self, keep_prompt_version=None):
+        """프롬프트 버전이 다른 결과 삭제 (버전을 지정하지 않으면 전체 삭제), 삭제 건수 반환"""
+        with self._lock:
+            if keep_prompt_version is None:
+                cursor = self._conn.execute('DELETE FROM analyses')
+            else:
+                cursor = self._conn.execute(
+                    'DELETE FROM analyses WHERE prompt_version != ?',
+                    (keep_prompt_version,)
+                )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = self._conn.execute('SELECT COUNT(*) FROM analyses').fetchone()[0]
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
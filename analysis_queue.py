@@ -0,0 +1,121 @@
+# analysis_queue.py
+# 모니터링과 분리된 AI 분석 작업 큐 (동시 실행 수/요청 속도 제한, 재시도)
+
+import queue
+import threading
+import time
+
+# 분석이 끝나기 전 저장된 개정 이력의 요약 값
+ANALYSIS_PENDING_SUMMARY = '(AI 분석 대기중)'
+
+
+class AnalysisQueue:
+    def __init__(self, analyzer, on_complete, on_failure=None, workers=2,
+                 requests_per_minute=30, max_retries=3, backoff_seconds=2.0):
+        self.analyzer = analyzer
+        self.on_complete = on_complete
+        self.on_failure = on_failure
+        self.workers = workers
+        self.min_interval = 60.0 / requests_per_minute if requests_per_minute else 0
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+        self._queue = queue.Queue()
+        self._threads = []
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+    def start(self):
+        """작업자 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._threads:
+            return
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"analysis-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, job):
+        """분석 작업 추가
+
+        job: {'law_name', 'content', 'law_type'(선택)} + 완료 콜백에서 사용할 값
+        """
+        self._queue.put(job)
+
+    def pending_count(self):
+        return self._queue.qsize()
+
+    def join(self):
+        """대기 중인 작업이 모두 끝날 때까지 대기"""
+        self._queue.join()
+
+    def stop(self):
+        """남은 작업을 처리한 뒤 작업자 종료"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._process(job)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, job):
+        """재시도(지수 백오프)하며 분석 후 콜백 호출"""
+        last_error = None
+
+        # 이미 분석된 내용은 요청 속도 제한 없이 바로 처리
+        cached = self.analyzer.get_cached_analysis(job['law_name'], job['content'], job.get('law_type', '산업안전보건'))
+        if cached:
+            self._run_callback(self.on_complete, job, cached)
+            return
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+
+            self._wait_for_rate_limit()
+            try:
+                analysis = self.analyzer.analyze_amendment(
+                    job['law_name'],
+                    job['content'],
+                    job.get('law_type', '산업안전보건'),
+                    raise_errors=True,
+                    check_cache=False
+                )
+            except Exception as e:
+                last_error = e
+                print(f"  ⚠️  [{job['law_name']}] AI 분석 실패 ({attempt + 1}/{self.max_retries + 1}회): {e}")
+                continue
+
+            self._run_callback(self.on_complete, job, analysis)
+            return
+
+        if self.on_failure:
+            self._run_callback(self.on_failure, job, last_error)
+
+    def _run_callback(self, callback, job, value):
+        try:
+            callback(job, value)
+        except Exception as e:
+            print(f"  ❌ [{job['law_name']}] 분석 결과 저장 오류: {e}")
+
+    def _wait_for_rate_limit(self):
+        """요청 간 최소 간격 유지"""
+        if not self.min_interval:
+            return
+
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.min_interval
+
+        if wait > 0:
+            time.sleep(wait)
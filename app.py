@@ -1,49 +1,84 @@
-from flask import Flask, send_from_directory, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import os
-from datetime import datetime, timedelta
+import atexit
+import base64
+import json
+import threading
+import time
+from datetime import datetime
 from supabase import create_client, Client
-import requests
-import xml.etree.ElementTree as ET
 from apscheduler.schedulers.background import BackgroundScheduler
+from law_api import LawAPI
+from detection_engine import DetectionEngine, MonitoredLawsSchema
+from adaptive_scheduler import AdaptiveScheduler
+import web_assets
+import metrics
+from config import (
+    METRICS_RUNS_PATH, CHECK_MIN_INTERVAL_HOURS, CHECK_MAX_INTERVAL_HOURS,
+    SCHEDULE_TICK_MINUTES, SCHEDULE_CATCH_UP_FACTOR
+)
+from jobs import JobManager, MemoryJobStore, SupabaseJobStore
+from lease import FileLease, SupabaseLease, LeaseKeeper
+import tempfile
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['X-Next-Cursor'])
+web_assets.init_app(app)  # 응답 압축 + ETag(304)
 
 # 환경 변수
 SUPABASE_URL = os.environ.get('SUPABASE_URL', '')
 SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '')
 LAW_API_KEY = os.environ.get('LAW_API_KEY', '')
+SCHEDULER_LEASE_BACKEND = os.environ.get('SCHEDULER_LEASE_BACKEND', 'auto')  # auto / supabase / file
+SCHEDULER_LEASE_FILE = os.environ.get('SCHEDULER_LEASE_FILE', os.path.join(tempfile.gettempdir(), 'law_monitor_scheduler.lease'))
+SCHEDULER_LEASE_TTL = int(os.environ.get('SCHEDULER_LEASE_TTL', '60'))  # 실행 담당 프로세스가 갱신하지 못하면 다른 프로세스가 이어받기까지의 시간 (초)
+JOB_STORE_BACKEND = os.environ.get('JOB_STORE_BACKEND', 'auto')  # auto / supabase / memory
+JOB_STALE_SECONDS = int(os.environ.get('JOB_STALE_SECONDS', '120'))  # 실행 중인 작업의 갱신이 멈추면 실패 처리하기까지의 시간 (초)
+STATS_CACHE_TTL = int(os.environ.get('STATS_CACHE_TTL', '60'))  # 통계 캐시 유지 시간 (초)
+STATS_RPC_RETRY_SECONDS = int(os.environ.get('STATS_RPC_RETRY_SECONDS', '3600'))  # dashboard_stats 함수가 없을 때 다시 확인하기까지의 시간 (초)
+
+# 개정 이력 목록에서 조회할 수 있는 컬럼 (원문/AI 분석 등 긴 텍스트는 상세 조회에서만 제공)
+AMENDMENT_LIST_FIELDS = ('id', 'law_name', '공포일자', '시행일자', '개정유형', '내용요약', '읽음여부', '알림발송여부')
+AMENDMENT_PAGE_SIZE = 50
+AMENDMENT_MAX_PAGE_SIZE = 200
 
 # Supabase 클라이언트
 supabase: Client = None
 if SUPABASE_URL and SUPABASE_KEY:
     try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = metrics.InstrumentedSupabase(create_client(SUPABASE_URL, SUPABASE_KEY))
         print("✅ Supabase 연결 성공")
     except Exception as e:
         print(f"❌ Supabase 연결 실패: {e}")
 
+# 개정사항 확인 작업 (스케줄러/수동 실행 모두 모든 작업자를 통틀어 한 번에 하나만 실행)
+# check_jobs 테이블(sql/check_jobs.sql)에 기록하여 어느 작업자에서나 진행 상황 조회
+if JOB_STORE_BACKEND in ('auto', 'supabase') and supabase:
+    jobs = JobManager(SupabaseJobStore(supabase, stale_seconds=JOB_STALE_SECONDS))
+else:
+    jobs = JobManager(MemoryJobStore())
+
 # 메인 페이지
 @app.route('/')
 def index():
     try:
-        return send_from_directory('dashboard', 'index.html')
+        return web_assets.index_response('dashboard')
     except:
-        return send_from_directory('.', 'index.html')
+        return web_assets.index_response('.')
 
-# 정적 파일 서빙
+# 정적 파일 서빙 (index.html의 ?v=해시 URL로 요청하면 장기 캐시)
 @app.route('/dashboard/<path:path>')
 def send_dashboard(path):
-    return send_from_directory('dashboard', path)
+    return web_assets.static_response('dashboard', path)
 
 @app.route('/<path:path>')
 def send_static(path):
     try:
-        return send_from_directory('dashboard', path)
+        return web_assets.static_response('dashboard', path)
     except:
         try:
-            return send_from_directory('.', path)
+            return web_assets.static_response('.', path)
         except:
             return jsonify({'error': 'File not found'}), 404
 
@@ -54,9 +89,21 @@ def health():
         'status': 'ok',
         'timestamp': datetime.now().isoformat(),
         'supabase': 'configured' if supabase else 'not configured',
-        'api_key': 'configured' if LAW_API_KEY else 'not configured'
+        'api_key': 'configured' if LAW_API_KEY else 'not configured',
+        'jobs': jobs.store.backend,
+        'scheduler': {
+            'running': scheduler.running,
+            'tick_minutes': SCHEDULE_TICK_MINUTES,
+            'last_plan': _adaptive_scheduler.status() if _adaptive_scheduler else None,
+            'lease': scheduler_lease.status() if scheduler_lease else None
+        }
     })
 
+# Prometheus 측정값 (이 서버 프로세스에서 수집된 값)
+@app.route('/metrics')
+def get_metrics():
+    return Response(metrics.registry.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
 # API: 모니터링 법령 목록 조회
 @app.route('/api/monitored-laws', methods=['GET'])
 def get_monitored_laws():
@@ -78,6 +125,7 @@ def add_monitored_law():
         
         data = request.json
         response = supabase.table('monitored_laws').insert(data).execute()
+        invalidate_stats_cache()
         return jsonify(response.data), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -90,28 +138,100 @@ def delete_monitored_law(law_id):
             return jsonify({'error': 'Supabase not configured'}), 500
         
         response = supabase.table('monitored_laws').update({'is_active': False}).eq('id', law_id).execute()
+        invalidate_stats_cache()
         return jsonify(response.data)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # API: 개정 이력 조회
+# 쿼리 파라미터:
+#   limit   - 페이지 크기 (기본 50, 최대 200)
+#   cursor  - 이전 응답의 X-Next-Cursor 헤더 값 (다음 페이지)
+#   fields  - 조회할 컬럼 (쉼표 구분, AMENDMENT_LIST_FIELDS 중에서)
+#   law     - 법령명
+#   from/to - 공포일자 범위 (YYYYMMDD)
+#   read    - true/false (읽음 여부), unread_only=true는 read=false와 같음
 @app.route('/api/amendments', methods=['GET'])
 def get_amendments():
     try:
         if not supabase:
             return jsonify({'error': 'Supabase not configured'}), 500
         
-        unread_only = request.args.get('unread_only', 'false').lower() == 'true'
+        try:
+            fields = _parse_amendment_fields(request.args.get('fields'))
+            limit = min(max(int(request.args.get('limit', AMENDMENT_PAGE_SIZE)), 1), AMENDMENT_MAX_PAGE_SIZE)
+            cursor = _decode_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        query = supabase.table('law_amendments').select('*')
-        if unread_only:
-            query = query.eq('읽음여부', False)
+        query = supabase.table('law_amendments').select(','.join(fields))
         
-        response = query.order('공포일자', desc=True).limit(50).execute()
-        return jsonify(response.data)
+        read = request.args.get('read')
+        if request.args.get('unread_only', 'false').lower() == 'true':
+            read = 'false'
+        if read is not None:
+            query = query.eq('읽음여부', read.lower() == 'true')
+        if request.args.get('law'):
+            query = query.eq('law_name', request.args['law'])
+        if request.args.get('from'):
+            query = query.gte('공포일자', request.args['from'])
+        if request.args.get('to'):
+            query = query.lte('공포일자', request.args['to'])
+        
+        # (공포일자, id) 기준 키셋 페이지네이션: 이전 페이지 마지막 행 다음부터 조회
+        # 공포일자가 없는 행은 맨 뒤에 id 순으로 (커서의 공포일자가 null이면 null 행 안에서 이어서 조회)
+        if cursor:
+            last_date, last_id = cursor
+            if last_date is None:
+                query = query.is_('공포일자', 'null').lt('id', last_id)
+            else:
+                query = query.or_(f'공포일자.lt.{last_date},and(공포일자.eq.{last_date},id.lt.{last_id}),공포일자.is.null')
+        
+        response = query.order('공포일자', desc=True, nullsfirst=False)\
+            .order('id', desc=True)\
+            .limit(limit + 1)\
+            .execute()
+        rows = response.data
+        
+        result = jsonify(rows[:limit])
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            result.headers['X-Next-Cursor'] = _encode_cursor(last['공포일자'], last['id'])
+        return result
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _parse_amendment_fields(value):
+    """fields 파라미터 검증 (페이지네이션에 필요한 id/공포일자는 항상 포함)"""
+    if not value:
+        return list(AMENDMENT_LIST_FIELDS)
+    
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in AMENDMENT_LIST_FIELDS]
+    if unknown:
+        raise ValueError(f"조회할 수 없는 컬럼: {', '.join(unknown)} (상세 내용은 /api/amendments/<id>에서 조회)")
+    
+    for required in ('공포일자', 'id'):
+        if required not in fields:
+            fields.insert(0, required)
+    return fields
+
+def _encode_cursor(amendment_date, amendment_id):
+    payload = json.dumps([amendment_date, amendment_id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def _decode_cursor(token):
+    if not token:
+        return None
+    try:
+        amendment_date, amendment_id = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+    except Exception:
+        raise ValueError('잘못된 cursor 값')
+    # PostgREST 필터 문법을 깨뜨리는 값 방지
+    if any(ch in str(value) for value in (amendment_date, amendment_id) for ch in ',()'):
+        raise ValueError('잘못된 cursor 값')
+    return amendment_date, amendment_id
+
 # API: 개정 상세 조회
 @app.route('/api/amendments/<amendment_id>', methods=['GET'])
 def get_amendment_detail(amendment_id):
@@ -132,26 +252,65 @@ def mark_amendment_read(amendment_id):
             return jsonify({'error': 'Supabase not configured'}), 500
         
         response = supabase.table('law_amendments').update({'읽음여부': True}).eq('id', amendment_id).execute()
+        invalidate_stats_cache()
         return jsonify(response.data)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # API: 수동 개정 체크 (GET과 POST 모두 지원)
+# 확인 작업을 백그라운드에서 시작하고 바로 작업 ID 반환 (이미 실행 중이면 실행 중인 작업 반환)
 @app.route('/api/check-amendments', methods=['GET', 'POST'])
 def manual_check_amendments():
     try:
-        count = check_law_amendments()
+        job, started = start_check_job(trigger='manual')
         return jsonify({
             'success': True,
-            'message': f'{count}건의 신규 개정사항을 발견했습니다.',
-            'count': count
-        })
+            'message': '개정사항 확인을 시작했습니다.' if started else '이미 실행 중인 확인 작업이 있습니다.',
+            'job_id': job['id'],
+            'status_url': f"/api/check-amendments/{job['id']}",
+            'job': job
+        }), 202
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+# API: 개정 체크 작업 진행 상황
+@app.route('/api/check-amendments/<job_id>', methods=['GET'])
+def check_amendments_status(job_id):
+    try:
+        job = jobs.get(job_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+def start_check_job(trigger):
+    """개정사항 확인 작업 시작 (결과: {'count': 신규 개정 수}, 예약 실행은 이번 주기 분량만 확인)
+
+    수동 실행도 예약 실행과 같은 작업 기록(check_jobs)으로 시작하므로, 다른 작업자에서 실행 중인 작업이 있으면
+    새로 시작하지 않고 그 작업을 반환한다.
+    """
+    scheduled = trigger == 'scheduler'
+    
+    def submit():
+        return jobs.submit(
+            'check_amendments',
+            lambda progress: {'count': check_law_amendments(progress, scheduled=scheduled)},
+            trigger=trigger
+        )
+    
+    try:
+        return submit()
+    except Exception as e:
+        if JOB_STORE_BACKEND != 'auto' or jobs.store.backend != 'supabase' or not _is_missing_function(e):
+            raise
+        print(f"⚠️ check_jobs 사용 불가, 이 프로세스에서만 작업 관리: {e}")
+        jobs.store = MemoryJobStore()
+        return submit()
+
 # API: 통계
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
@@ -159,138 +318,242 @@ def get_stats():
         if not supabase:
             return jsonify({'error': 'Supabase not configured'}), 500
         
-        # 모니터링 법령 수
-        laws_response = supabase.table('monitored_laws').select('*', count='exact').eq('is_active', True).execute()
-        laws_count = laws_response.count if laws_response.count else 0
-        
-        # 미확인 개정 수
-        unread_response = supabase.table('law_amendments').select('*', count='exact').eq('읽음여부', False).execute()
-        unread_count = unread_response.count if unread_response.count else 0
+        with _stats_cache['lock']:
+            if _stats_cache['value'] is None or time.time() >= _stats_cache['expires_at']:
+                _stats_cache['value'] = _compute_stats()
+                _stats_cache['expires_at'] = time.time() + STATS_CACHE_TTL
+            stats = _stats_cache['value']
         
-        # 총 개정 이력
-        total_response = supabase.table('law_amendments').select('*', count='exact').execute()
-        total_count = total_response.count if total_response.count else 0
-        
-        return jsonify({
-            'monitored_laws': laws_count,
-            'unread_amendments': unread_count,
-            'total_amendments': total_count
-        })
+        return jsonify(stats)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-# 법령 개정 자동 체크 함수
-def check_law_amendments():
-    """법제처 API를 통해 법령 개정사항 확인"""
+# 통계 캐시 (개정사항 확인/읽음 처리/법령 추가·삭제 시 초기화)
+_stats_cache = {'value': None, 'expires_at': 0.0, 'rpc_retry_at': 0.0, 'lock': threading.Lock()}
+
+def invalidate_stats_cache():
+    with _stats_cache['lock']:
+        _stats_cache['value'] = None
+
+def _compute_stats():
+    """통계 집계 (sql/dashboard_stats.sql 함수로 한 번에 조회, 없으면 행 없이 개수만 조회)"""
+    if time.time() >= _stats_cache['rpc_retry_at']:
+        try:
+            data = supabase.rpc('dashboard_stats').execute().data
+            if isinstance(data, list):
+                data = data[0] if data else None
+            if data:
+                return {
+                    'monitored_laws': data.get('monitored_laws') or 0,
+                    'unread_amendments': data.get('unread_amendments') or 0,
+                    'total_amendments': data.get('total_amendments') or 0
+                }
+        except Exception as e:
+            # 함수가 없을 때만 한동안 개별 집계 사용 (일시적인 오류는 이번 집계만 개별 집계)
+            if _is_missing_function(e):
+                print(f"⚠️ dashboard_stats 함수 없음, {STATS_RPC_RETRY_SECONDS}초 동안 개별 집계 사용: {e}")
+                _stats_cache['rpc_retry_at'] = time.time() + STATS_RPC_RETRY_SECONDS
+            else:
+                print(f"⚠️ dashboard_stats 함수 호출 실패, 이번 통계는 개별 집계: {e}")
+    
+    # 모니터링 법령 수 / 미확인 개정 수 / 총 개정 이력 (head=True: 행은 받지 않고 개수만)
+    laws_response = supabase.table('monitored_laws').select('id', count='exact', head=True).eq('is_active', True).execute()
+    unread_response = supabase.table('law_amendments').select('id', count='exact', head=True).eq('읽음여부', False).execute()
+    total_response = supabase.table('law_amendments').select('id', count='exact', head=True).execute()
+    
+    return {
+        'monitored_laws': laws_response.count or 0,
+        'unread_amendments': unread_response.count or 0,
+        'total_amendments': total_response.count or 0
+    }
+
+def _is_missing_function(error):
+    """Supabase(PostgREST)에 호출한 DB 함수가 없다는 오류인지 (PGRST202 / 404)"""
+    code = getattr(error, 'code', None)
+    if code in ('PGRST202', '42883', 404, '404'):
+        return True
+    return 'PGRST202' in str(error) or 'Could not find the function' in str(error)
+
+# 법령 개정 자동 체크 함수 (monitor.py와 같은 감지 엔진 사용)
+_detection_engine = None
+
+def get_detection_engine():
+    global _detection_engine
+    if _detection_engine is None:
+        _detection_engine = DetectionEngine(
+            supabase,
+            MonitoredLawsSchema(lookback_days=30),
+            law_api=LawAPI(strict=True, oc=LAW_API_KEY)
+        )
+    return _detection_engine
+
+# 예약 확인 계획 (법령별 우선순위에 따라 개별 확인을 주기마다 나눠서 실행)
+_adaptive_scheduler = None
+
+def get_adaptive_scheduler():
+    global _adaptive_scheduler
+    if _adaptive_scheduler is None:
+        engine = get_detection_engine()
+        _adaptive_scheduler = AdaptiveScheduler(
+            engine.ledger,
+            engine.schema.run_log_code,
+            engine.schema.law_key,
+            load_amendment_counts=lambda since: engine.schema.load_amendment_counts(supabase, since),
+            tick_seconds=SCHEDULE_TICK_MINUTES * 60,
+            min_interval_hours=CHECK_MIN_INTERVAL_HOURS,
+            max_interval_hours=CHECK_MAX_INTERVAL_HOURS,
+            catch_up_factor=SCHEDULE_CATCH_UP_FACTOR
+        )
+    return _adaptive_scheduler
+
+def check_law_amendments(progress=None, scheduled=False):
+    """법제처 API를 통해 법령 개정사항 확인
+
+    progress: 진행 상황 콜백 (done=확인한 법령 수, total=전체 법령 수, found=신규 개정 수)
+    scheduled: 예약 실행이면 새로 공포된 법령과 스케줄러가 고른 법령만 확인
+    실행 중 오류는 호출한 쪽으로 다시 발생시킨다. (확인 작업이 성공이 아닌 실패로 기록되도록)
+    """
     try:
         if not supabase:
             print("❌ Supabase가 설정되지 않았습니다.")
             return 0
-            
+        
+        # config.py의 기본 인증키로 조용히 대신하지 않음 (/health의 api_key 상태와 일치)
         if not LAW_API_KEY:
             print("❌ LAW_API_KEY가 설정되지 않았습니다.")
             return 0
         
         print("🔍 법령 개정사항 체크 시작...")
         
-        # 모니터링 대상 법령 목록 조회
-        laws_response = supabase.table('monitored_laws').select('*').eq('is_active', True).execute()
-        monitored_laws = laws_response.data
+        engine = get_detection_engine()
+        metrics_before = metrics.registry.snapshot()
+        if scheduled:
+            laws = engine.schema.load_laws(supabase)
+            plan = get_adaptive_scheduler().plan(laws)
+            result = engine.run(laws=laws, progress=progress, individual=plan)
+        else:
+            result = engine.run(progress=progress)
         
-        if not monitored_laws:
+        if not result['laws']:
             print("⚠️ 모니터링 대상 법령이 없습니다.")
             return 0
         
-        print(f"📋 모니터링 대상 법령: {len(monitored_laws)}개")
-        
-        new_amendments_count = 0
-        
-        # 각 법령에 대해 API 호출
-        for law in monitored_laws:
-            law_name = law['law_name']
-            print(f"  🔎 {law_name} 확인 중...")
-            
-            # 법제처 API 호출
-            url = "http://open.law.go.kr/LSO/legInfoApi.do"
-            params = {
-                'OC': LAW_API_KEY,
-                '법령명': law_name,
-                'type': 'XML'
-            }
-            
-            try:
-                response = requests.get(url, params=params, timeout=10)
-                
-                if response.status_code == 200:
-                    # XML 파싱 (실제 응답 구조에 맞게 조정 필요)
-                    try:
-                        root = ET.fromstring(response.content)
-                        
-                        # 예시: 실제 XML 구조에 맞게 수정 필요
-                        for item in root.findall('.//law'):
-                            promulgate_date = item.findtext('공포일자', '')
-                            enforce_date = item.findtext('시행일자', '')
-                            revision_type = item.findtext('개정유형', '')
-                            
-                            if promulgate_date:
-                                # 최근 30일 이내 개정사항만
-                                try:
-                                    pub_date = datetime.strptime(promulgate_date, '%Y%m%d')
-                                    if (datetime.now() - pub_date).days > 30:
-                                        continue
-                                except:
-                                    continue
-                                
-                                # 중복 체크
-                                existing = supabase.table('law_amendments').select('*').eq('law_name', law_name).eq('공포일자', promulgate_date).execute()
-                                
-                                if not existing.data:
-                                    # 새 개정사항 추가
-                                    amendment_data = {
-                                        'law_name': law_name,
-                                        '공포일자': promulgate_date,
-                                        '시행일자': enforce_date if enforce_date else None,
-                                        '개정유형': revision_type if revision_type else '일부개정',
-                                        '내용요약': f'{law_name} {revision_type if revision_type else "개정"}',
-                                        '읽음여부': False,
-                                        '알림발송여부': False
-                                    }
-                                    
-                                    supabase.table('law_amendments').insert(amendment_data).execute()
-                                    new_amendments_count += 1
-                                    print(f"    ✅ 새 개정사항 발견: {promulgate_date}")
-                    except ET.ParseError as e:
-                        print(f"    ⚠️ XML 파싱 오류: {e}")
-                else:
-                    print(f"    ⚠️ API 응답 오류: {response.status_code}")
-                
-            except Exception as e:
-                print(f"    ❌ API 호출 실패: {str(e)}")
-                continue
+        engine.finish(result)
+        metrics.record_run(
+            METRICS_RUNS_PATH, 'app_scheduled' if scheduled else 'app', metrics_before,
+            laws=result['laws'], changes=result['changes'],
+            execution_time=int(time.time() - result['started_at'])
+        )
         
+        new_amendments_count = result['changes']
         print(f"✅ 체크 완료: 총 {new_amendments_count}건의 신규 개정사항 발견")
+        if new_amendments_count:
+            invalidate_stats_cache()
         return new_amendments_count
         
     except Exception as e:
+        # 작업 실행기(jobs)가 작업을 실패로 기록하도록 다시 발생
         print(f"❌ 개정사항 체크 중 오류: {str(e)}")
-        return 0
+        raise
+
+def _create_scheduler_lease(attempts=5, retry_seconds=2):
+    """예약 작업 실행 담당 리스 (Supabase 함수가 없을 때만 잠금 파일 사용)
 
-# 스케줄러 설정
+    일시적인 오류로 잠금 파일로 바꾸면 다른 작업자는 Supabase 리스를 쓰고 있어 실행 담당이 둘이 될 수 있으므로,
+    함수가 없다는 응답(PGRST202/404)이 아니면 Supabase 리스를 유지한다. (획득은 LeaseKeeper가 계속 재시도)
+    """
+    name = 'law_amendment_check'
+    if SCHEDULER_LEASE_BACKEND in ('auto', 'supabase') and supabase:
+        lease = SupabaseLease(supabase, name, ttl_seconds=SCHEDULER_LEASE_TTL)
+        for attempt in range(1, attempts + 1):
+            try:
+                lease.acquire()
+                return lease
+            except Exception as e:
+                if _is_missing_function(e):
+                    if SCHEDULER_LEASE_BACKEND == 'supabase':
+                        raise
+                    print(f"⚠️ scheduler_leases 함수 없음, 잠금 파일로 전환: {e}")
+                    break
+                if attempt == attempts:
+                    print(f"⚠️ scheduler_leases 리스 획득 실패 ({attempt}회), 주기적으로 다시 시도합니다: {e}")
+                    return lease
+                time.sleep(retry_seconds)
+    return FileLease(SCHEDULER_LEASE_FILE, name, ttl_seconds=SCHEDULER_LEASE_TTL)
+
+def run_scheduled_check():
+    """실행 담당 프로세스에서만 개정사항 확인 시작"""
+    if not scheduler_lease:
+        print("⏭️ 실행 담당 리스를 준비 중이므로 건너뜁니다.")
+        return
+    if not scheduler_lease.is_leader():
+        print("⏭️ 다른 프로세스가 예약 작업 실행 담당이므로 건너뜁니다.")
+        return
+    start_check_job(trigger='scheduler')
+
+def start_scheduler():
+    """스케줄러 시작 (gunicorn 작업자마다 호출해도 예약 작업은 한 곳에서만 실행)
+
+    실행 담당 리스는 백그라운드에서 준비한다. (리스 획득 재시도가 작업자 시작을 늦추지 않도록)
+    """
+    with _scheduler_lock:
+        if scheduler.running:
+            return
+        scheduler.start()
+    atexit.register(_stop_scheduler)
+    threading.Thread(target=_start_scheduler_lease, name='scheduler-lease-setup', daemon=True).start()
+    print(f"✅ 스케줄러 시작됨 ({SCHEDULE_TICK_MINUTES}분마다 우선순위별 분산 확인)")
+
+def _start_scheduler_lease():
+    """실행 담당 리스 생성 후 갱신 시작 (리스를 쓸 수 없으면 스케줄러 중단)"""
+    global scheduler_lease
+    try:
+        lease = _create_scheduler_lease()
+    except Exception as e:
+        print(f"⚠️ 스케줄러 시작 실패 (실행 담당 리스): {e}")
+        _stop_scheduler()
+        return
+    
+    with _scheduler_lock:
+        if not scheduler.running:
+            # 준비하는 동안 종료됨
+            return
+        scheduler_lease = LeaseKeeper(lease)
+        scheduler_lease.start()
+    print(f"🔐 예약 작업 실행 담당 리스: {lease.backend}")
+
+def _stop_scheduler():
+    with _scheduler_lock:
+        if scheduler.running:
+            scheduler.shutdown(wait=False)
+        keeper = scheduler_lease
+    if keeper:
+        keeper.stop()
+
+# 스케줄러 설정 (하루 한 번 전체 확인 대신 짧은 주기로 나눠서 확인, 밀린 실행은 한 번만)
 scheduler = BackgroundScheduler()
+scheduler_lease = None
+_scheduler_lock = threading.Lock()
 scheduler.add_job(
-    func=check_law_amendments,
-    trigger='cron',
-    hour=9,
-    minute=0,
-    id='law_amendment_check'
+    func=run_scheduled_check,
+    trigger='interval',
+    minutes=SCHEDULE_TICK_MINUTES,
+    id='law_amendment_check',
+    coalesce=True,
+    max_instances=1
 )
 
+# gunicorn 등으로 실행할 때는 RUN_SCHEDULER=true로 작업자마다 스케줄러 시작
+if os.environ.get('RUN_SCHEDULER', 'false').lower() == 'true':
+    try:
+        start_scheduler()
+    except Exception as e:
+        print(f"⚠️ 스케줄러 시작 실패: {e}")
+
 if __name__ == '__main__':
     # 스케줄러 시작
     try:
-        if not scheduler.running:
-            scheduler.start()
-            print("✅ 스케줄러 시작됨 (매일 오전 9시)")
+        start_scheduler()
     except Exception as e:
         print(f"⚠️ 스케줄러 시작 실패: {e}")
     
@@ -0,0 +1,102 @@
+# batch_writer.py
+# Supabase 행 쓰기 일괄 처리 (일괄 insert / 같은 값 update 묶기)
+
+import threading
+
+
+class BatchWriter:
+    def __init__(self, supabase, batch_size=100):
+        self.supabase = supabase
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._inserts = {}   # 테이블 -> [행]
+        self._updates = {}   # (테이블, 키 컬럼, 값) -> [키 값]
+        self.failures = []   # 실패한 행 목록 (flush 이후에도 누적)
+
+    def insert(self, table, row):
+        """insert할 행 추가 (batch_size에 도달하면 해당 테이블만 바로 저장)"""
+        with self._lock:
+            rows = self._inserts.setdefault(table, [])
+            rows.append(row)
+            if len(rows) < self.batch_size:
+                return
+            self._inserts[table] = []
+
+        self._flush_inserts(table, rows)
+
+    def update(self, table, values, key_column, key_value):
+        """update할 행 추가 (같은 값으로 갱신하는 행끼리 한 번의 요청으로 묶음)"""
+        group = (table, key_column, tuple(sorted(values.items())))
+
+        with self._lock:
+            keys = self._updates.setdefault(group, [])
+            keys.append(key_value)
+            if len(keys) < self.batch_size:
+                return
+            self._updates[group] = []
+
+        self._flush_updates(group, keys)
+
+    def flush(self):
+        """대기 중인 모든 쓰기 저장 후 이번 flush의 실패 목록 반환"""
+        with self._lock:
+            inserts, self._inserts = self._inserts, {}
+            updates, self._updates = self._updates, {}
+            failed_before = len(self.failures)
+
+        for table, rows in inserts.items():
+            if rows:
+                self._flush_inserts(table, rows)
+
+        for group, keys in updates.items():
+            if keys:
+                self._flush_updates(group, keys)
+
+        with self._lock:
+            return self.failures[failed_before:]
+
+    def pending_count(self):
+        """저장 대기 중인 행 수"""
+        with self._lock:
+            return sum(len(rows) for rows in self._inserts.values()) + \
+                sum(len(keys) for keys in self._updates.values())
+
+    def _flush_inserts(self, table, rows):
+        """일괄 insert (실패하면 행 단위로 다시 시도하여 실패한 행만 기록)"""
+        try:
+            self.supabase.table(table).insert(rows).execute()
+            return
+        except Exception as e:
+            if len(rows) == 1:
+                self._record_failure(table, rows[0], e)
+                return
+
+        for row in rows:
+            try:
+                self.supabase.table(table).insert(row).execute()
+            except Exception as e:
+                self._record_failure(table, row, e)
+
+    def _flush_updates(self, group, keys):
+        """키 목록을 in 조건으로 한 번에 update (실패하면 행 단위로 다시 시도)"""
+        table, key_column, values = group
+        values = dict(values)
+
+        try:
+            self.supabase.table(table).update(values).in_(key_column, keys).execute()
+            return
+        except Exception as e:
+            if len(keys) == 1:
+                self._record_failure(table, {key_column: keys[0], **values}, e)
+                return
+
+        for key in keys:
+            try:
+                self.supabase.table(table).update(values).eq(key_column, key).execute()
+            except Exception as e:
+                self._record_failure(table, {key_column: key, **values}, e)
+
+    def _record_failure(self, table, row, error):
+        print(f"  ⚠️  {table} 저장 실패: {error}")
+        with self._lock:
+            self.failures.append({'table': table, 'row': row, 'error': str(error)})
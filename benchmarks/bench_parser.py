@@ -0,0 +1,122 @@
+# bench_parser.py
+# 법제처 XML 파서 성능 비교 (스트리밍 파서 vs BeautifulSoup XML 파서 대체 경로)
+#
+# 사용법:
+#   python benchmarks/bench_parser.py
+#   python benchmarks/bench_parser.py --scale 2000 --repeat 3
+#   python benchmarks/bench_parser.py --fixtures 저장한_응답_폴더
+#
+# 실제 API 응답을 저장해 둔 폴더를 지정하면 그 파일들로 비교합니다.
+# (search_result.xml / law_info.xml / amendment_history.xml)
+#
+# BeautifulSoup 파서(parse_*_bs4)는 올바른 XML이 아닌 응답에 쓰는 대체 경로이며 lxml이 필요합니다.
+# 두 파서의 결과가 같은지도 함께 확인합니다.
+
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import law_parser
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# (파일명, 반복할 블록 태그, 스트리밍 파서, BeautifulSoup 파서)
+CASES = [
+    ('search_result.xml', 'law', law_parser.parse_search_result, law_parser.parse_search_result_bs4),
+    ('law_info.xml', '조문단위', law_parser.parse_law_info, law_parser.parse_law_info_bs4),
+    ('amendment_history.xml', '개정문', law_parser.parse_amendment_history, law_parser.parse_amendment_history_bs4),
+]
+
+
+def scale_fixture(xml_bytes, block_tag, scale):
+    """block_tag 블록을 scale배로 복제하여 큰 응답을 만든다"""
+    if scale <= 1:
+        return xml_bytes
+
+    text = xml_bytes.decode('utf-8')
+    pattern = re.compile(r'<{0}[\s>].*?</{0}>\s*'.format(re.escape(block_tag)), re.S)
+    blocks = pattern.findall(text)
+    if not blocks:
+        return xml_bytes
+
+    last = list(pattern.finditer(text))[-1]
+    body = ''.join(blocks) * (scale - 1)
+    return (text[:last.end()] + body + text[last.end():]).encode('utf-8')
+
+
+def measure(parser, xml_bytes, repeat):
+    """최소 실행 시간(초)과 최대 메모리 사용량(바이트)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parser(xml_bytes)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    parser(xml_bytes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak, result
+
+
+def is_empty(result):
+    """모든 항목이 None인 파싱 결과인지"""
+    records = result if isinstance(result, list) else [result]
+    return all(value is None for record in records if record for value in record.values())
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='법제처 XML 파서 성능 비교')
+    arg_parser.add_argument('--fixtures', default=FIXTURE_DIR, help='XML 응답 파일 폴더')
+    arg_parser.add_argument('--scale', type=int, default=500, help='레코드 복제 배수')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='반복 측정 횟수')
+    args = arg_parser.parse_args()
+
+    has_bs4 = all(importlib.util.find_spec(name) for name in ('bs4', 'lxml'))
+    if not has_bs4:
+        print("⚠️  beautifulsoup4/lxml이 설치되지 않아 스트리밍 파서만 측정합니다.\n")
+
+    print("=" * 78)
+    print(f"{'응답':<24}{'크기':>10}  {'파서':<10}{'시간(ms)':>12}{'메모리(KB)':>14}")
+    print("=" * 78)
+
+    for file_name, block_tag, stream_parser, bs4_parser in CASES:
+        path = os.path.join(args.fixtures, file_name)
+        if not os.path.exists(path):
+            print(f"{file_name:<24} (파일 없음)")
+            continue
+
+        with open(path, 'rb') as f:
+            xml_bytes = scale_fixture(f.read(), block_tag, args.scale)
+
+        size = f"{len(xml_bytes) / 1024:.0f}KB"
+        parsers = [('stream', stream_parser)]
+        if has_bs4:
+            parsers.append(('bs4', bs4_parser))
+
+        results = {}
+        for name, parser in parsers:
+            elapsed, peak, results[name] = measure(parser, xml_bytes, args.repeat)
+            print(f"{file_name:<24}{size:>10}  {name:<10}{elapsed * 1000:>12.1f}{peak / 1024:>14.0f}")
+
+        if has_bs4:
+            if is_empty(results['bs4']):
+                print(f"  ⚠️  bs4 결과에 추출된 항목이 없습니다: {file_name}")
+            elif results['stream'] == results['bs4']:
+                print(f"  ✅ 파싱 결과 일치: {file_name}")
+            else:
+                print(f"  ❌ 파싱 결과가 다릅니다: {file_name}")
+
+    print("=" * 78)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+# bench_pipeline.py
+# 전체 처리 흐름 성능 측정 (실제 법제처 API/Supabase/Claude API 대신 로컬 대역 사용)
+#
+# 사용법:
+#   python benchmarks/bench_pipeline.py
+#   python benchmarks/bench_pipeline.py --sizes 10,100,1000 --api-latency 0.05 --error-rate 0.02
+#   python benchmarks/bench_pipeline.py --sizes 100 --trace-memory --verbose
+#
+# 규모(법령 수)마다 새 캐시 폴더(LAW_MONITOR_CACHE_DIR)를 사용하는 별도 프로세스에서 아래 단계를 실행합니다.
+#   initialize    DataInitializer.collect_amendments (개정 연혁 수집 + AI 묶음 분석)
+#   monitor_full  LawMonitor.check_all_laws 첫 실행 (이전 실행 기록 없음 → 전체 확인)
+#   monitor_incr  일부 법령에 새 개정 공포 후 두 번째 실행 (공포일자 기간 조회로 증분 확인)
+#   api_read      Flask 법령 목록 / 개정 이력 전체 페이지 / 통계 조회
+#   api_check     Flask 개정사항 확인 작업 시작 후 완료까지 진행 상황 조회
+#
+# 단계별 실행 시간, 법제처/Supabase/Claude 요청 수, 메모리(최대 RSS, --trace-memory 시 Python 할당 최대치)를 출력합니다.
+# flask/supabase/anthropic 패키지는 설치되어 있어야 합니다. (실제 서버에는 연결하지 않음)
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_anthropic import FakeAnthropic
+from fake_law_api import FakeLawServer
+from fake_supabase import FakeSupabase
+
+HISTORY_START = datetime(2023, 1, 1)  # fixtures/amendment_history.xml의 개정 이력이 포함되는 기간
+
+
+class _Pipeline:
+    """한 규모의 단계별 측정 (별도 프로세스에서 실행)"""
+
+    def __init__(self, args):
+        self.args = args
+        self.size = args.child
+        self.law_server = FakeLawServer(
+            FakeLawServer.make_laws(self.size, changed_ratio=args.changed_ratio),
+            latency=args.api_latency,
+            error_rate=args.error_rate
+        )
+        self.ai = FakeAnthropic(latency=args.ai_latency)
+        self.supabase = None
+        self.web_supabase = None
+
+    def run(self):
+        # config/law_api를 읽기 전에 부모 프로세스가 환경 변수(캐시 폴더, 요청 속도)를 설정해 둠
+        import ai_analyzer
+        import law_api
+
+        law_api.LAW_API_BASE_URL = self.law_server.start()
+        ai_analyzer.CLAUDE_API_KEY = 'benchmark'
+        ai_analyzer.Anthropic = lambda api_key=None: self.ai
+
+        stages = [
+            ('initialize', self.initialize),
+            ('monitor_full', self.monitor_full),
+            ('monitor_incr', self.monitor_incremental),
+            ('api_read', self.api_read),
+            ('api_check', self.api_check),
+        ]
+
+        results = []
+        try:
+            for name, func in stages:
+                results.append(self._measure(name, func))
+        finally:
+            self.law_server.stop()
+        return results
+
+    def initialize(self):
+        import initialize_data
+
+        self.supabase = FakeSupabase(latency=self.args.db_latency)
+        self.supabase.seed('law_master', [
+            {
+                'law_code': f"BENCH{i:05d}",
+                'law_name': law['law_name'],
+                'is_active': True,
+                'manager': '안전감사팀',
+                'last_check_date': None,
+                'last_amendment_date': None
+            }
+            for i, law in enumerate(FakeLawServer.make_laws(self.size))
+        ])
+        initialize_data.create_client = lambda url, key: self.supabase
+
+        checkpoint_path = os.path.join(os.environ['LAW_MONITOR_CACHE_DIR'], 'bench_checkpoint.json')
+        initialize_data.DataInitializer().collect_amendments(
+            HISTORY_START, datetime.now(),
+            checkpoint_path=checkpoint_path, resume=False
+        )
+        return {'amendments': len(self.supabase.rows('law_amendments'))}
+
+    def monitor_full(self):
+        return self._run_monitor()
+
+    def monitor_incremental(self):
+        self.law_server.promulgate(max(1, self.size // 10))
+        return self._run_monitor()
+
+    def api_read(self):
+        client = self._web_client()
+
+        client.get('/api/monitored-laws')
+        pages = 0
+        cursor = None
+        while True:
+            url = '/api/amendments?limit=200' + (f"&cursor={cursor}" if cursor else '')
+            response = client.get(url)
+            pages += 1
+            cursor = response.headers.get('X-Next-Cursor')
+            if response.status_code != 200 or not cursor:
+                break
+        for _ in range(2):  # 두 번째는 통계 캐시 사용
+            client.get('/api/stats')
+        return {'pages': pages}
+
+    def api_check(self):
+        client = self._web_client()
+
+        job = client.post('/api/check-amendments').get_json()['job']
+        while job['status'] == 'running':
+            time.sleep(0.05)
+            job = client.get(f"/api/check-amendments/{job['id']}").get_json()
+        return {'job': job['status'], 'found': (job['result'] or {}).get('count')}
+
+    def _run_monitor(self):
+        import monitor
+
+        monitor.create_client = lambda url, key: self.supabase
+        before = len(self.supabase.rows('law_amendments'))
+        monitor.LawMonitor().check_all_laws(max_workers=self.args.workers)
+        return {'amendments': len(self.supabase.rows('law_amendments')) - before}
+
+    def _web_client(self):
+        import app as web
+        import metrics
+
+        if self.web_supabase is None:
+            self.web_supabase = FakeSupabase(latency=self.args.db_latency)
+            laws = FakeLawServer.make_laws(self.size)
+            self.web_supabase.seed('monitored_laws', [
+                {'law_name': law['law_name'], 'is_active': True} for law in laws
+            ])
+            self.web_supabase.seed('law_amendments', [
+                {
+                    'law_name': law['law_name'],
+                    '공포일자': law['amend_date'],
+                    '시행일자': law['enf_date'],
+                    '개정유형': law['amend_type'],
+                    '내용요약': f"{law['law_name']} {law['amend_type']}",
+                    '읽음여부': i % 3 == 0,
+                    '알림발송여부': False
+                }
+                for i, law in enumerate(laws)
+                if i % 20  # 일부 법령은 최근 개정이 아직 저장되지 않은 상태로 시작
+            ])
+            self.web_supabase.register_rpc('dashboard_stats', _dashboard_stats)
+
+            web.supabase = metrics.InstrumentedSupabase(self.web_supabase)
+            web._detection_engine = None
+            web.invalidate_stats_cache()
+        return web.app.test_client()
+
+    def _measure(self, name, func):
+        fakes = [self.law_server, self.ai, self.supabase, self.web_supabase]
+        for fake in fakes:
+            if fake:
+                fake.reset_stats()
+
+        if self.args.trace_memory:
+            tracemalloc.start()
+
+        started = time.perf_counter()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(sys.stdout if self.args.verbose else output):
+            details = func()
+        elapsed = time.perf_counter() - started
+
+        peak = None
+        if self.args.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        law_api_stats = self.law_server.stats()
+        db_stats = {}
+        for fake in (self.supabase, self.web_supabase):
+            if fake:
+                for key, count in fake.stats().items():
+                    db_stats[key] = db_stats.get(key, 0) + count
+
+        return {
+            'size': self.size,
+            'stage': name,
+            'seconds': round(elapsed, 3),
+            'law_api_requests': sum(count for key, count in law_api_stats.items() if key != 'errors'),
+            'law_api_errors': law_api_stats.get('errors', 0),
+            'law_api_by_endpoint': {key: count for key, count in law_api_stats.items() if key != 'errors'},
+            'db_requests': sum(db_stats.values()),
+            'db_by_table': db_stats,
+            'ai_requests': self.ai.stats()['requests'],
+            'peak_traced_kb': round(peak / 1024) if peak is not None else None,
+            'max_rss_mb': _max_rss_mb(),
+            'details': details
+        }
+
+
+def _dashboard_stats(client, params):
+    amendments = client.rows('law_amendments')
+    return {
+        'monitored_laws': sum(1 for law in client.rows('monitored_laws') if law.get('is_active')),
+        'unread_amendments': sum(1 for row in amendments if not row.get('읽음여부')),
+        'total_amendments': len(amendments)
+    }
+
+
+def _max_rss_mb():
+    """프로세스 최대 메모리 사용량 (MB, Linux는 KB 단위 / macOS는 바이트 단위)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_size(size, args):
+    """새 캐시 폴더에서 한 규모를 별도 프로세스로 실행하고 단계별 결과 반환"""
+    cache_dir = tempfile.mkdtemp(prefix=f'law_bench_{size}_')
+    env = dict(os.environ)
+    env.update({
+        'LAW_MONITOR_CACHE_DIR': cache_dir,
+        'LAW_API_REQUESTS_PER_SECOND': str(args.rps),
+        'LAW_API_MAX_CONCURRENCY_PER_HOST': str(args.workers),
+        'MONITOR_MAX_WORKERS': str(args.workers),
+        'BACKFILL_MAX_WORKERS': str(args.workers),
+        'ANALYSIS_REQUESTS_PER_MINUTE': str(args.ai_rpm),
+        'RUN_SCHEDULER': 'false',
+        'LAW_API_KEY': 'benchmark',  # app.py 개정사항 확인에 필요 (로컬 법제처 API는 인증키를 확인하지 않음)
+    })
+
+    command = [
+        sys.executable, os.path.abspath(__file__), '--child', str(size),
+        '--api-latency', str(args.api_latency), '--error-rate', str(args.error_rate),
+        '--db-latency', str(args.db_latency), '--ai-latency', str(args.ai_latency),
+        '--changed-ratio', str(args.changed_ratio), '--workers', str(args.workers)
+    ]
+    if args.trace_memory:
+        command.append('--trace-memory')
+    if args.verbose:
+        command.append('--verbose')
+
+    try:
+        completed = subprocess.run(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    if args.verbose:
+        print(completed.stdout)
+    if completed.returncode != 0:
+        print(f"❌ {size}개 법령 측정 실패:\n{completed.stderr[-2000:]}")
+        return []
+    # 결과는 마지막 JSON 줄 (작업 스레드 로그가 뒤에 섞일 수 있음)
+    for line in reversed(completed.stdout.strip().splitlines()):
+        if line.startswith('[{'):
+            return json.loads(line)
+    print(f"❌ {size}개 법령 측정 결과 없음")
+    return []
+
+
+def print_results(results):
+    print("=" * 96)
+    print(f"{'법령 수':>7}  {'단계':<14}{'시간(s)':>9}{'법령/s':>9}{'법제처':>8}{'오류':>6}"
+          f"{'DB':>7}{'AI':>6}{'할당(MB)':>10}{'RSS(MB)':>9}  결과")
+    print("=" * 96)
+    for row in results:
+        rate = row['size'] / row['seconds'] if row['seconds'] else 0
+        traced = f"{row['peak_traced_kb'] / 1024:.1f}" if row['peak_traced_kb'] is not None else '-'
+        rss = f"{row['max_rss_mb']:.0f}" if row['max_rss_mb'] is not None else '-'
+        details = ', '.join(f"{key}={value}" for key, value in (row['details'] or {}).items())
+        print(f"{row['size']:>7}  {row['stage']:<14}{row['seconds']:>9.2f}{rate:>9.1f}"
+              f"{row['law_api_requests']:>8}{row['law_api_errors']:>6}{row['db_requests']:>7}"
+              f"{row['ai_requests']:>6}{traced:>10}{rss:>9}  {details}")
+    print("=" * 96)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='법령 모니터링 전체 처리 흐름 성능 측정 (로컬 대역 사용)')
+    arg_parser.add_argument('--sizes', default='10,100,1000', help='측정할 법령 수 (쉼표 구분)')
+    arg_parser.add_argument('--api-latency', type=float, default=0.05, help='법제처 API 응답 지연 (초)')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='법제처 API 503 응답 비율 (0~1)')
+    arg_parser.add_argument('--db-latency', type=float, default=0.01, help='Supabase 요청 왕복 지연 (초)')
+    arg_parser.add_argument('--ai-latency', type=float, default=0.2, help='Claude API 응답 지연 (초)')
+    arg_parser.add_argument('--changed-ratio', type=float, default=0.1, help='최근 개정이 공포된 법령 비율')
+    arg_parser.add_argument('--workers', type=int, default=4, help='동시 확인 법령 수 / 호스트별 동시 요청 수')
+    arg_parser.add_argument('--rps', type=float, default=200, help='법제처 API 초당 요청 수 제한')
+    arg_parser.add_argument('--ai-rpm', type=int, default=6000, help='AI 분석 분당 요청 수 제한')
+    arg_parser.add_argument('--trace-memory', action='store_true', help='단계별 Python 메모리 할당 최대치 측정 (느려짐)')
+    arg_parser.add_argument('--json', help='결과를 저장할 JSON 파일')
+    arg_parser.add_argument('--verbose', action='store_true', help='실행 로그 출력')
+    arg_parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child is not None:
+        results = _Pipeline(args).run()
+        print(json.dumps(results, ensure_ascii=False))
+        return
+
+    results = []
+    for size in [int(size) for size in args.sizes.split(',') if size.strip()]:
+        print(f"⏱️  법령 {size}개 측정 중...")
+        results.extend(run_size(size, args))
+
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
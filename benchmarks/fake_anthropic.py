@@ -0,0 +1,62 @@
+# fake_anthropic.py
+# 벤치마크용 Anthropic 클라이언트 대역 (ai_analyzer가 파싱할 수 있는 형식의 고정 분석 결과 응답)
+#
+#   ai_analyzer.client = FakeAnthropic(latency=0.5)
+
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+BATCH_ITEM = re.compile(r'^### 개정 \[(\d+)\]', re.M)
+
+ANALYSIS_TEXT = """1. **주요 변경사항 요약**
+벤치마크용 개정 내용 요약입니다.
+2. **공사 업무에 미치는 영향**
+관련 업무 절차 확인이 필요합니다.
+3. **필요한 후속 조치**
+- 안전관리 매뉴얼 개정 검토
+- 관련 부서 직원 교육 실시
+"""
+
+
+class FakeAnthropic:
+    def __init__(self, latency=0.0, api_key=None):
+        """latency: 요청 한 번의 응답 지연 시간 (초)"""
+        self.latency = latency
+        self.messages = _Messages(self)
+        self._lock = threading.Lock()
+        self._counts = {'requests': 0, 'items': 0}
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset_stats(self):
+        with self._lock:
+            self._counts = {'requests': 0, 'items': 0}
+
+
+class _Messages:
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, model, max_tokens, messages, **kwargs):
+        if self.client.latency:
+            time.sleep(self.client.latency)
+
+        prompt = messages[-1]['content']
+        numbers = [int(number) for number in BATCH_ITEM.findall(prompt)]
+        if numbers:
+            text = ''.join(f"### 결과 [{number}]\n{ANALYSIS_TEXT}\n" for number in numbers)
+        else:
+            text = ANALYSIS_TEXT
+
+        with self.client._lock:
+            self.client._counts['requests'] += 1
+            self.client._counts['items'] += max(1, len(numbers))
+
+        return SimpleNamespace(
+            content=[SimpleNamespace(type='text', text=text)],
+            usage=SimpleNamespace(input_tokens=len(prompt), output_tokens=len(text))
+        )
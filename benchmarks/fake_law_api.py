@@ -0,0 +1,228 @@
+# fake_law_api.py
+# 벤치마크용 로컬 법제처 API 서버 (fixtures의 XML 응답을 가상 법령마다 값만 바꿔서 응답)
+#
+#   server = FakeLawServer(FakeLawServer.make_laws(100), latency=0.05, error_rate=0.01)
+#   base_url = server.start()      # http://127.0.0.1:포트/DRF
+#   ...
+#   server.stop(); server.stats()
+#
+# 지원하는 요청: lawSearch.do (query=법령명 / ancYd=공포일자 기간, display/page),
+#               lawService.do (ID), lawRevisionService.do (ID)
+
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class FakeLawServer:
+    def __init__(self, laws, latency=0.0, error_rate=0.0, fixture_dir=FIXTURE_DIR, seed=0):
+        """laws: make_laws() 형식의 법령 목록
+        latency: 응답마다 지연 시간 (초), error_rate: 503으로 응답할 비율 (0~1)
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._laws = {law['law_id']: dict(law) for law in laws}
+        self._by_name = {law['law_name']: law['law_id'] for law in laws}
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._server = None
+        self._thread = None
+        self._templates = self._load_templates(fixture_dir)
+
+    @staticmethod
+    def make_laws(count, changed_ratio=0.1, today=None):
+        """가상 법령 목록 (changed_ratio 비율은 최근 공포, 나머지는 오래전 공포)"""
+        today = today or datetime.now()
+        changed_every = max(1, round(1 / changed_ratio)) if changed_ratio else 0
+        laws = []
+        for i in range(count):
+            recent = bool(changed_every) and i % changed_every == 0
+            amend_date = today - timedelta(days=2) if recent else datetime(2020, 1, 1) + timedelta(days=i % 1000)
+            laws.append({
+                'law_id': f"{900000 + i:06d}",
+                'law_name': f"벤치마크법{i:05d}",
+                'amend_date': amend_date.strftime('%Y%m%d'),
+                'amend_no': str(10000 + i),
+                'enf_date': (amend_date + timedelta(days=180)).strftime('%Y%m%d'),
+                'amend_type': '일부개정'
+            })
+        return laws
+
+    def start(self):
+        """서버 시작 후 base_url 반환"""
+        handler = type('Handler', (_Handler,), {'fake': self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-law-api', daemon=True)
+        self._thread.start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}/DRF"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def promulgate(self, count, date=None):
+        """앞에서부터 count개 법령에 새 개정 공포 (공포일자/공포번호 변경), 변경된 법령ID 목록 반환"""
+        date = (date or datetime.now()).strftime('%Y%m%d')
+        with self._lock:
+            changed = list(self._laws)[:count]
+            for law_id in changed:
+                law = self._laws[law_id]
+                law['amend_date'] = date
+                law['amend_no'] = str(int(law['amend_no']) + 1)
+        return changed
+
+    def stats(self):
+        """엔드포인트별 응답 수 ({'lawService.do': 10, 'errors': 1, ...})"""
+        with self._lock:
+            return dict(self._counts)
+
+    def reset_stats(self):
+        with self._lock:
+            self._counts = {}
+
+    def handle(self, endpoint, params):
+        """(상태 코드, 본문) 반환"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self._counts['errors'] = self._counts.get('errors', 0) + 1
+                return 503, b'Service Unavailable'
+
+        if endpoint == 'lawSearch.do':
+            return 200, self._render_search(params)
+        if endpoint in ('lawService.do', 'lawRevisionService.do'):
+            law = self._get_law(params.get('ID'))
+            if law is None:
+                return 200, self._templates['empty'].encode('utf-8')
+            render = self._render_law_info if endpoint == 'lawService.do' else self._render_history
+            return 200, render(law)
+        return 404, b'Not Found'
+
+    def _get_law(self, law_id):
+        with self._lock:
+            law = self._laws.get(law_id)
+            return dict(law) if law else None
+
+    def _render_search(self, params):
+        with self._lock:
+            if params.get('query'):
+                law_id = self._by_name.get(params['query'])
+                matches = [dict(self._laws[law_id])] if law_id else []
+            elif params.get('ancYd'):
+                start, _, end = params['ancYd'].partition('~')
+                matches = [dict(law) for law in self._laws.values() if start <= law['amend_date'] <= end]
+            else:
+                matches = [dict(law) for law in self._laws.values()]
+
+        display = int(params.get('display') or 20)
+        page = int(params.get('page') or 1)
+        rows = matches[(page - 1) * display:page * display]
+
+        header, block, footer = self._templates['search']
+        body = ''.join(_fill(block, _search_values(law)) for law in rows)
+        header = _fill(header, {'totalCnt': str(len(matches)), 'page': str(page)})
+        return (header + body + footer).encode('utf-8')
+
+    def _render_law_info(self, law):
+        template = self._templates['law_info']
+        # 공포번호마다 조문 내용이 달라지도록 첫 조문에 공포번호 추가
+        template = template.replace('목적으로 한다.', f"목적으로 한다. (공포번호 {law['amend_no']})", 1)
+        return _fill(template, {
+            '법령ID': law['law_id'],
+            '공포일자': law['amend_date'],
+            '공포번호': law['amend_no'],
+            '법령명한글': law['law_name'],
+            '시행일자': law['enf_date'],
+            '제개정구분': law['amend_type']
+        }).encode('utf-8')
+
+    def _render_history(self, law):
+        header, block, footer = self._templates['history']
+        latest = _fill(block, {
+            '공포일자': law['amend_date'],
+            '시행일자': law['enf_date'],
+            '공포번호': law['amend_no']
+        })
+        # 법령마다 개정 내용이 달라지도록 (AI 분석 캐시에 같은 내용으로 적중하지 않게) 법령명/공포번호 추가
+        latest = latest.replace('개정한다.', f"개정한다. ({law['law_name']} 공포번호 {law['amend_no']})", 1)
+        header = _fill(header, {'법령ID': law['law_id'], '법령명한글': law['law_name']})
+        return (header + latest + ''.join(self._templates['history_rest']) + footer).encode('utf-8')
+
+    def _load_templates(self, fixture_dir):
+        def read(name):
+            with open(os.path.join(fixture_dir, name), encoding='utf-8') as f:
+                return f.read()
+
+        search_header, search_blocks, search_footer = _split_blocks(read('search_result.xml'), 'law')
+        history_header, history_blocks, history_footer = _split_blocks(read('amendment_history.xml'), '개정문')
+        return {
+            'search': (search_header, search_blocks[0], search_footer),
+            'law_info': read('law_info.xml'),
+            'history': (history_header, history_blocks[0], history_footer),
+            'history_rest': history_blocks[1:],
+            'empty': '<?xml version="1.0" encoding="UTF-8"?>\n<Law>일치하는 법령이 없습니다.</Law>'
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake = None
+    protocol_version = 'HTTP/1.1'  # keep-alive (LawAPI 세션 연결 재사용)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        status, body = self.fake.handle(parsed.path.rsplit('/', 1)[-1], params)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/xml; charset=UTF-8' if status == 200 else 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _split_blocks(text, tag):
+    """(블록 앞부분, [블록들], 블록 뒷부분)"""
+    pattern = re.compile(r'<{0}[\s>].*?</{0}>\s*'.format(re.escape(tag)), re.S)
+    matches = list(pattern.finditer(text))
+    return text[:matches[0].start()], [m.group(0) for m in matches], text[matches[-1].end():]
+
+
+def _search_values(law):
+    return {
+        '법령ID': law['law_id'],
+        '법령명한글': law['law_name'],
+        '공포일자': law['amend_date'],
+        '공포번호': law['amend_no'],
+        '시행일자': law['enf_date'],
+        '제개정구분명': law['amend_type']
+    }
+
+
+def _fill(template, values):
+    """각 태그의 첫 번째 값을 교체 (CDATA 값은 CDATA 유지)"""
+    for tag, value in values.items():
+        pattern = re.compile(r'(<{0}>)(<!\[CDATA\[)?.*?(\]\]>)?(</{0}>)'.format(re.escape(tag)), re.S)
+        template = pattern.sub(
+            lambda m: m.group(1) + (f"<![CDATA[{value}]]>" if m.group(2) else escape(value)) + m.group(4),
+            template,
+            count=1
+        )
+    return template
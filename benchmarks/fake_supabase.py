@@ -0,0 +1,294 @@
+# fake_supabase.py
+# 벤치마크용 메모리 Supabase 클라이언트 (이 프로젝트가 사용하는 PostgREST 쿼리 빌더 메서드만 구현)
+#
+#   supabase = FakeSupabase(latency=0.02)
+#   supabase.seed('law_master', [{'law_code': 'A', 'law_name': '산업안전보건법', 'is_active': True}])
+#   supabase.table('law_master').select('*').eq('is_active', True).execute().data
+
+import threading
+import time
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeSupabase:
+    def __init__(self, latency=0.0):
+        """latency: execute() 한 번의 왕복 지연 시간 (초)"""
+        self.latency = latency
+        self._tables = {}
+        self._next_ids = {}
+        self._functions = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def rpc(self, name, params=None):
+        return _RpcCall(self, name, params or {})
+
+    def register_rpc(self, name, func):
+        """func(client, params) -> 결과 데이터 (등록되지 않은 함수 호출은 오류)"""
+        self._functions[name] = func
+
+    def seed(self, table, rows):
+        """초기 데이터 추가 (요청 수에 포함하지 않음)"""
+        with self._lock:
+            self._insert_rows(table, rows)
+
+    def rows(self, table):
+        with self._lock:
+            return [dict(row) for row in self._tables.get(table, [])]
+
+    def stats(self):
+        """테이블/작업별 요청 수 ({'law_master.select': 2, ...})"""
+        with self._lock:
+            return dict(self._counts)
+
+    def reset_stats(self):
+        with self._lock:
+            self._counts = {}
+
+    def _record(self, key):
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+    def _insert_rows(self, table, rows):
+        stored = self._tables.setdefault(table, [])
+        inserted = []
+        for row in rows:
+            row = dict(row)
+            if row.get('id') is None:
+                row['id'] = self._next_ids.get(table, 1)
+            self._next_ids[table] = max(self._next_ids.get(table, 1), row['id'] + 1)
+            stored.append(row)
+            inserted.append(dict(row))
+        return inserted
+
+
+class _RpcCall:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        if self.client.latency:
+            time.sleep(self.client.latency)
+        with self.client._lock:
+            self.client._record(f"rpc:{self.name}")
+            func = self.client._functions.get(self.name)
+        if func is None:
+            raise Exception(f"Could not find the function public.{self.name}")
+        return FakeResponse(func(self.client, self.params))
+
+
+class _Query:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.action = 'select'
+        self.columns = None
+        self.values = None
+        self.count = None
+        self.head = False
+        self.filters = []
+        self.orders = []
+        self.limit_count = None
+        self.offset = 0
+        self.single_row = False
+
+    def select(self, columns='*', count=None, head=False):
+        self.columns = [column.strip() for column in columns.split(',')]
+        self.count = count
+        self.head = head
+        return self
+
+    def insert(self, values):
+        self.action = 'insert'
+        self.values = values if isinstance(values, list) else [values]
+        return self
+
+    def update(self, values):
+        self.action = 'update'
+        self.values = values
+        return self
+
+    def delete(self):
+        self.action = 'delete'
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self._filter(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self._filter(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self._filter(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self._filter(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self._filter(column, 'lte', value)
+
+    def in_(self, column, values):
+        return self._filter(column, 'in', list(values))
+
+    def is_(self, column, value):
+        return self._filter(column, 'is', value)
+
+    def or_(self, expression):
+        condition = _parse_or(expression)
+        self.filters.append(condition)
+        return self
+
+    def order(self, column, desc=False, nullsfirst=None):
+        self.orders.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def range(self, start, end):
+        self.offset = start
+        self.limit_count = end - start + 1
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def execute(self):
+        client = self.client
+        if client.latency:
+            time.sleep(client.latency)
+
+        with client._lock:
+            client._record(f"{self.table}.{self.action}")
+            if self.action == 'insert':
+                return FakeResponse(client._insert_rows(self.table, self.values))
+
+            rows = client._tables.setdefault(self.table, [])
+            matched = [row for row in rows if all(condition(row) for condition in self.filters)]
+
+            if self.action == 'update':
+                for row in matched:
+                    row.update(self.values)
+                return FakeResponse([dict(row) for row in matched])
+            if self.action == 'delete':
+                deleted = {id(row) for row in matched}
+                client._tables[self.table] = [row for row in rows if id(row) not in deleted]
+                return FakeResponse([dict(row) for row in matched])
+
+            for column, desc, nullsfirst in reversed(self.orders):
+                matched.sort(key=lambda row: _sort_key(row.get(column)), reverse=desc)
+                if nullsfirst is not None:
+                    # nullsfirst/nullslast 지정 시 NULL 위치만 옮김 (나머지 순서 유지)
+                    nulls = [row for row in matched if row.get(column) is None]
+                    values = [row for row in matched if row.get(column) is not None]
+                    matched = nulls + values if nullsfirst else values + nulls
+
+            total = len(matched)
+            end = None if self.limit_count is None else self.offset + self.limit_count
+            matched = matched[self.offset:end]
+            data = [] if self.head else [self._project(row) for row in matched]
+
+        if self.single_row:
+            if len(data) != 1:
+                raise Exception(f"JSON object requested, multiple (or no) rows returned ({len(data)})")
+            data = data[0]
+        return FakeResponse(data, total if self.count else None)
+
+    def _filter(self, column, op, value):
+        self.filters.append(_condition(column, op, value))
+        return self
+
+    def _project(self, row):
+        if not self.columns or '*' in self.columns:
+            return dict(row)
+        return {column: row.get(column) for column in self.columns}
+
+
+def _condition(column, op, value):
+    def check(row):
+        actual = row.get(column)
+        if op == 'is':
+            return actual is None if value in (None, 'null') else actual is value
+        if op == 'in':
+            return actual in value
+        if actual is None:
+            return False
+
+        expected = _coerce(actual, value)
+        if op == 'eq':
+            return actual == expected
+        if op == 'neq':
+            return actual != expected
+        if op == 'gt':
+            return actual > expected
+        if op == 'gte':
+            return actual >= expected
+        if op == 'lt':
+            return actual < expected
+        if op == 'lte':
+            return actual <= expected
+        raise ValueError(f"지원하지 않는 연산자: {op}")
+    return check
+
+
+def _parse_or(expression):
+    """'a.lt.1,and(a.eq.1,id.lt.5)' 형식의 or 조건"""
+    conditions = [_parse_term(term) for term in _split_top_level(expression)]
+    return lambda row: any(condition(row) for condition in conditions)
+
+
+def _parse_term(term):
+    if term.startswith('and(') and term.endswith(')'):
+        conditions = [_parse_term(part) for part in _split_top_level(term[4:-1])]
+        return lambda row: all(condition(row) for condition in conditions)
+    if term.startswith('or(') and term.endswith(')'):
+        return _parse_or(term[3:-1])
+
+    column, op, value = term.split('.', 2)
+    return _condition(column, op, value)
+
+
+def _split_top_level(expression):
+    parts, depth, current = [], 0, ''
+    for ch in expression:
+        if ch == ',' and depth == 0:
+            parts.append(current)
+            current = ''
+            continue
+        depth += (ch == '(') - (ch == ')')
+        current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _coerce(actual, value):
+    """문자열로 전달된 비교 값을 컬럼 값의 타입에 맞춤"""
+    if not isinstance(value, str) or isinstance(actual, str):
+        return value
+    if isinstance(actual, bool):
+        return value.lower() == 'true'
+    if isinstance(actual, int):
+        return int(value)
+    if isinstance(actual, float):
+        return float(value)
+    return value
+
+
+def _sort_key(value):
+    # PostgreSQL 기본 정렬처럼 NULL은 오름차순에서 마지막
+    return (value is None, value if value is not None else 0)
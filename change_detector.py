@@ -0,0 +1,50 @@
+# change_detector.py
+# 공포일자 기간 조회로 모니터링 대상 중 개정된 법령만 찾기
+
+from law_id_index import normalize_law_name
+
+
+class IncrementalDetector:
+    def __init__(self, law_api, resolver=None):
+        self.law_api = law_api
+        self.resolver = resolver
+
+    def detect(self, laws, start_date, end_date, key=None):
+        """기간 내 공포된 법령 중 모니터링 대상과 일치하는 것 반환
+
+        [(법령 행, 검색 결과)] 목록, 법제처 조회에 실패하면 None
+        key: 법령 행의 식별 키 (기본: law_code)
+        """
+        key = key or (lambda law: law['law_code'])
+        promulgated = self.law_api.search_by_promulgation_date(start_date, end_date)
+        if promulgated is None:
+            return None
+
+        by_id, by_name = self._build_index(laws, key)
+        matches = {}
+
+        for record in promulgated:
+            law = by_id.get(record.get('law_id')) or by_name.get(normalize_law_name(record.get('law_name')))
+            if not law:
+                continue
+
+            if self.resolver and record.get('law_id'):
+                self.resolver.remember(key(law), record['law_id'], law['law_name'])
+
+            # 같은 법령이 여러 번 조회되면 가장 최근 공포 건 사용
+            previous = matches.get(key(law))
+            if previous is None or (record.get('amend_date') or '') > (previous[1].get('amend_date') or ''):
+                matches[key(law)] = (law, record)
+
+        return list(matches.values())
+
+    def _build_index(self, laws, key):
+        """법령ID(확인된 법령만) / 법령명(공백 제외) 기준 색인"""
+        by_id = {}
+        by_name = {}
+        for law in laws:
+            law_id = self.resolver.get(key(law)) if self.resolver else None
+            if law_id:
+                by_id[law_id] = law
+            by_name[normalize_law_name(law.get('law_name'))] = law
+        return by_id, by_name
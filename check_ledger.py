@@ -0,0 +1,214 @@
+# check_ledger.py
+# 법령별 확인 기록 (마지막으로 확인한 법제처 버전 지문, 성공/오류 시각, 다음 개별 확인 예정 시각)
+#
+# - 지문: 법령ID/공포일자/공포번호/시행일자 (+ 상세 조회 결과이면 본문 해시)
+# - 목록 조회 결과의 지문이 기록과 같으면 상세 조회 없이 변경 없음으로 판단
+# - 최근 개정된 법령은 자주, 오래 개정되지 않은 법령은 드물게 개별 확인, 오류가 난 법령은 다음 실행에서 먼저 확인
+#
+# monitor.py(law_code)와 app.py(law_name)가 같은 파일을 쓰므로 scope(스키마별 실행 코드)로 구분한다.
+# 변경/오류 없이 끝난 예약 실행은 monitoring_logs 대신 run_marks에 완료 시각만 남긴다.
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+FINGERPRINT_FIELDS = ('law_id', 'amend_date', 'amend_no', 'enf_date')
+
+
+class CheckLedger:
+    def __init__(self, path, min_interval_hours=24, max_interval_hours=168):
+        self.min_interval_hours = min_interval_hours
+        self.max_interval_hours = max(min_interval_hours, max_interval_hours)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS law_checks (
+                scope TEXT NOT NULL,
+                law_key TEXT NOT NULL,
+                law_id TEXT,
+                amend_date TEXT,
+                amend_no TEXT,
+                enf_date TEXT,
+                content_hash TEXT,
+                last_success_at REAL,
+                last_changed_at REAL,
+                last_error_at REAL,
+                last_error TEXT,
+                error_count INTEGER NOT NULL DEFAULT 0,
+                next_check_at REAL,
+                PRIMARY KEY (scope, law_key)
+            )
+        ''')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS run_marks (
+                scope TEXT PRIMARY KEY,
+                completed_at REAL NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+    def get(self, scope, law_key):
+        """법령 확인 기록 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT * FROM law_checks WHERE scope = ? AND law_key = ?', (scope, str(law_key))
+            ).fetchone()
+        return dict(row) if row else None
+
+    def entries(self, scope):
+        """scope의 모든 확인 기록 ({법령 키: 기록})"""
+        with self._lock:
+            rows = self._conn.execute('SELECT * FROM law_checks WHERE scope = ?', (scope,)).fetchall()
+        return {row['law_key']: dict(row) for row in rows}
+
+    def matches(self, scope, law_key, law_info):
+        """law_info(목록/상세 조회 결과)가 마지막으로 성공한 확인 때와 같은 버전인지
+
+        law_info에 있는 지문 항목만 비교하고(목록 조회에는 본문이 없음), 법령ID와 공포일자는 반드시 있어야 한다.
+        """
+        entry = self.get(scope, law_key)
+        if not entry or not entry['last_success_at']:
+            return False
+
+        current = fingerprint(law_info)
+        if not current['law_id'] or not current['amend_date']:
+            return False
+
+        for field in FINGERPRINT_FIELDS + ('content_hash',):
+            if current[field] and entry[field] and current[field] != entry[field]:
+                return False
+            if current[field] and not entry[field] and field in ('law_id', 'amend_date'):
+                return False
+        return True
+
+    def record_success(self, scope, law_key, law_info, changed=False):
+        """확인 성공 기록 (지문 갱신, 오류 횟수 초기화, 다음 확인 시각 계산)"""
+        now = time.time()
+        current = fingerprint(law_info)
+        previous = self.get(scope, law_key)
+
+        # 목록 조회 결과로 확인한 경우 본문 해시 등 없는 항목은 이전 값 유지
+        if previous:
+            for field in FINGERPRINT_FIELDS + ('content_hash',):
+                if not current[field] and previous[field] and current['amend_date'] == previous['amend_date']:
+                    current[field] = previous[field]
+
+        version_changed = changed or not previous or previous['amend_date'] != current['amend_date']
+        last_changed_at = now if version_changed else previous['last_changed_at']
+        next_check_at = now + self.interval_seconds(current['amend_date'], now)
+
+        with self._lock:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO law_checks (
+                    scope, law_key, law_id, amend_date, amend_no, enf_date, content_hash,
+                    last_success_at, last_changed_at, last_error_at, last_error, error_count, next_check_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)
+            ''', (
+                scope, str(law_key), current['law_id'], current['amend_date'], current['amend_no'],
+                current['enf_date'], current['content_hash'], now, last_changed_at,
+                previous['last_error_at'] if previous else None,
+                previous['last_error'] if previous else None,
+                next_check_at
+            ))
+            self._conn.commit()
+
+    def record_error(self, scope, law_key, error):
+        """확인 실패 기록 (다음 실행에서 바로 다시 확인)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('''
+                INSERT INTO law_checks (scope, law_key, last_error_at, last_error, error_count, next_check_at)
+                VALUES (?, ?, ?, ?, 1, ?)
+                ON CONFLICT (scope, law_key) DO UPDATE SET
+                    last_error_at = excluded.last_error_at,
+                    last_error = excluded.last_error,
+                    error_count = law_checks.error_count + 1,
+                    next_check_at = excluded.next_check_at
+            ''', (scope, str(law_key), now, str(error)[:500], now))
+            self._conn.commit()
+
+    def mark_run(self, scope, completed_at):
+        """오류 없이 끝난 실행 시각 기록 (이전 기록보다 늦을 때만 갱신)"""
+        with self._lock:
+            self._conn.execute('''
+                INSERT INTO run_marks (scope, completed_at) VALUES (?, ?)
+                ON CONFLICT (scope) DO UPDATE SET completed_at = max(run_marks.completed_at, excluded.completed_at)
+            ''', (scope, completed_at))
+            self._conn.commit()
+
+    def last_run(self, scope):
+        """mark_run으로 기록한 마지막 실행 시각 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute('SELECT completed_at FROM run_marks WHERE scope = ?', (scope,)).fetchone()
+        return datetime.fromtimestamp(row['completed_at']) if row else None
+
+    def is_due(self, scope, law_key, now=None):
+        """개별 확인이 필요한지 (기록 없음 / 마지막 확인이 오류 / 다음 확인 시각 경과)"""
+        entry = self.get(scope, law_key)
+        if not entry or not entry['last_success_at'] or has_error(entry):
+            return True
+        return (entry['next_check_at'] or 0) <= (now or time.time())
+
+    def prioritize(self, scope, items, law_key):
+        """확인 순서 정렬: 오류가 났던 법령 → 기록 없는 법령 → 다음 확인 시각이 이른 순
+
+        items: 법령 또는 (법령, 조회 결과) 목록, law_key(법령) -> 키
+        """
+        entries = self.entries(scope)
+
+        def order(item):
+            law = item[0] if isinstance(item, tuple) else item
+            entry = entries.get(str(law_key(law)))
+            if entry is None or not entry['last_success_at']:
+                return (0 if entry and has_error(entry) else 1, 0.0)
+            return (0 if has_error(entry) else 2, entry['next_check_at'] or 0.0)
+
+        return sorted(items, key=order)
+
+    def interval_seconds(self, amend_date, now=None):
+        """다음 개별 확인까지 간격: 마지막 공포 후 30일마다 최소 간격만큼 늘림 (최소~최대 간격)"""
+        now = now or time.time()
+        try:
+            promulgated = datetime.strptime(str(amend_date)[:8], '%Y%m%d').timestamp()
+            dormant_days = max(0.0, (now - promulgated) / 86400)
+        except (TypeError, ValueError):
+            dormant_days = float('inf')
+
+        hours = self.min_interval_hours * max(1.0, dormant_days / 30)
+        return min(hours, self.max_interval_hours) * 3600
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def fingerprint(law_info):
+    """법제처 조회 결과의 버전 지문 (날짜는 숫자만, 본문이 있으면 해시)"""
+    law_info = law_info or {}
+    text = law_info.get('full_text') or law_info.get('content')
+    return {
+        'law_id': str(law_info['law_id']) if law_info.get('law_id') else None,
+        'amend_date': _digits(law_info.get('amend_date')),
+        'amend_no': str(law_info['amend_no']) if law_info.get('amend_no') else None,
+        'enf_date': _digits(law_info.get('enf_date')),
+        'content_hash': hashlib.sha256(text.encode('utf-8')).hexdigest() if text else None
+    }
+
+
+def _digits(value):
+    digits = ''.join(ch for ch in str(value or '') if ch.isdigit())[:8]
+    return digits or None
+
+
+def has_error(entry):
+    """마지막 성공 이후에 오류가 있었는지"""
+    return bool(entry['last_error_at']) and entry['last_error_at'] >= (entry['last_success_at'] or 0)
@@ -0,0 +1,77 @@
+# checkpoint.py
+# 재시작 가능한 수집 작업용 체크포인트 파일
+
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class BackfillCheckpoint:
+    def __init__(self, path, start_date, end_date):
+        self.path = path
+        self.start = start_date.strftime('%Y-%m-%d')
+        self.end = end_date.strftime('%Y-%m-%d')
+        self.completed_laws = set()
+        self.saved_amendments = set()
+        self._lock = threading.Lock()
+
+    def load(self):
+        """같은 수집 기간의 체크포인트가 있으면 불러오고 True 반환"""
+        if not os.path.exists(self.path):
+            return False
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  체크포인트를 읽을 수 없어 처음부터 시작합니다: {e}")
+            return False
+
+        if data.get('start') != self.start or data.get('end') != self.end:
+            print(f"⚠️  수집 기간이 달라 기존 체크포인트를 사용하지 않습니다. "
+                  f"({data.get('start')} ~ {data.get('end')})")
+            return False
+
+        self.completed_laws = set(data.get('completed_laws', []))
+        self.saved_amendments = {tuple(item) for item in data.get('saved_amendments', [])}
+        return True
+
+    def is_law_completed(self, law_code):
+        with self._lock:
+            return law_code in self.completed_laws
+
+    def mark_amendment_saved(self, law_code, amendment_date):
+        with self._lock:
+            self.saved_amendments.add((law_code, amendment_date))
+            self._save()
+
+    def mark_law_completed(self, law_code):
+        with self._lock:
+            self.completed_laws.add(law_code)
+            self._save()
+
+    def remove(self):
+        """수집이 모두 끝나면 체크포인트 삭제"""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _save(self):
+        """임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 파일이 깨지지 않도록 저장"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        data = {
+            'start': self.start,
+            'end': self.end,
+            'updated_at': datetime.now().isoformat(),
+            'completed_laws': sorted(self.completed_laws),
+            'saved_amendments': sorted(list(item) for item in self.saved_amendments)
+        }
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,584 @@
+# detection_engine.py
+# 법령 개정 감지 공통 엔진 (monitor.py의 law_master, app.py의 monitored_laws가 함께 사용)
+#
+# 법령 목록 조회 → 공포일자 기간 조회로 확인 대상 선별 → 법령별 상세 조회(동시 실행) → 신규 개정 저장
+# 법령별 확인 기록(check_ledger)으로 정기 개별 확인 대상/순서를 정하고, 버전이 같으면 상세 조회를 생략한다.
+# 테이블 구조에 따라 달라지는 부분(목록 조회, 신규 여부 판단, 저장 형식)은 스키마 어댑터가 담당한다.
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from amendment_index import AmendmentIndex
+from batch_writer import BatchWriter
+from change_detector import IncrementalDetector
+from check_ledger import CheckLedger, fingerprint
+from law_api import LawAPI, LawAPIError
+from law_id_index import LawIdResolver
+from metrics import registry
+from config import (
+    MONITOR_MAX_WORKERS, WRITE_BATCH_SIZE, LAW_ID_INDEX_PATH, INCREMENTAL_OVERLAP_DAYS,
+    CHECK_LEDGER_PATH, CHECK_INTERVAL_HOURS, CHECK_MAX_INTERVAL_HOURS
+)
+
+LAWS_CHECKED = registry.counter('laws_checked_total', '법령 확인 수 (결과별)')
+LEDGER_CONFIRMED = registry.counter('ledger_confirmed_total', '확인 기록과 같은 버전이라 상세 조회를 생략한 법령 수')
+
+
+class DetectionEngine:
+    def __init__(self, supabase, schema, law_api=None, writer=None, resolver=None, ledger=None,
+                 on_amendment=None, on_unchanged=None, get_version=None):
+        """on_amendment(law, detail_info, amendment_id): 신규 개정 저장 후 호출
+        on_unchanged(law, law_info): 변경이 없는 법령 확인 후 호출
+        get_version(law_id, amend_date): 상세 정보 조회 (기본: law_api.get_law_info)
+        """
+        self.supabase = supabase
+        self.schema = schema
+        # 호출 실패는 예외로 받아 "변경 없음"으로 처리하지 않음 (확인일 갱신 없이 재시도)
+        self.law_api = law_api or LawAPI(strict=True)
+        self.writer = writer or BatchWriter(supabase, batch_size=WRITE_BATCH_SIZE)
+        self.resolver = resolver or LawIdResolver(self.law_api, LAW_ID_INDEX_PATH)
+        self.ledger = ledger or CheckLedger(
+            CHECK_LEDGER_PATH,
+            min_interval_hours=CHECK_INTERVAL_HOURS,
+            max_interval_hours=CHECK_MAX_INTERVAL_HOURS
+        )
+        self.detector = IncrementalDetector(self.law_api, self.resolver)
+        self.on_amendment = on_amendment
+        self.on_unchanged = on_unchanged
+        self.get_version = get_version or (lambda law_id, amend_date: self.law_api.get_law_info(law_id))
+
+        self.check_time = None
+        self.failed_laws = []
+
+    def run(self, laws=None, full=False, max_workers=None, progress=None, individual=None):
+        """법령 확인 실행 (저장은 finish()에서 마무리)
+
+        full=True이거나 기준 시점이 없으면 모든 법령을 개별 조회.
+        증분 확인 시에도 확인 기록상 개별 확인할 때가 된 법령(오류 포함)은 함께 확인한다.
+        individual: 스케줄러가 고른 개별 확인 법령 목록 (지정하면 공포된 법령 + 이 목록만 확인)
+        progress: 진행 상황 콜백 (done=확인한 법령 수, total=전체 법령 수, found=변경 발견 수)
+        """
+        max_workers = max_workers or MONITOR_MAX_WORKERS
+        # 이번 실행의 확인 시각 (확인일을 한 번에 갱신하기 위해 공통 값 사용)
+        self.check_time = datetime.now().isoformat()
+        self.failed_laws = []
+
+        laws = self.schema.load_laws(self.supabase) if laws is None else laws
+        result = {'started_at': time.time(), 'laws': len(laws), 'changes': 0, 'failed': [], 'write_failures': []}
+        if not laws:
+            return result
+
+        self.schema.prepare(self.supabase, laws)
+
+        if individual is not None:
+            result['scheduled'] = True
+            targets, done = self._scheduled_targets(laws, individual, result)
+            print(f"총 {len(laws)}개 법령 중 {len(targets)}개 확인 대상 "
+                  f"(예약 개별 확인 {len(individual)}개, 동시 실행: {max_workers})\n")
+            targets = self.ledger.prioritize(self.schema.run_log_code, targets, self.schema.law_key)
+            return self._check_targets(targets, len(laws), done, result, max_workers, progress)
+
+        targets = None if full else self._detect_candidates(laws)
+        done = 0
+        if targets is None:
+            targets = [(law, None) for law in laws]
+            print(f"총 {len(laws)}개 법령 개별 확인 중... (동시 실행: {max_workers})\n")
+        else:
+            # 기간 내 공포가 없는 법령은 조회 없이 확인 완료 처리
+            promulgated = len(targets)
+            checked = {id(law) for law, _ in targets}
+            scope = self.schema.run_log_code
+            for law in laws:
+                if id(law) in checked:
+                    continue
+                if self.schema.needs_full_check(law) or self.ledger.is_due(scope, self.schema.law_key(law)):
+                    # 한 번도 확인하지 않았거나, 지난 확인이 오류였거나, 정기 개별 확인 시기가 된 법령
+                    targets.append((law, None))
+                else:
+                    self.schema.mark_checked(self.writer, law, self.check_time)
+                    LAWS_CHECKED.inc(result='skipped')
+                    done += 1
+            print(f"총 {len(laws)}개 법령 중 {len(targets)}개 확인 대상 "
+                  f"(공포 {promulgated}개, 개별 확인 {len(targets) - promulgated}개, 동시 실행: {max_workers})\n")
+
+        # 지난 실행에서 오류가 난 법령부터 확인
+        targets = self.ledger.prioritize(self.schema.run_log_code, targets, self.schema.law_key)
+        return self._check_targets(targets, len(laws), done, result, max_workers, progress)
+
+    def _check_targets(self, targets, total, done, result, max_workers, progress):
+        """확인 대상 [(법령, 조회 결과)]를 작업자 풀에서 확인하고 실패한 법령은 한 번 더 시도"""
+        if progress:
+            progress(total=total, done=done, found=0)
+
+        # 법령별 확인 작업은 서로 독립적이므로 작업자 풀에서 동시에 실행
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._check_law_safely, law, law_info) for law, law_info in targets]
+
+            for future in as_completed(futures):
+                if future.result():
+                    result['changes'] += 1
+                done += 1
+                if progress:
+                    progress(done=done, found=result['changes'])
+
+        result['changes'] += self._retry_failed_laws()
+        if progress:
+            progress(found=result['changes'])
+        result['failed'] = list(self.failed_laws)
+        return result
+
+    def finish(self, result):
+        """모아둔 쓰기 일괄 저장 후 실행 기록 (저장 실패 내역 반환)"""
+        result['write_failures'] = self.writer.flush()
+
+        errors = []
+        if result.get('incomplete'):
+            errors.append(result['incomplete'])
+        if result['failed']:
+            names = ', '.join(self.schema.law_key(law) for law in result['failed'][:10])
+            errors.append(f"확인 실패 {len(result['failed'])}건: {names}")
+        if result['write_failures']:
+            errors.append(self._summarize_write_failures(result['write_failures']))
+
+        if result.get('scheduled') and not errors and not result['changes']:
+            # 변경/오류 없는 예약 실행은 짧은 주기로 반복되므로 monitoring_logs에 남기지 않고
+            # 다음 증분 확인의 기준 시점만 확인 기록에 저장 (대시보드 최근 로그가 밀려나지 않도록)
+            self.ledger.mark_run(self.schema.run_log_code, result['started_at'])
+            return result['write_failures']
+
+        # 오류가 있었던 실행은 다음 증분 확인의 기준 시점으로 사용하지 않음 (error_message 기록)
+        try:
+            self.schema.log_run(self.supabase, result, ' / '.join(errors) or None)
+        except Exception as e:
+            print(f"⚠️  실행 기록 저장 실패: {e}")
+        return result['write_failures']
+
+    def check_law(self, law, law_info=None):
+        """개별 법령 확인 (law_info: 공포일자 조회 등으로 이미 받은 결과가 있으면 다시 조회하지 않음)"""
+        law_name = law['law_name']
+        scope = self.schema.run_log_code
+        law_key = self.schema.law_key(law)
+
+        if law_info is None:
+            # 이전에 확인한 법령은 목록 조회(본문 제외)로 같은 버전인지 먼저 확인
+            law_info = self._find_listing(law)
+            if law_info is None or not self.ledger.matches(scope, law_key, law_info):
+                # 확인된 법령ID로 현재 버전 상세 조회
+                law_info = self.get_current_law_info(law)
+
+            if not law_info:
+                # 확인하지 못한 법령이므로 확인일 갱신 없이 오류로 기록 (_check_law_safely)
+                raise LawAPIError('법령 정보 조회 결과 없음')
+
+        current_amend_date = law_info.get('amend_date')
+        if not current_amend_date:
+            return False
+
+        if self.ledger.matches(scope, law_key, law_info):
+            # 지난번에 확인을 마친 버전 그대로 (신규 여부 판단/기준본 저장 생략)
+            LEDGER_CONFIRMED.inc()
+            self.ledger.record_success(scope, law_key, law_info)
+            return False
+
+        if not self.schema.is_new(law, parse_date(current_amend_date)):
+            # 변경사항 없음
+            if self.on_unchanged:
+                self.on_unchanged(law, law_info)
+            self.ledger.record_success(scope, law_key, law_info)
+            return False
+
+        # 새로운 개정 발견!
+        print(f"  🆕 [{law_name}] 새 개정 발견: {current_amend_date}")
+
+        # 상세 정보 조회
+        detail_info = law_info
+        law_id = law_info.get('law_id')
+        if law_id and 'full_text' not in law_info:
+            detail_info = self.get_version(law_id, current_amend_date) or law_info
+
+        if not same_version(law_info, detail_info):
+            # 목록에는 새 버전이 나왔지만 상세 조회는 이전 버전 (이전 버전을 새 개정으로 저장하지 않고 다음 실행에서 재시도)
+            self.schema.discard(law, parse_date(current_amend_date))
+            raise LawAPIError(f"상세 조회 버전 불일치 (목록 {current_amend_date}/{law_info.get('amend_no')}, "
+                              f"상세 {detail_info.get('amend_date')}/{detail_info.get('amend_no')})")
+
+        try:
+            amendment_id = self.schema.save_amendment(self.supabase, law, detail_info)
+        except Exception:
+            self.schema.discard(law, parse_date(current_amend_date))
+            raise
+
+        if self.on_amendment and amendment_id is not None:
+            self.on_amendment(law, detail_info, amendment_id)
+        self.ledger.record_success(scope, law_key, detail_info, changed=True)
+        return True
+
+    def get_current_law_info(self, law):
+        """법령 상세 정보 (저장된 법령ID로 조회되지 않으면 법령명으로 다시 확인 후 재조회)"""
+        law_key = self.schema.law_key(law)
+        law_name = law['law_name']
+
+        law_id = self.resolver.resolve(law_key, law_name)
+        if not law_id:
+            return None
+
+        law_info = self.law_api.get_law_info(law_id)
+        if law_info:
+            return law_info
+
+        refreshed_id = self.resolver.resolve(law_key, law_name, refresh=True)
+        if not refreshed_id or refreshed_id == law_id:
+            return None
+        return self.law_api.get_law_info(refreshed_id)
+
+    def _find_listing(self, law):
+        """확인 기록이 있는 법령의 법령명 검색 결과 중 저장된 법령ID와 같은 항목 (없으면 None)"""
+        law_key = self.schema.law_key(law)
+        if not self.ledger.get(self.schema.run_log_code, law_key):
+            # 처음 확인하는 법령은 어차피 상세 조회가 필요하므로 검색 생략
+            return None
+
+        law_id = self.resolver.get(law_key)
+        if not law_id:
+            return None
+
+        # 같은 버전이면 다음 확인 시각이 뒤로 밀리므로 캐시된 목록이 아닌 현재 목록으로 확인
+        for record in self.law_api.search_law(law['law_name'], fresh=True) or []:
+            if record.get('law_id') == law_id:
+                return record
+        return None
+
+    def _check_law_safely(self, law, law_info=None):
+        """개별 법령 확인 (오류는 해당 법령에 한정하여 기록)"""
+        law_name = law['law_name']
+
+        try:
+            has_changes = self.check_law(law, law_info)
+            if has_changes:
+                print(f"📋 {law_name}: ✅ 변경사항 발견!")
+            else:
+                print(f"📋 {law_name}: ⏺️  변경사항 없음")
+            LAWS_CHECKED.inc(result='changed' if has_changes else 'unchanged')
+
+            # 마지막 확인일 업데이트 (실행 종료 시 일괄 저장)
+            self.schema.mark_checked(self.writer, law, self.check_time)
+
+            return has_changes
+
+        except Exception as e:
+            print(f"📋 {law_name}: ❌ 오류: {e}")
+            LAWS_CHECKED.inc(result='error')
+            self.failed_laws.append(law)
+            self.ledger.record_error(self.schema.run_log_code, self.schema.law_key(law), e)
+            try:
+                self.schema.log_error(self.supabase, self.schema.law_key(law), str(e))
+            except Exception as log_error:
+                print(f"  ⚠️  오류 로그 기록 실패: {log_error}")
+            return False
+
+    def _scheduled_targets(self, laws, individual, result):
+        """예약 실행 확인 대상: 공포된 법령 + 스케줄러가 고른 법령 ([(법령, 조회 결과)], 확인 완료 처리한 수)
+
+        공포일자 기간 조회를 하지 못하면 고른 법령만 확인하고, 다음 실행이 같은 기간을 다시 조회하도록
+        실행 기록에 오류를 남긴다. (기준 시점이 없으면 모든 법령이 한 번씩 확인된 시점을 기준으로 사용)
+        """
+        targets = self._detect_candidates(laws, fallback_watermark=self._ledger_coverage(laws))
+        if targets is None:
+            result['incomplete'] = '공포일자 기간 조회 없이 예약된 법령만 확인'
+            targets = []
+
+        checked = {id(law) for law, _ in targets}
+        for law in individual:
+            if id(law) not in checked:
+                targets.append((law, None))
+                checked.add(id(law))
+
+        done = 0
+        if not result.get('incomplete'):
+            # 공포가 없는 나머지 법령은 조회 없이 확인 완료 처리
+            for law in laws:
+                if id(law) not in checked:
+                    self.schema.mark_checked(self.writer, law, self.check_time)
+                    LAWS_CHECKED.inc(result='skipped')
+                    done += 1
+        return targets, done
+
+    def _ledger_coverage(self, laws):
+        """모든 법령이 개별 확인을 한 번 이상 마친 시점 (확인 기록이 없는 법령이 있으면 None)"""
+        entries = self.ledger.entries(self.schema.run_log_code)
+        times = []
+        for law in laws:
+            entry = entries.get(str(self.schema.law_key(law)))
+            if not entry or not entry['last_success_at']:
+                return None
+            times.append(entry['last_success_at'])
+        return datetime.fromtimestamp(min(times)) if times else None
+
+    def _detect_candidates(self, laws, fallback_watermark=None):
+        """지난 성공 실행 이후 공포된 대상 [(법령, 검색 결과)], 판단할 수 없으면 None
+
+        기준 시점은 monitoring_logs의 마지막 성공 실행과 확인 기록의 조용한 예약 실행(mark_run) 중 늦은 쪽
+        """
+        try:
+            watermark = self.schema.get_watermark(self.supabase)
+        except Exception as e:
+            print(f"⚠️  이전 실행 기록 조회 실패: {e}")
+            watermark = None
+        quiet_run = self.ledger.last_run(self.schema.run_log_code)
+        if quiet_run and (not watermark or quiet_run > watermark):
+            watermark = quiet_run
+        watermark = watermark or fallback_watermark
+        if not watermark:
+            print("ℹ️  이전 성공 실행 기록이 없어 전체 확인을 진행합니다.")
+            return None
+
+        # 공포 후 목록 반영이 늦어지는 경우를 고려하여 기간을 겹쳐서 조회
+        start_date = watermark - timedelta(days=INCREMENTAL_OVERLAP_DAYS)
+        try:
+            targets = self.detector.detect(laws, start_date, datetime.now(), key=self.schema.law_key)
+        except LawAPIError:
+            targets = None
+        if targets is None:
+            print("⚠️  공포일자 기간 조회 실패, 전체 확인으로 전환합니다.")
+        return targets
+
+    def _retry_failed_laws(self):
+        """실패한 법령을 실행 마지막에 한 번 더 확인 (호출이 중단된 경우 재개될 때까지 대기)"""
+        failed = self.failed_laws
+        if not failed:
+            return 0
+
+        self.failed_laws = []
+        wait = self.law_api.retry_after()
+        if wait:
+            print(f"\n⏳ 법제처 API 호출 재개까지 {wait:.0f}초 대기 후 재시도합니다.")
+            time.sleep(wait)
+
+        print(f"\n🔁 실패한 법령 {len(failed)}개 재시도\n")
+        return sum(1 for law in failed if self._check_law_safely(law))
+
+    def _summarize_write_failures(self, failures):
+        """일괄 저장 실패 내역 요약 (테이블별 건수 + 첫 오류)"""
+        counts = {}
+        for failure in failures:
+            counts[failure['table']] = counts.get(failure['table'], 0) + 1
+
+        summary = ', '.join(f"{table} {count}건" for table, count in counts.items())
+        return f"일괄 저장 실패: {summary} (첫 오류: {failures[0]['error']})"
+
+
+class LawSchema:
+    """스키마 어댑터 공통 부분 (실행/오류 기록은 monitoring_logs 사용)"""
+
+    # monitoring_logs에 전체 실행을 기록할 때의 law_code
+    run_log_code = 'ALL'
+
+    # 법령별 개정 횟수 집계(load_amendment_counts)에 사용하는 law_amendments 컬럼
+    amendment_key_column = None
+    amendment_date_column = None
+    amendment_date_format = '%Y-%m-%d'
+
+    def load_laws(self, supabase):
+        raise NotImplementedError
+
+    def law_key(self, law):
+        """법령 식별 키 (법령ID 매핑/로그에 사용)"""
+        raise NotImplementedError
+
+    def prepare(self, supabase, laws):
+        """실행 전 준비 (중복 확인 인덱스 로드 등)"""
+
+    def needs_full_check(self, law):
+        return False
+
+    def is_new(self, law, amend_date):
+        raise NotImplementedError
+
+    def discard(self, law, amend_date):
+        """저장 실패 시 is_new에서 선점한 항목 해제"""
+
+    def save_amendment(self, supabase, law, amendment_info):
+        """신규 개정 저장 후 개정 이력 id 반환"""
+        raise NotImplementedError
+
+    def mark_checked(self, writer, law, check_time):
+        """확인 완료 표시 (writer로 일괄 저장)"""
+
+    def load_amendment_counts(self, supabase, since, page_size=1000):
+        """since 이후 공포된 개정 이력의 법령별 건수 ({법령 키: 건수})"""
+        counts = {}
+        offset = 0
+
+        while True:
+            rows = supabase.table('law_amendments')\
+                .select(f'{self.amendment_key_column},{self.amendment_date_column}')\
+                .gte(self.amendment_date_column, since.strftime(self.amendment_date_format))\
+                .range(offset, offset + page_size - 1)\
+                .execute().data or []
+
+            for row in rows:
+                key = str(row.get(self.amendment_key_column))
+                counts[key] = counts.get(key, 0) + 1
+
+            if len(rows) < page_size:
+                return counts
+            offset += page_size
+
+    def get_watermark(self, supabase):
+        """마지막으로 오류 없이 끝난 전체 실행 시각"""
+        result = supabase.table('monitoring_logs')\
+            .select('check_date')\
+            .eq('law_code', self.run_log_code)\
+            .eq('status', 'success')\
+            .is_('error_message', 'null')\
+            .order('check_date', desc=True)\
+            .limit(1)\
+            .execute()
+
+        if not result.data:
+            return None
+        return parse_date(result.data[0]['check_date'])
+
+    def log_run(self, supabase, result, error_message=None):
+        log_data = {
+            'check_date': datetime.now().isoformat(),
+            'law_code': self.run_log_code,
+            'status': 'success',
+            'changes_detected': result['changes'] > 0,
+            'execution_time': int(time.time() - result['started_at'])
+        }
+        if error_message:
+            log_data['error_message'] = error_message
+        supabase.table('monitoring_logs').insert(log_data).execute()
+
+    def log_error(self, supabase, law_code, error_message):
+        supabase.table('monitoring_logs').insert({
+            'check_date': datetime.now().isoformat(),
+            'law_code': law_code,
+            'status': 'error',
+            'changes_detected': False,
+            'error_message': error_message
+        }).execute()
+
+
+class LawMasterSchema(LawSchema):
+    """monitor.py: law_master / law_amendments(영문 컬럼)"""
+
+    amendment_key_column = 'law_code'
+    amendment_date_column = 'amendment_date'
+
+    def __init__(self, pending_summary=''):
+        self.pending_summary = pending_summary
+
+    def load_laws(self, supabase):
+        return supabase.table('law_master').select('*').eq('is_active', True).execute().data
+
+    def law_key(self, law):
+        return law['law_code']
+
+    def needs_full_check(self, law):
+        return not law.get('last_check_date')
+
+    def is_new(self, law, amend_date):
+        last_amendment = law.get('last_amendment_date')
+        return not last_amendment or amend_date > parse_date(last_amendment)
+
+    def save_amendment(self, supabase, law, amendment_info):
+        """개정 이력은 바로 저장하고 분석 결과는 나중에 채움 (요약은 pending_summary)"""
+        amend_date = parse_date(amendment_info.get('amend_date')).date().isoformat()
+        amendment_data = {
+            'law_code': law['law_code'],
+            'amendment_date': amend_date,
+            'enforcement_date': parse_date(amendment_info['enf_date']).date().isoformat() if amendment_info.get('enf_date') else None,
+            'amendment_no': amendment_info.get('amend_no'),
+            'amendment_type': amendment_info.get('law_type'),
+            'original_text': amendment_info.get('content') or '',
+            'summary': self.pending_summary,
+            'impact_analysis': '',
+            'is_reviewed': False
+        }
+
+        result = supabase.table('law_amendments').insert(amendment_data).execute()
+
+        # 최종 개정일 업데이트
+        supabase.table('law_master')\
+            .update({'last_amendment_date': amend_date})\
+            .eq('law_code', law['law_code'])\
+            .execute()
+
+        return result.data[0]['id'] if result.data else None
+
+    def mark_checked(self, writer, law, check_time):
+        writer.update('law_master', {'last_check_date': check_time}, 'id', law['id'])
+
+
+class MonitoredLawsSchema(LawSchema):
+    """app.py: monitored_laws / law_amendments(한글 컬럼), 최근 lookback_days일 이내 공포만 저장"""
+
+    run_log_code = 'MONITORED_LAWS'
+    amendment_key_column = 'law_name'
+    amendment_date_column = '공포일자'
+    amendment_date_format = '%Y%m%d'
+
+    def __init__(self, lookback_days=30):
+        self.lookback_days = lookback_days
+        self.amendment_index = None
+
+    def load_laws(self, supabase):
+        return supabase.table('monitored_laws').select('*').eq('is_active', True).execute().data
+
+    def law_key(self, law):
+        return law['law_name']
+
+    def prepare(self, supabase, laws):
+        # 기간 내 기존 개정사항을 한 번에 읽어 중복 체크에 사용
+        self.amendment_index = AmendmentIndex(supabase, 'law_name', '공포일자', date_format='%Y%m%d')
+        self.amendment_index.load(datetime.now() - timedelta(days=self.lookback_days + 1), datetime.now())
+
+    def is_new(self, law, amend_date):
+        if (datetime.now() - amend_date).days > self.lookback_days:
+            return False
+        return self.amendment_index.claim(law['law_name'], amend_date.strftime('%Y%m%d'))
+
+    def discard(self, law, amend_date):
+        self.amendment_index.discard(law['law_name'], amend_date.strftime('%Y%m%d'))
+
+    def save_amendment(self, supabase, law, amendment_info):
+        law_name = law['law_name']
+        revision_type = amendment_info.get('amend_type')
+        enforce_date = amendment_info.get('enf_date')
+
+        amendment_data = {
+            'law_name': law_name,
+            '공포일자': parse_date(amendment_info['amend_date']).strftime('%Y%m%d'),
+            '시행일자': parse_date(enforce_date).strftime('%Y%m%d') if enforce_date else None,
+            '개정유형': revision_type if revision_type else '일부개정',
+            '내용요약': f'{law_name} {revision_type if revision_type else "개정"}',
+            '읽음여부': False,
+            '알림발송여부': False
+        }
+
+        result = supabase.table('law_amendments').insert(amendment_data).execute()
+        return result.data[0]['id'] if result.data else None
+
+
+def same_version(listing, detail):
+    """목록 조회 결과와 상세 조회 결과가 같은 버전인지 (공포일자, 목록에 공포번호가 있으면 공포번호까지 비교)"""
+    expected, actual = fingerprint(listing), fingerprint(detail)
+    if expected['amend_date'] != actual['amend_date']:
+        return False
+    return not expected['amend_no'] or expected['amend_no'] == actual['amend_no']
+
+
+def parse_date(date_str):
+    """날짜 문자열 파싱 (YYYYMMDD / YYYY-MM-DD / ISO 형식, 실패 시 현재 시각)"""
+    if not date_str:
+        return datetime.now()
+
+    date_str = str(date_str).replace('-', '').replace('.', '').replace('/', '')
+
+    try:
+        return datetime.strptime(date_str[:8], '%Y%m%d')
+    except ValueError:
+        return datetime.now()
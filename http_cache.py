@@ -0,0 +1,139 @@
+# http_cache.py
+# 법제처 API 응답 디스크 캐시 (TTL + 용량 기준 LRU 정리)
+
+import os
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    def __init__(self, path, ttl_seconds, max_bytes):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'revalidated': 0,
+            'stores': 0,
+            'evictions': 0
+        }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(endpoint, params):
+        """엔드포인트 + 정규화된 파라미터 (인증키/응답형식 제외)"""
+        parts = []
+        for name in sorted(params, key=str.lower):
+            if name.lower() in ('oc', 'type'):
+                continue
+            value = ' '.join(str(params[name]).split())
+            parts.append(f"{name.lower()}={value}")
+        return f"{endpoint}?{'&'.join(parts)}"
+
+    def get(self, key):
+        """캐시 항목 조회 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?',
+                (key,)
+            ).fetchone()
+
+            if not row:
+                return None
+
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+
+        body, etag, last_modified, fetched_at = row
+        return {
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': fetched_at
+        }
+
+    def is_fresh(self, entry):
+        """TTL 이내의 항목인지 확인"""
+        return time.time() - entry['fetched_at'] < self.ttl_seconds
+
+    def put(self, key, body, etag=None, last_modified=None):
+        """응답 저장 후 용량 초과분 정리"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, body, etag, last_modified, fetched_at, last_access, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, body, etag, last_modified, now, now, len(body))
+            )
+            self._stats['stores'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, key):
+        """304 응답으로 재검증된 항목의 TTL 갱신"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET fetched_at = ?, last_access = ? WHERE key = ?',
+                (now, now, key)
+            )
+            self._conn.commit()
+
+    def record(self, event):
+        """통계 카운터 증가 (hits / misses / revalidated)"""
+        with self._lock:
+            self._stats[event] += 1
+
+    def stats(self):
+        """캐시 통계 (요청 절감 확인용)"""
+        with self._lock:
+            stats = dict(self._stats)
+            entries, total_bytes = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+
+        lookups = stats['hits'] + stats['misses'] + stats['revalidated']
+        stats['entries'] = entries
+        stats['bytes'] = total_bytes
+        stats['hit_rate'] = round((stats['hits'] + stats['revalidated']) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self):
+        """최근에 사용되지 않은 항목부터 max_bytes 이하가 될 때까지 삭제"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute('SELECT key, size FROM responses ORDER BY last_access').fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            self._stats['evictions'] += 1
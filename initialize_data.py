@@ -1,22 +1,72 @@
 # initialize_data.py
-# 최근 6개월간 법령 개정 이력 수집
+# 기간별 법령 개정 이력 수집 (기본: 최근 6개월)
+#
+# 사용법:
+#   python initialize_data.py                                 # 최근 6개월
+#   python initialize_data.py --start 2020-01-01 --workers 8  # 장기간 수집
+#   python initialize_data.py --fresh                         # 체크포인트 무시하고 처음부터
 
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from supabase import create_client
 from datetime import datetime, timedelta
 from law_api import LawAPI
 from ai_analyzer import AIAnalyzer
-from config import SUPABASE_URL, SUPABASE_KEY
+from batch_writer import BatchWriter
+from amendment_index import AmendmentIndex
+from checkpoint import BackfillCheckpoint
+from law_id_index import LawIdResolver
+from metrics import InstrumentedSupabase
+from config import (
+    SUPABASE_URL, SUPABASE_KEY, WRITE_BATCH_SIZE,
+    BACKFILL_MAX_WORKERS, BACKFILL_CHECKPOINT_PATH, LAW_ID_INDEX_PATH
+)
+
+class _Progress:
+    """법령 처리 진행률/처리 속도 출력"""
+    
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.amendments = 0
+        self.started = time.time()
+    
+    def update(self, law_name, message, amendments):
+        self.done += 1
+        self.amendments += amendments
+        elapsed = max(time.time() - self.started, 1e-6)
+        rate = self.done / elapsed * 60
+        remaining = (self.total - self.done) / rate if rate else 0
+        print(f"[{self.done}/{self.total}] {law_name}: {message} "
+              f"| {rate:.1f}개 법령/분, 누적 {self.amendments}건, 남은 시간 약 {remaining:.0f}분")
+    
+    def summary(self):
+        elapsed = time.time() - self.started
+        return f"{self.done}개 법령, {elapsed:.0f}초"
 
 class DataInitializer:
     def __init__(self):
-        self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-        self.law_api = LawAPI()
+        self.supabase = InstrumentedSupabase(create_client(SUPABASE_URL, SUPABASE_KEY))
+        # 호출 실패를 "개정 연혁 없음"으로 처리하지 않도록 예외로 받아 체크포인트에 완료 표시하지 않음
+        self.law_api = LawAPI(strict=True)
         self.ai_analyzer = AIAnalyzer()
+        self.writer = BatchWriter(self.supabase, batch_size=WRITE_BATCH_SIZE)
+        self.resolver = LawIdResolver(self.law_api, LAW_ID_INDEX_PATH)
     
-    def collect_recent_amendments(self, months=6):
+    def collect_recent_amendments(self, months=6, **kwargs):
         """최근 N개월간의 개정 이력 수집"""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=30 * months)
+        return self.collect_amendments(start_date, end_date, **kwargs)
+    
+    def collect_amendments(self, start_date, end_date, max_workers=None,
+                           checkpoint_path=BACKFILL_CHECKPOINT_PATH, resume=True):
+        """기간 내 개정 이력 수집 (법령별 동시 처리, 체크포인트로 중단 후 재개 가능)"""
+        max_workers = max_workers or BACKFILL_MAX_WORKERS
+        
         print(f"\n{'='*60}")
-        print(f"최근 {months}개월간 법령 개정 이력 수집")
+        print(f"법령 개정 이력 수집: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
         print(f"{'='*60}\n")
         
         # 활성화된 법령 목록 조회
@@ -32,126 +82,194 @@ class DataInitializer:
             print("대시보드에서 법령을 추가해주세요.")
             return
         
-        # 날짜 범위 계산
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=30 * months)
+        # 체크포인트 불러오기
+        checkpoint = BackfillCheckpoint(checkpoint_path, start_date, end_date)
+        if resume and checkpoint.load():
+            print(f"♻️  체크포인트에서 재개: 완료된 법령 {len(checkpoint.completed_laws)}개, "
+                  f"저장된 개정 이력 {len(checkpoint.saved_amendments)}건")
         
-        print(f"📅 수집 기간: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}\n")
+        # 기간 내 기존 개정 이력을 한 번에 읽어 중복 확인에 사용
+        amendment_index = AmendmentIndex(self.supabase, 'law_code', 'amendment_date')
+        amendment_index.load(start_date, end_date)
+        for law_code, amendment_date in checkpoint.saved_amendments:
+            amendment_index.add(law_code, amendment_date)
+        print(f"🗂️  기존 개정 이력: {len(amendment_index)}건\n")
+        
+        pending_laws = [law for law in laws if not checkpoint.is_law_completed(law['law_code'])]
+        progress = _Progress(len(pending_laws))
+        print(f"📋 처리할 법령: {len(pending_laws)}개 / 전체 {len(laws)}개 (동시 실행: {max_workers})\n")
         
         total_amendments = 0
+        failed_laws = []
         
-        for law in laws:
-            print(f"\n📋 {law['law_name']} 처리 중...")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._collect_law, law, start_date, end_date, amendment_index, checkpoint): law
+                for law in pending_laws
+            }
             
-            try:
-                # 법령 검색
-                search_results = self.law_api.search_law(law['law_name'])
-                
-                if not search_results:
-                    print(f"  ⚠️  검색 결과 없음")
-                    continue
-                
-                law_id = search_results[0].get('law_id')
-                
-                if not law_id:
-                    print(f"  ⚠️  법령 ID 없음")
-                    continue
-                
-                # 개정 연혁 조회
-                print(f"  🔍 개정 연혁 조회 중...")
-                amendments = self.law_api.get_amendment_history(law_id)
-                
-                if not amendments:
-                    print(f"  ⚠️  개정 연혁 없음")
-                    continue
-                
-                # 최근 6개월 데이터만 필터링
-                recent_amendments = []
-                for amend in amendments:
-                    if amend.get('amend_date'):
-                        amend_date = self._parse_date(amend['amend_date'])
-                        if start_date <= amend_date <= end_date:
-                            recent_amendments.append(amend)
-                
-                print(f"  📊 총 {len(amendments)}개 중 최근 6개월: {len(recent_amendments)}개")
-                
-                # 개정 이력 저장
-                saved_count = 0
-                for amend in recent_amendments:
-                    try:
-                        # 중복 체크
-                        amend_date = self._parse_date(amend['amend_date']).date().isoformat()
-                        
-                        existing = self.supabase.table('law_amendments')\
-                            .select('id')\
-                            .eq('law_code', law['law_code'])\
-                            .eq('amendment_date', amend_date)\
-                            .execute()
-                        
-                        if existing.data:
-                            continue  # 이미 존재하면 건너뛰기
-                        
-                        # AI 분석 (내용이 있는 경우만)
-                        content = amend.get('content', '')
-                        if content and len(content) > 100:
-                            print(f"    🤖 AI 분석 중...")
-                            analysis = self.ai_analyzer.analyze_amendment(
-                                law['law_name'],
-                                content[:5000]
-                            )
-                        else:
-                            analysis = {
-                                'summary': '개정 내용 요약 없음',
-                                'impact_analysis': '',
-                                'tasks': []
-                            }
-                        
-                        # 개정 이력 저장
-                        amendment_data = {
-                            'law_code': law['law_code'],
-                            'amendment_date': amend_date,
-                            'enforcement_date': self._parse_date(amend.get('enf_date')).date().isoformat() if amend.get('enf_date') else None,
-                            'amendment_no': amend.get('amend_no'),
-                            'amendment_type': amend.get('amend_type'),
-                            'original_text': content,
-                            'summary': analysis['summary'],
-                            'impact_analysis': analysis['impact_analysis'],
-                            'is_reviewed': False
-                        }
-                        
-                        insert_result = self.supabase.table('law_amendments').insert(amendment_data).execute()
-                        
-                        if insert_result.data:
-                            saved_count += 1
-                            amendment_id = insert_result.data[0]['id']
-                            
-                            # 후속 업무 생성
-                            self._create_follow_up_tasks(amendment_id, analysis['tasks'], law)
-                        
-                    except Exception as e:
-                        print(f"    ⚠️  개정 이력 저장 오류: {e}")
-                        continue
-                
-                print(f"  ✅ {saved_count}개 개정 이력 저장 완료")
-                total_amendments += saved_count
-                
-                # 최종 개정일 업데이트
-                if recent_amendments:
-                    latest = max(recent_amendments, key=lambda x: self._parse_date(x.get('amend_date', '')))
-                    latest_date = self._parse_date(latest['amend_date']).date().isoformat()
-                    
-                    self.supabase.table('law_master')\
-                        .update({'last_amendment_date': latest_date})\
-                        .eq('id', law['id'])\
-                        .execute()
-                
-            except Exception as e:
-                print(f"  ❌ 오류: {e}")
-                continue
+            for future in as_completed(futures):
+                law = futures[future]
+                try:
+                    saved_count = future.result()
+                    checkpoint.mark_law_completed(law['law_code'])
+                    total_amendments += saved_count
+                    progress.update(law['law_name'], f"{saved_count}개 저장", saved_count)
+                except Exception as e:
+                    failed_laws.append(law)
+                    progress.update(law['law_name'], f"❌ 오류: {e}", 0)
+        
+        # 모아둔 후속 업무 일괄 저장
+        write_failures = self.writer.flush()
         
         print(f"\n{'='*60}")
-        print(f"수집 완료: 총 {total_amendments}개 개정 이력 저장")
+        print(f"수집 완료: 총 {total_amendments}개 개정 이력 저장 ({progress.summary()})")
+        if write_failures:
+            print(f"후속 업무 저장 실패: {len(write_failures)}건")
+        
+        cache_stats = self.law_api.cache_stats()
+        if cache_stats:
+            print(f"API 캐시: 적중 {cache_stats['hits']}건, 재검증 {cache_stats['revalidated']}건, "
+                  f"미적중 {cache_stats['misses']}건 (적중률 {cache_stats['hit_rate']:.0%})")
+        
+        if failed_laws:
+            print(f"실패한 법령 {len(failed_laws)}개는 다시 실행하면 이어서 처리됩니다.")
+        else:
+            checkpoint.remove()
         print(f"{'='*60}\n")
+        
+        return total_amendments
+    
+    def _collect_law(self, law, start_date, end_date, amendment_index, checkpoint):
+        """법령 하나의 기간 내 개정 이력 저장 (저장한 건수 반환, 실패 시 예외)"""
+        law_name = law['law_name']
+        
+        # 법령 ID 확인 (저장된 매핑이 없을 때만 검색)
+        law_id = self.resolver.resolve(law['law_code'], law_name)
+        
+        if not law_id:
+            print(f"  ⚠️  [{law_name}] 법령 ID 없음")
+            return 0
+        
+        # 개정 연혁 조회
+        amendments = self.law_api.get_amendment_history(law_id)
+        
+        if not amendments:
+            # 저장된 법령 ID로 조회되지 않으면 다시 검색하여 한 번 더 시도
+            refreshed_id = self.resolver.resolve(law['law_code'], law_name, refresh=True)
+            if refreshed_id and refreshed_id != law_id:
+                amendments = self.law_api.get_amendment_history(refreshed_id)
+        
+        if not amendments:
+            print(f"  ⚠️  [{law_name}] 개정 연혁 없음")
+            return 0
+        
+        # 수집 기간 내 데이터만 필터링
+        recent_amendments = []
+        for amend in amendments:
+            if amend.get('amend_date'):
+                amend_date = self._parse_date(amend['amend_date'])
+                if start_date <= amend_date <= end_date:
+                    recent_amendments.append(amend)
+        
+        # 중복 체크 (새로 저장할 개정 이력만 선택)
+        new_amendments = []
+        for amend in recent_amendments:
+            amend_date = self._parse_date(amend['amend_date']).date().isoformat()
+            if amendment_index.claim(law['law_code'], amend_date):
+                new_amendments.append((amend, amend_date))
+        
+        # AI 분석 (여러 건을 묶어서 요청)
+        try:
+            analyses = self._analyze_amendments(law, [amend for amend, _ in new_amendments])
+        except Exception:
+            for _, amend_date in new_amendments:
+                amendment_index.discard(law['law_code'], amend_date)
+            raise
+        
+        # 개정 이력 저장
+        saved_count = 0
+        failed_dates = []
+        for (amend, amend_date), analysis in zip(new_amendments, analyses):
+            try:
+                saved = self._save_amendment(law, amend, amend_date, analysis)
+            except Exception as e:
+                print(f"    ⚠️  [{law_name}] 개정 이력 저장 오류: {e}")
+                saved = False
+            
+            if saved:
+                saved_count += 1
+                checkpoint.mark_amendment_saved(law['law_code'], amend_date)
+            else:
+                amendment_index.discard(law['law_code'], amend_date)
+                failed_dates.append(amend_date)
+        
+        if failed_dates:
+            # 법령을 완료 처리하지 않아야 다시 실행할 때 저장하지 못한 개정 이력만 다시 처리됨
+            raise RuntimeError(f"개정 이력 {len(failed_dates)}건 저장 실패 ({', '.join(failed_dates)}), "
+                               f"{saved_count}건 저장")
+        
+        # 최종 개정일 업데이트
+        if recent_amendments:
+            latest = max(recent_amendments, key=lambda x: self._parse_date(x.get('amend_date', '')))
+            latest_date = self._parse_date(latest['amend_date']).date().isoformat()
+            
+            self.supabase.table('law_master')\
+                .update({'last_amendment_date': latest_date})\
+                .eq('id', law['id'])\
+                .execute()
+        
+        return saved_count
+    
+    def _analyze_amendments(self, law, amendments):
+        """개정 이력 목록 AI 분석 (내용이 있는 경우만, 여러 건을 한 번에 요청)"""
+        analyses = [{
+            'summary': '개정 내용 요약 없음',
+            'impact_analysis': '',
+            'tasks': []
+        } for _ in amendments]
+        
+        targets = [i for i, amend in enumerate(amendments) if len(amend.get('content') or '') > 100]
+        if not targets:
+            return analyses
+        
+        print(f"    🤖 [{law['law_name']}] AI 분석 중... ({len(targets)}건)")
+        results = self.ai_analyzer.analyze_batch([
+            {'law_name': law['law_name'], 'content': amendments[i]['content'][:5000]}
+            for i in targets
+        ])
+        
+        for i, analysis in zip(targets, results):
+            analyses[i] = analysis
+        return analyses
+    
+    def _save_amendment(self, law, amend, amend_date, analysis):
+        """분석된 개정 이력 하나를 저장 (저장되면 True)"""
+        content = amend.get('content', '')
+        
+        # 개정 이력 저장
+        amendment_data = {
+            'law_code': law['law_code'],
+            'amendment_date': amend_date,
+            'enforcement_date': self._parse_date(amend.get('enf_date')).date().isoformat() if amend.get('enf_date') else None,
+            'amendment_no': amend.get('amend_no'),
+            'amendment_type': amend.get('amend_type'),
+            'original_text': content,
+            'summary': analysis['summary'],
+            'impact_analysis': analysis['impact_analysis'],
+            'is_reviewed': False
+        }
+        
+        insert_result = self.supabase.table('law_amendments').insert(amendment_data).execute()
+        
+        if not insert_result.data:
+            return False
+        
+        amendment_id = insert_result.data[0]['id']
+        
+        # 후속 업무 생성
+        self._create_follow_up_tasks(amendment_id, analysis['tasks'], law)
+        return True
     
     def _create_follow_up_tasks(self, amendment_id, tasks, law_data):
         """후속 업무 생성"""
@@ -180,10 +298,7 @@ class DataInitializer:
                 'status': 'pending'
             }
             
-            try:
-                self.supabase.table('follow_up_tasks').insert(task_data).execute()
-            except:
-                pass
+            self.writer.insert('follow_up_tasks', task_data)
     
     def _parse_date(self, date_str):
         """날짜 문자열 파싱"""
@@ -198,14 +313,33 @@ class DataInitializer:
             return datetime.now()
 
 def main():
+    parser = argparse.ArgumentParser(description='법령 개정 이력 수집')
+    parser.add_argument('--start', help='수집 시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end', help='수집 종료일 (YYYY-MM-DD, 기본: 오늘) - 재개하려면 같은 기간을 지정')
+    parser.add_argument('--months', type=int, default=6, help='시작일을 지정하지 않을 때 수집할 개월 수')
+    parser.add_argument('--workers', type=int, default=BACKFILL_MAX_WORKERS, help='동시에 처리할 법령 수')
+    parser.add_argument('--checkpoint', default=BACKFILL_CHECKPOINT_PATH, help='체크포인트 파일 경로')
+    parser.add_argument('--fresh', action='store_true', help='체크포인트를 무시하고 처음부터 수집')
+    args = parser.parse_args()
+    
+    end_date = datetime.strptime(args.end, '%Y-%m-%d') if args.end else datetime.now()
+    if args.start:
+        start_date = datetime.strptime(args.start, '%Y-%m-%d')
+    else:
+        start_date = end_date - timedelta(days=30 * args.months)
+    
     print("\n" + "="*60)
     print("법령 개정 이력 초기 데이터 수집")
     print("="*60)
     
     initializer = DataInitializer()
-    
-    # 최근 6개월 데이터 수집
-    initializer.collect_recent_amendments(months=6)
+    initializer.collect_amendments(
+        start_date,
+        end_date,
+        max_workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        resume=not args.fresh
+    )
     
     print("\n초기 데이터 수집이 완료되었습니다!")
     print("웹 대시보드를 새로고침하여 결과를 확인하세요.\n")
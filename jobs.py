@@ -0,0 +1,239 @@
+# jobs.py
+# 백그라운드 작업 실행 및 진행 상황 조회 (같은 종류의 작업은 한 번에 하나만 실행)
+#
+# - MemoryJobStore: 작업 정보를 현재 프로세스에만 보관 (단일 프로세스/로컬 실행용)
+# - SupabaseJobStore: check_jobs 테이블 (sql/check_jobs.sql), 여러 gunicorn 작업자/서버 간 공유
+#   어느 작업자에서 시작했든 같은 종류의 작업은 하나만 실행되고, 진행 상황은 어느 작업자에서나 조회된다.
+
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from lease import make_holder_id
+
+
+class JobManager:
+    def __init__(self, store=None):
+        self.store = store or MemoryJobStore()
+
+    def submit(self, kind, func, trigger='manual'):
+        """작업 시작 후 (작업 정보, 새로 시작했는지) 반환
+
+        같은 kind의 작업이 이미 실행 중이면 새로 시작하지 않고 실행 중인 작업을 반환한다.
+        func(progress)는 progress(done=, total=, found=)로 진행 상황을 알리고, 반환값이 결과로 저장된다.
+        """
+        job, started = self.store.claim(kind, trigger)
+        if started:
+            thread = threading.Thread(target=self._run, args=(job, func), name=f"job-{kind}", daemon=True)
+            thread.start()
+        return job, started
+
+    def get(self, job_id):
+        """작업 정보 (없으면 None)"""
+        return self.store.get(job_id)
+
+    def running(self, kind):
+        """실행 중인 작업 정보 (없으면 None)"""
+        return self.store.running(kind)
+
+    def _run(self, job, func):
+        def progress(**values):
+            self.store.progress(job['id'], {key: value for key, value in values.items() if value is not None})
+
+        try:
+            result = func(progress)
+            status, error = 'succeeded', None
+        except Exception as e:
+            result, status, error = None, 'failed', str(e)
+            print(f"❌ 작업 실패 ({job['kind']}): {e}")
+
+        try:
+            self.store.finish(job['id'], status, result, error)
+        except Exception as e:
+            # 완료 기록에 실패해도 갱신이 멈춘 작업은 stale_seconds 후 실패 처리되어 다음 작업을 막지 않음
+            print(f"⚠️ 작업 완료 기록 실패 ({job['kind']}): {e}")
+
+
+class MemoryJobStore:
+    backend = 'memory'
+
+    def __init__(self, max_history=20):
+        self.max_history = max_history
+        self._jobs = OrderedDict()
+        self._running = {}
+        self._lock = threading.Lock()
+
+    def claim(self, kind, trigger):
+        with self._lock:
+            running_id = self._running.get(kind)
+            if running_id:
+                return self._snapshot(self._jobs[running_id]), False
+
+            job = _new_job(uuid.uuid4().hex, kind, trigger)
+            self._jobs[job['id']] = job
+            self._running[kind] = job['id']
+            self._trim_history()
+            return self._snapshot(job), True
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def running(self, kind):
+        with self._lock:
+            job_id = self._running.get(kind)
+            return self._snapshot(self._jobs[job_id]) if job_id else None
+
+    def progress(self, job_id, values):
+        with self._lock:
+            self._jobs[job_id]['progress'].update(values)
+
+    def finish(self, job_id, status, result, error):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update({
+                'status': status,
+                'result': result,
+                'error': error,
+                'finished_at': datetime.now().isoformat()
+            })
+            self._running.pop(job['kind'], None)
+
+    def _trim_history(self):
+        """완료된 오래된 작업부터 삭제"""
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] != 'running']
+        for job_id in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def _snapshot(self, job):
+        snapshot = dict(job)
+        snapshot['progress'] = dict(job['progress'])
+        return snapshot
+
+
+class SupabaseJobStore:
+    """check_jobs 테이블에 작업 정보 저장 (시작은 DB 함수에서 원자적으로 처리)
+
+    실행 중인 작업은 heartbeat_seconds마다 진행 상황과 함께 갱신 시각을 기록하고,
+    stale_seconds 동안 갱신이 없으면(프로세스 종료 등) 다음 시작 요청 때 실패 처리된다.
+    """
+
+    backend = 'supabase'
+    FIELDS = 'id, kind, trigger, status, started_at, finished_at, progress, result, error'
+
+    def __init__(self, supabase, heartbeat_seconds=5, stale_seconds=120, holder=None):
+        self.supabase = supabase
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = max(stale_seconds, heartbeat_seconds * 3)
+        self.holder = holder or make_holder_id()
+        self._progress = {}
+        self._stops = {}
+        self._lock = threading.Lock()
+
+    def claim(self, kind, trigger):
+        job_id = uuid.uuid4().hex
+        result = self.supabase.rpc('claim_check_job', {
+            'p_id': job_id,
+            'p_kind': kind,
+            'p_trigger': trigger,
+            'p_holder': self.holder,
+            'p_stale_seconds': self.stale_seconds
+        }).execute()
+
+        rows = result.data if isinstance(result.data, list) else [result.data]
+        job = rows[0] if rows and rows[0] else None
+        if not job:
+            raise RuntimeError(f"작업 시작 기록 실패 ({kind})")
+
+        job = self._snapshot(job)
+        started = job['id'] == job_id
+        if started:
+            self._start_heartbeat(job)
+        return job, started
+
+    def get(self, job_id):
+        result = self.supabase.table('check_jobs').select(self.FIELDS).eq('id', job_id).execute()
+        return self._snapshot(result.data[0]) if result.data else None
+
+    def running(self, kind):
+        result = self.supabase.table('check_jobs')\
+            .select(self.FIELDS)\
+            .eq('kind', kind)\
+            .eq('status', 'running')\
+            .limit(1)\
+            .execute()
+        return self._snapshot(result.data[0]) if result.data else None
+
+    def progress(self, job_id, values):
+        """진행 상황은 모아 두었다가 heartbeat마다 저장 (법령마다 DB에 쓰지 않도록)"""
+        with self._lock:
+            if job_id in self._progress:
+                self._progress[job_id].update(values)
+
+    def finish(self, job_id, status, result, error):
+        with self._lock:
+            stop = self._stops.pop(job_id, None)
+            progress = self._progress.pop(job_id, None)
+        if stop:
+            stop.set()
+
+        update = {
+            'status': status,
+            'result': result,
+            'error': error,
+            'finished_at': _now(),
+            'heartbeat_at': _now()
+        }
+        if progress is not None:
+            update['progress'] = progress
+        self.supabase.table('check_jobs').update(update).eq('id', job_id).execute()
+
+    def _start_heartbeat(self, job):
+        stop = threading.Event()
+        with self._lock:
+            self._progress[job['id']] = dict(job['progress'])
+            self._stops[job['id']] = stop
+
+        thread = threading.Thread(
+            target=self._heartbeat, args=(job['id'], stop), name=f"job-heartbeat-{job['kind']}", daemon=True
+        )
+        thread.start()
+
+    def _heartbeat(self, job_id, stop):
+        while not stop.wait(self.heartbeat_seconds):
+            with self._lock:
+                progress = dict(self._progress.get(job_id) or {})
+            try:
+                self.supabase.table('check_jobs')\
+                    .update({'progress': progress, 'heartbeat_at': _now()})\
+                    .eq('id', job_id)\
+                    .eq('status', 'running')\
+                    .execute()
+            except Exception as e:
+                print(f"⚠️ 작업 진행 상황 저장 실패: {e}")
+
+    def _snapshot(self, row):
+        snapshot = {key: row.get(key) for key in ('id', 'kind', 'trigger', 'status', 'started_at',
+                                                   'finished_at', 'result', 'error')}
+        snapshot['progress'] = dict(row.get('progress') or {'done': 0, 'total': None, 'found': 0})
+        return snapshot
+
+
+def _new_job(job_id, kind, trigger):
+    return {
+        'id': job_id,
+        'kind': kind,
+        'trigger': trigger,
+        'status': 'running',
+        'started_at': datetime.now().isoformat(),
+        'finished_at': None,
+        'progress': {'done': 0, 'total': None, 'found': 0},
+        'result': None,
+        'error': None
+    }
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
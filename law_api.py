@@ -1,15 +1,95 @@
 # law_api.py
 import requests
+import threading
+import time
 from datetime import datetime
-from config import LAW_API_BASE_URL, LAW_API_OC
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import law_parser
+from metrics import registry
+from http_cache import ResponseCache
+from rate_limiter import AdaptiveRateLimiter, CircuitBreaker
+from config import (
+    LAW_API_BASE_URL, LAW_API_OC, LAW_API_MAX_CONCURRENCY_PER_HOST,
+    LAW_API_CACHE_ENABLED, LAW_API_CACHE_PATH, LAW_API_CACHE_TTL_HOURS, LAW_API_CACHE_MAX_MB,
+    LAW_API_REQUESTS_PER_SECOND, LAW_API_MIN_REQUESTS_PER_SECOND, LAW_API_MAX_RETRIES,
+    LAW_API_CIRCUIT_FAILURES, LAW_API_CIRCUIT_RESET_SECONDS
+)
+
+# 속도를 줄이고 다시 시도할 응답 코드
+THROTTLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+REQUEST_SECONDS = registry.histogram('law_api_request_seconds', '법제처 API 요청 시간 (서비스/응답 코드별)')
+PARSE_SECONDS = registry.histogram('xml_parse_seconds', '법제처 XML 응답 파싱 시간')
+RETRIES = registry.counter('law_api_retries_total', '법제처 API 재시도 수 (사유별)')
+CACHE_EVENTS = registry.counter('law_api_cache_total', '법제처 API 응답 캐시 적중/재검증/미적중 수')
+ERRORS = registry.counter('law_api_errors_total', '법제처 API 호출 실패 수 (호출 종류별)')
+
+
+class LawAPIError(Exception):
+    """법제처 API 호출 실패 (검색 결과 없음과 구분)"""
+
 
 class LawAPI:
-    def __init__(self):
+    # 호스트별 동시 요청 제한/요청 속도 제한/서킷 브레이커 (모든 인스턴스가 공유)
+    _host_semaphores = {}
+    _host_limiters = {}
+    _host_breakers = {}
+    _host_semaphores_lock = threading.Lock()
+    
+    def __init__(self, max_concurrency_per_host=None, use_cache=LAW_API_CACHE_ENABLED, strict=False, oc=None):
+        """strict=True이면 호출 실패 시 None 대신 LawAPIError 발생, oc: 인증키 (기본: config)"""
         self.base_url = LAW_API_BASE_URL
-        self.oc = LAW_API_OC
+        self.oc = oc or LAW_API_OC
+        self.max_concurrency_per_host = max_concurrency_per_host or LAW_API_MAX_CONCURRENCY_PER_HOST
+        self.strict = strict
+        self.session = self._create_session()
+        self.cache = self._create_cache() if use_cache else None
     
-    def search_law(self, law_name):
-        """법령 검색"""
+    def _create_cache(self):
+        """응답 디스크 캐시 생성 (실패 시 캐시 없이 동작)"""
+        try:
+            return ResponseCache(
+                LAW_API_CACHE_PATH,
+                ttl_seconds=LAW_API_CACHE_TTL_HOURS * 3600,
+                max_bytes=LAW_API_CACHE_MAX_MB * 1024 * 1024
+            )
+        except Exception as e:
+            print(f"응답 캐시 사용 불가: {e}")
+            return None
+    
+    def cache_stats(self):
+        """응답 캐시 적중/미적중 통계"""
+        return self.cache.stats() if self.cache else None
+    
+    def _create_session(self):
+        """keep-alive 연결을 재사용하는 세션 생성"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.max_concurrency_per_host,
+            # 서버가 유휴 연결을 끊은 경우에만 재연결 (HTTP 오류는 재시도하지 않음)
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def close(self):
+        """세션의 연결 풀 및 캐시 정리"""
+        self.session.close()
+        if self.cache:
+            self.cache.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def search_law(self, law_name, fresh=False):
+        """법령 검색 (fresh=True: 변경 여부 판단에 쓰는 조회이므로 캐시 유효 기간과 관계없이 법제처에 확인)"""
         url = f"{self.base_url}/lawSearch.do"
         params = {
             "OC": self.oc,
@@ -19,15 +99,48 @@ class LawAPI:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return self._parse_search_result(response.text)
+            return self._parse_search_result(self._fetch(url, params, fresh=fresh))
         except Exception as e:
-            print(f"법령 검색 오류: {e}")
-            return None
+            return self._handle_error("법령 검색 오류", e)
+    
+    def search_by_promulgation_date(self, start_date, end_date, display=100, max_pages=50):
+        """공포일자 기간으로 법령 목록 조회 (모든 페이지), 오류 시 None
+
+        변경 감지에 쓰는 조회이므로 응답 캐시 유효 기간과 관계없이 항상 법제처에 확인한다. (fresh=True)
+        max_pages까지 읽어도 마지막 페이지가 가득 차 있으면 목록이 완전하지 않으므로 None을 반환한다.
+        (일부 목록으로 나머지 법령을 변경 없음으로 처리하지 않도록 호출한 쪽에서 개별 확인으로 전환)
+        """
+        url = f"{self.base_url}/lawSearch.do"
+        laws = []
+        
+        for page in range(1, max_pages + 1):
+            params = {
+                "OC": self.oc,
+                "target": "law",
+                "type": "XML",
+                "ancYd": f"{start_date.strftime('%Y%m%d')}~{end_date.strftime('%Y%m%d')}",
+                "display": display,
+                "page": page
+            }
+            
+            try:
+                results = self._parse_search_result(self._fetch(url, params, fresh=True))
+            except Exception as e:
+                return self._handle_error("공포일자 기간 검색 오류", e)
+            
+            laws.extend(results)
+            if len(results) < display:
+                return laws
+        
+        return self._handle_error("공포일자 기간 검색 오류",
+                                  LawAPIError(f"{max_pages}페이지({len(laws)}건)를 넘는 조회 결과"))
     
     def get_law_info(self, law_id):
-        """법령 상세 정보 조회"""
+        """법령 상세 정보 조회
+
+        법령ID가 같아도 개정되면 내용이 바뀌므로 캐시 유효 기간과 관계없이 항상 조건부 요청으로 법제처에 확인한다.
+        (목록에 나온 새 버전 대신 캐시된 이전 버전을 받는 일이 없도록, 변경이 없으면 304로 캐시 재사용)
+        """
         url = f"{self.base_url}/lawService.do"
         params = {
             "OC": self.oc,
@@ -37,12 +150,9 @@ class LawAPI:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return self._parse_law_info(response.text)
+            return self._parse_law_info(self._fetch(url, params, fresh=True))
         except Exception as e:
-            print(f"법령 정보 조회 오류: {e}")
-            return None
+            return self._handle_error("법령 정보 조회 오류", e)
     
     def get_amendment_history(self, law_id):
         """법령 개정 연혁 조회"""
@@ -55,85 +165,159 @@ class LawAPI:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return self._parse_amendment_history(response.text)
+            return self._parse_amendment_history(self._fetch(url, params))
         except Exception as e:
-            print(f"개정 연혁 조회 오류: {e}")
-            return None
+            return self._handle_error("개정 연혁 조회 오류", e)
     
-    def _parse_search_result(self, xml_text):
-        """검색 결과 파싱"""
-        from bs4 import BeautifulSoup
+    def _handle_error(self, message, error):
+        """오류 출력 후 None 반환 (strict 모드에서는 LawAPIError 발생)"""
+        print(f"{message}: {error}")
+        ERRORS.inc(kind=message)
+        if self.strict:
+            raise LawAPIError(f"{message}: {error}") from error
+        return None
+    
+    def retry_after(self):
+        """호출이 중단된 호스트가 다시 열릴 때까지 남은 시간 (초)"""
+        return self._host_breaker(self.base_url).retry_after()
+    
+    def _fetch(self, url, params, fresh=False):
+        """응답 본문 조회 (캐시 우선, 만료된 항목은 조건부 요청으로 재검증)
+
+        fresh=True이면 유효 기간 안의 캐시 항목도 그대로 쓰지 않고 항상 조건부 요청으로 재검증한다.
+        """
+        if not self.cache:
+            return self._get(url, params).content
         
-        soup = BeautifulSoup(xml_text, 'html.parser')
-        laws = []
+        key = ResponseCache.make_key(url.rsplit('/', 1)[-1], params)
+        entry = self.cache.get(key)
         
-        for law in soup.find_all('law'):
-            law_id_tag = law.find('법령id') or law.find('법령ID')
-            law_name_tag = law.find('법령명한글')
-            law_type_tag = law.find('법령구분명')
-            enf_date_tag = law.find('시행일자')
-            amend_date_tag = law.find('공포일자')
-            
-            laws.append({
-                'law_id': law_id_tag.text.strip() if law_id_tag else None,
-                'law_name': law_name_tag.text.strip() if law_name_tag else None,
-                'law_type': law_type_tag.text.strip() if law_type_tag else None,
-                'enf_date': enf_date_tag.text.strip() if enf_date_tag else None,
-                'amend_date': amend_date_tag.text.strip() if amend_date_tag else None
-            })
+        if entry and not fresh and self.cache.is_fresh(entry):
+            self._record_cache('hits')
+            return entry['body']
         
-        return laws
-    
-    def _parse_law_info(self, xml_text):
-        """법령 정보 파싱"""
-        from bs4 import BeautifulSoup
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
         
-        soup = BeautifulSoup(xml_text, 'html.parser')
-        law = soup.find('법령')
+        response = self._get(url, params, headers=headers)
         
-        if not law:
-            return None
+        if response.status_code == 304 and entry:
+            self._record_cache('revalidated')
+            self.cache.refresh(key)
+            return entry['body']
         
-        law_id_tag = law.find('법령id') or law.find('법령ID')
-        law_name_tag = law.find('법령명한글')
-        law_type_tag = law.find('법령구분명')
-        amend_date_tag = law.find('공포일자')
-        enf_date_tag = law.find('시행일자')
-        amend_no_tag = law.find('공포번호')
-        content_tag = law.find('조문내용')
+        self._record_cache('misses')
+        body = response.content
         
-        return {
-            'law_id': law_id_tag.text.strip() if law_id_tag else None,
-            'law_name': law_name_tag.text.strip() if law_name_tag else None,
-            'law_type': law_type_tag.text.strip() if law_type_tag else None,
-            'amend_date': amend_date_tag.text.strip() if amend_date_tag else None,
-            'enf_date': enf_date_tag.text.strip() if enf_date_tag else None,
-            'amend_no': amend_no_tag.text.strip() if amend_no_tag else None,
-            'content': content_tag.text.strip() if content_tag else None
-        }
-    
-    def _parse_amendment_history(self, xml_text):
-        """개정 연혁 파싱"""
-        from bs4 import BeautifulSoup
+        # 인증 오류 등은 HTML 페이지로 응답되므로 저장하지 않음
+        if not body.lstrip()[:15].lower().startswith((b'<!doctype', b'<html')):
+            self.cache.put(
+                key,
+                body,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
         
-        soup = BeautifulSoup(xml_text, 'html.parser')
-        amendments = []
+        return body
+    
+    def _record_cache(self, event):
+        self.cache.record(event)
+        CACHE_EVENTS.inc(result=event)
+    
+    def _get(self, url, params, headers=None):
+        """호스트별 동시 요청 수/요청 속도를 제한하여 GET 요청 (세션 연결 재사용)
+
+        429/5xx/시간 초과는 속도를 줄여 재시도하고, 연속 실패가 이어지면 서킷 브레이커가 호출을 중단한다.
+        """
+        limiter = self._host_limiter(url)
+        breaker = self._host_breaker(url)
+        endpoint = url.rsplit('/', 1)[-1]
         
-        for rev in soup.find_all('개정문'):
-            amend_date_tag = rev.find('공포일자')
-            enf_date_tag = rev.find('시행일자')
-            amend_no_tag = rev.find('공포번호')
-            amend_type_tag = rev.find('개정구분명')
-            content_tag = rev.find('조문내용')
+        for attempt in range(LAW_API_MAX_RETRIES + 1):
+            breaker.before_call()
+            limiter.acquire()
             
-            amendments.append({
-                'amend_date': amend_date_tag.text.strip() if amend_date_tag else None,
-                'enf_date': enf_date_tag.text.strip() if enf_date_tag else None,
-                'amend_no': amend_no_tag.text.strip() if amend_no_tag else None,
-                'amend_type': amend_type_tag.text.strip() if amend_type_tag else None,
-                'content': content_tag.text.strip() if content_tag else None
-            })
-        
-        return amendments
\ No newline at end of file
+            started = time.perf_counter()
+            try:
+                with self._host_slot(url):
+                    response = self.session.get(url, params=params, headers=headers, timeout=30)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint, status=type(e).__name__)
+                limiter.on_throttle()
+                breaker.record_failure()
+                if attempt == LAW_API_MAX_RETRIES:
+                    raise
+                RETRIES.inc(reason=type(e).__name__)
+                continue
+            except Exception as e:
+                # 응답 본문 오류 등도 실패로 기록 (서킷 브레이커의 시험 호출이 끝나지 않은 채 남지 않도록)
+                REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint, status=type(e).__name__)
+                breaker.record_failure()
+                raise
+            REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint, status=response.status_code)
+            
+            if response.status_code in THROTTLE_STATUS_CODES:
+                limiter.on_throttle(self._retry_after_seconds(response))
+                breaker.record_failure()
+                if attempt < LAW_API_MAX_RETRIES:
+                    RETRIES.inc(reason=response.status_code)
+                    continue
+            else:
+                limiter.on_success()
+                breaker.record_success()
+            
+            response.raise_for_status()
+            return response
+    
+    def _retry_after_seconds(self, response):
+        """Retry-After 헤더 (초 단위만 지원)"""
+        try:
+            return float(response.headers.get('Retry-After', ''))
+        except ValueError:
+            return None
+    
+    def _host_slot(self, url):
+        """요청 대상 호스트의 세마포어 반환"""
+        return self._host_shared(LawAPI._host_semaphores, url,
+                                 lambda host: threading.BoundedSemaphore(self.max_concurrency_per_host))
+    
+    def _host_limiter(self, url):
+        return self._host_shared(LawAPI._host_limiters, url, lambda host: AdaptiveRateLimiter(
+            LAW_API_REQUESTS_PER_SECOND,
+            min_rate=LAW_API_MIN_REQUESTS_PER_SECOND
+        ))
+    
+    def _host_breaker(self, url):
+        return self._host_shared(LawAPI._host_breakers, url, lambda host: CircuitBreaker(
+            host,
+            failure_threshold=LAW_API_CIRCUIT_FAILURES,
+            reset_timeout=LAW_API_CIRCUIT_RESET_SECONDS
+        ))
+    
+    def _host_shared(self, registry, url, factory):
+        """호스트별로 하나씩 생성하여 공유하는 객체"""
+        host = urlparse(url).netloc
+        with LawAPI._host_semaphores_lock:
+            value = registry.get(host)
+            if value is None:
+                value = factory(host)
+                registry[host] = value
+        return value
+    
+    def _parse_search_result(self, xml_text):
+        """검색 결과 파싱"""
+        with PARSE_SECONDS.time(kind='search'):
+            return law_parser.parse_search_result(xml_text)
+    
+    def _parse_law_info(self, xml_text):
+        """법령 정보 파싱"""
+        with PARSE_SECONDS.time(kind='law_info'):
+            return law_parser.parse_law_info(xml_text)
+    
+    def _parse_amendment_history(self, xml_text):
+        """개정 연혁 파싱"""
+        with PARSE_SECONDS.time(kind='amendment_history'):
+            return law_parser.parse_amendment_history(xml_text)
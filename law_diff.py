@@ -0,0 +1,112 @@
+# law_diff.py
+# 조문(조/항/호) 단위 법령 비교
+
+import re
+
+ARTICLE_PATTERN = re.compile(r'^제\s*(\d+)\s*조(의\s*\d+)?')
+HEADING_PATTERN = re.compile(r'^제\s*\d+\s*(편|장|절|관)')
+PARAGRAPH_PATTERN = re.compile(r'^([①-⑳㉑-㉟㊱-㊿])')
+ITEM_PATTERN = re.compile(r'^(\d+(의\d+)?)\.')
+
+
+def split_articles(text):
+    """법령 텍스트를 조/항/호 단위로 분리 ({'제5조 ① 1.': 텍스트}, 문서 순서 유지)
+
+    목(가. 나. ...) 등 호보다 작은 단위는 상위 호에 포함된다.
+    """
+    units = {}
+    article = None
+    paragraph = None
+    current_key = None
+
+    for line in (text or '').split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        article_match = ARTICLE_PATTERN.match(line)
+        if HEADING_PATTERN.match(line):
+            article = None
+            paragraph = None
+            current_key = _unique_key(units, ' '.join(line.split()))
+        elif article_match:
+            article = f"제{article_match.group(1)}조" + (article_match.group(2) or '').replace(' ', '')
+            paragraph = None
+            current_key = _unique_key(units, article)
+        elif article and PARAGRAPH_PATTERN.match(line):
+            paragraph = PARAGRAPH_PATTERN.match(line).group(1)
+            current_key = _unique_key(units, f"{article} {paragraph}")
+        elif article and ITEM_PATTERN.match(line):
+            item = ITEM_PATTERN.match(line).group(1)
+            prefix = f"{article} {paragraph}" if paragraph else article
+            current_key = _unique_key(units, f"{prefix} {item}.")
+        elif current_key is None:
+            current_key = _unique_key(units, '전문')
+
+        if current_key in units:
+            units[current_key] += '\n' + line
+        else:
+            units[current_key] = line
+
+    return units
+
+
+def diff_articles(old_units, new_units):
+    """이전 버전과 새 버전의 조문을 비교하여 신설/변경/삭제된 단위 반환 (공백 차이는 무시)"""
+    return {
+        'added': [(key, new_units[key]) for key in new_units if key not in old_units],
+        'changed': [
+            (key, new_units[key]) for key in new_units
+            if key in old_units and _normalize(old_units[key]) != _normalize(new_units[key])
+        ],
+        'removed': [key for key in old_units if key not in new_units],
+        'previous': old_units
+    }
+
+
+def has_changes(diff):
+    return bool(diff['added'] or diff['changed'] or diff['removed'])
+
+
+def render_diff(diff, max_chars=5000):
+    """AI 분석에 보낼 변경 조문 텍스트 생성 (max_chars 초과분은 생략 표시)"""
+    sections = []
+
+    if diff['changed']:
+        changed = [
+            f"{_with_context(key, diff['previous'][key])}\n→ {_with_context(key, text)}"
+            for key, text in diff['changed']
+        ]
+        sections.append('[변경된 조문 (개정 전 → 개정 후)]\n' + '\n'.join(changed))
+    if diff['added']:
+        sections.append('[신설된 조문]\n' + '\n'.join(_with_context(key, text) for key, text in diff['added']))
+    if diff['removed']:
+        sections.append('[삭제된 조문]\n' + ', '.join(diff['removed']))
+
+    rendered = '\n\n'.join(sections)
+    if len(rendered) > max_chars:
+        rendered = rendered[:max_chars] + '\n... (이하 생략)'
+    return rendered
+
+
+def _normalize(text):
+    return ' '.join(text.split())
+
+
+def _with_context(key, text):
+    """항/호 단위는 소속 조문을 알 수 있도록 키를 앞에 표시"""
+    base = key.split('#')[0]
+    if ' ' in base and not text.startswith(base):
+        return f"({key}) {text}"
+    return text
+
+
+def _unique_key(units, key):
+    """같은 키가 이미 있으면 번호를 붙여 구분"""
+    if key not in units:
+        return key
+
+    number = 2
+    while f"{key}#{number}" in units:
+        number += 1
+    return f"{key}#{number}"
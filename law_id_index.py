@@ -0,0 +1,87 @@
+# law_id_index.py
+# law_master.law_code -> 법제처 법령ID 매핑 (로컬 저장, 조회 실패 시에만 다시 검색)
+
+import os
+import sqlite3
+import threading
+import time
+
+
+class LawIdResolver:
+    def __init__(self, law_api, path):
+        self.law_api = law_api
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS law_ids (
+                law_code TEXT PRIMARY KEY,
+                law_id TEXT NOT NULL,
+                law_name TEXT NOT NULL,
+                resolved_at REAL NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+    def get(self, law_code):
+        """저장된 법령ID (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute('SELECT law_id FROM law_ids WHERE law_code = ?', (law_code,)).fetchone()
+        return row[0] if row else None
+
+    def resolve(self, law_code, law_name, refresh=False):
+        """법령ID 반환 (저장된 값이 없거나 refresh=True이면 법령명으로 검색), 찾지 못하면 None"""
+        if not refresh:
+            law_id = self.get(law_code)
+            if law_id:
+                return law_id
+
+        search_results = self.law_api.search_law(law_name)
+        if not search_results:
+            return None
+
+        match = self._pick(law_name, search_results)
+        if not match:
+            print(f"  ⚠️  [{law_name}] 법령명이 정확히 일치하는 검색 결과 없음 "
+                  f"({', '.join(r.get('law_name') or '' for r in search_results[:5])})")
+            return None
+
+        self.remember(law_code, match['law_id'], law_name)
+        return match['law_id']
+
+    def remember(self, law_code, law_id, law_name):
+        """다른 경로(공포일자 조회 등)로 확인한 법령ID 저장"""
+        if not law_id:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO law_ids (law_code, law_id, law_name, resolved_at) VALUES (?, ?, ?, ?)',
+                (law_code, str(law_id), law_name, time.time())
+            )
+            self._conn.commit()
+
+    def _pick(self, law_name, search_results):
+        """법령명이 정확히 일치하는 결과 (시행령/시행규칙 등 이름이 겹치는 법령 구분)"""
+        target = normalize_law_name(law_name)
+        for result in search_results:
+            if result.get('law_id') and normalize_law_name(result.get('law_name')) == target:
+                return result
+
+        # 검색 결과가 하나뿐이면 약칭 등으로 이름이 달라도 같은 법령으로 판단
+        if len(search_results) == 1 and search_results[0].get('law_id'):
+            return search_results[0]
+        return None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def normalize_law_name(name):
+    """공백 차이를 무시한 법령명"""
+    return ''.join((name or '').split())
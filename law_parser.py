@@ -0,0 +1,233 @@
+# law_parser.py
+# 법제처 API XML 응답 스트리밍 파서
+
+import io
+import re
+
+try:
+    from lxml import etree as ET
+    _USE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _USE_LXML = False
+
+# 태그 이름은 소문자로 비교 (법령ID / 법령id 모두 '법령id'로 처리)
+SEARCH_RECORD_TAG = 'law'
+SEARCH_FIELDS = {
+    'law_id': '법령id',
+    'law_name': '법령명한글',
+    'law_type': '법령구분명',
+    'enf_date': '시행일자',
+    'amend_date': '공포일자',
+    'amend_no': '공포번호',
+    'amend_type': '제개정구분명'
+}
+
+LAW_INFO_RECORD_TAG = '법령'
+LAW_INFO_FIELDS = {
+    'law_id': '법령id',
+    'law_name': '법령명한글',
+    'law_type': '법령구분명',
+    'amend_date': '공포일자',
+    'enf_date': '시행일자',
+    'amend_no': '공포번호',
+    'amend_type': '제개정구분',
+    'content': '조문내용'
+}
+
+# 조문 전체 텍스트 (조/항/호/목 내용을 문서 순서대로 줄바꿈으로 연결)
+LAW_INFO_JOINED_FIELDS = {
+    'full_text': ('조문내용', '항내용', '호내용', '목내용')
+}
+
+AMENDMENT_RECORD_TAG = '개정문'
+AMENDMENT_FIELDS = {
+    'amend_date': '공포일자',
+    'enf_date': '시행일자',
+    'amend_no': '공포번호',
+    'amend_type': '개정구분명',
+    'content': '조문내용'
+}
+
+_XML_DECL_ENCODING = re.compile(r'^(<\?xml[^>]*?encoding\s*=\s*)(["\'])[^"\']*\2')
+
+
+def iter_records(xml_source, record_tag, fields, joined_fields=None):
+    """record_tag 요소가 닫힐 때마다 {키: 텍스트} 레코드 반환
+
+    각 필드는 레코드 안에서 처음 나오는 태그의 전체 텍스트를 사용하며,
+    joined_fields의 필드는 해당 태그들의 텍스트를 모두 줄바꿈으로 연결한다.
+    처리가 끝난 하위 요소는 바로 트리에서 제거하여 메모리를 해제한다.
+    """
+    joined_fields = joined_fields or {}
+    tag_to_key = {tag: key for key, tag in fields.items()}
+    joined_tag_to_key = {tag: key for key, tags in joined_fields.items() for tag in tags}
+    joined = {}
+
+    stack = []          # 열린 요소 (부모 참조용)
+    record = None       # 현재 레코드의 필드 값
+    record_depth = None
+    claimed = {}        # 필드 값을 받을 요소 -> 키
+    open_claims = 0     # 아직 닫히지 않은 필드 요소 수
+
+    for event, elem in _iterparse(xml_source):
+        if not isinstance(elem.tag, str):
+            continue
+
+        tag = _local_name(elem.tag)
+
+        if event == 'start':
+            stack.append(elem)
+
+            if record is None:
+                if tag == record_tag:
+                    record = dict.fromkeys(list(fields) + list(joined_fields))
+                    record_depth = len(stack)
+                    joined = {key: [] for key in joined_fields}
+                continue
+
+            key = tag_to_key.get(tag)
+            if key and record[key] is None and key not in claimed.values():
+                claimed[elem] = key
+                open_claims += 1
+            continue
+
+        # end 이벤트
+        stack.pop()
+
+        if elem in claimed:
+            key = claimed.pop(elem)
+            open_claims -= 1
+            record[key] = ''.join(elem.itertext()).strip()
+
+        if record is not None and tag in joined_tag_to_key:
+            text = ''.join(elem.itertext()).strip()
+            if text:
+                joined[joined_tag_to_key[tag]].append(text)
+
+        if record is not None and len(stack) + 1 == record_depth:
+            for key, texts in joined.items():
+                record[key] = '\n'.join(texts) if texts else None
+            yield record
+            record = None
+            record_depth = None
+            claimed.clear()
+            open_claims = 0
+        elif open_claims:
+            continue  # 필드 텍스트가 아직 필요한 하위 요소는 유지
+
+        elem.clear()
+        if stack:
+            parent = stack[-1]
+            parent.remove(elem)
+
+
+def parse_search_result(xml_source):
+    """검색 결과 파싱"""
+    try:
+        return list(iter_records(xml_source, SEARCH_RECORD_TAG, SEARCH_FIELDS))
+    except ET.ParseError:
+        return parse_search_result_bs4(xml_source)
+
+
+def parse_law_info(xml_source):
+    """법령 정보 파싱"""
+    try:
+        for record in iter_records(xml_source, LAW_INFO_RECORD_TAG, LAW_INFO_FIELDS, LAW_INFO_JOINED_FIELDS):
+            return record
+        return None
+    except ET.ParseError:
+        return parse_law_info_bs4(xml_source)
+
+
+def parse_amendment_history(xml_source):
+    """개정 연혁 파싱"""
+    try:
+        return list(iter_records(xml_source, AMENDMENT_RECORD_TAG, AMENDMENT_FIELDS))
+    except ET.ParseError:
+        return parse_amendment_history_bs4(xml_source)
+
+
+# 올바른 XML이 아닌 응답(잘린 응답, 잘못된 문자 등)은 BeautifulSoup XML 파서(lxml 복구 모드)로 처리
+
+def parse_search_result_bs4(xml_source):
+    """검색 결과 파싱 (BeautifulSoup)"""
+    soup = _soup(xml_source)
+    return [_find_fields(law, SEARCH_FIELDS) for law in soup.find_all(SEARCH_RECORD_TAG)]
+
+
+def parse_law_info_bs4(xml_source):
+    """법령 정보 파싱 (BeautifulSoup)"""
+    law = _soup(xml_source).find(LAW_INFO_RECORD_TAG)
+
+    if not law:
+        return None
+
+    record = _find_fields(law, LAW_INFO_FIELDS)
+    for key, names in LAW_INFO_JOINED_FIELDS.items():
+        texts = [tag.text.strip() for tag in law.find_all(list(names))]
+        texts = [text for text in texts if text]
+        record[key] = '\n'.join(texts) if texts else None
+    return record
+
+
+def parse_amendment_history_bs4(xml_source):
+    """개정 연혁 파싱 (BeautifulSoup)"""
+    soup = _soup(xml_source)
+    return [_find_fields(rev, AMENDMENT_FIELDS) for rev in soup.find_all(AMENDMENT_RECORD_TAG)]
+
+
+def _soup(xml_source):
+    """XML 파서로 읽고 태그 이름을 소문자로 맞춤 (스트리밍 파서와 같은 기준: 법령ID → 법령id)
+
+    html.parser는 한글 태그 이름을 태그로 인식하지 못하므로 사용하지 않는다.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(xml_source, 'xml')
+    for tag in soup.find_all(True):
+        tag.name = tag.name.lower()
+    return soup
+
+
+def _find_fields(tag, fields):
+    """BeautifulSoup 태그에서 필드별 첫 번째 하위 태그의 텍스트 추출"""
+    record = {}
+    for key, name in fields.items():
+        found = tag.find(name)
+        record[key] = found.text.strip() if found else None
+    return record
+
+
+def _iterparse(xml_source):
+    """start/end 이벤트 스트림 생성"""
+    stream = _to_stream(xml_source)
+    if _USE_LXML:
+        return ET.iterparse(
+            stream,
+            events=('start', 'end'),
+            huge_tree=True,
+            resolve_entities=False,
+            no_network=True
+        )
+    return ET.iterparse(stream, events=('start', 'end'))
+
+
+def _to_stream(xml_source):
+    """문자열/바이트 응답을 파서 입력 스트림으로 변환"""
+    if isinstance(xml_source, str):
+        # 이미 디코딩된 문자열은 UTF-8로 다시 인코딩하므로 선언된 인코딩도 맞춰준다
+        xml_source = xml_source.lstrip('\ufeff \t\r\n')
+        xml_source = _XML_DECL_ENCODING.sub(r'\1\2UTF-8\2', xml_source, count=1)
+        xml_source = xml_source.encode('utf-8')
+    else:
+        xml_source = xml_source.lstrip(b'\xef\xbb\xbf \t\r\n')
+
+    return io.BytesIO(xml_source)
+
+
+def _local_name(tag):
+    """네임스페이스를 제외한 소문자 태그 이름"""
+    if '}' in tag:
+        tag = tag.rsplit('}', 1)[1]
+    return tag.lower()
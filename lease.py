@@ -0,0 +1,213 @@
+# lease.py
+# 여러 프로세스 중 하나만 예약 작업을 실행하도록 하는 리스(만료 시간이 있는 잠금)
+#
+# - SupabaseLease: scheduler_leases 테이블 (sql/scheduler_leases.sql), 여러 서버/컨테이너 간 공유
+# - FileLease: 잠금 파일, 같은 서버의 여러 gunicorn 작업자 또는 로컬 테스트용
+#
+# 보유자가 갱신하지 못하고 만료되면(프로세스 종료 등) 다른 프로세스가 이어받는다.
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+
+def make_holder_id():
+    """프로세스 식별자 (호스트:PID:난수)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class FileLease:
+    backend = 'file'
+
+    def __init__(self, path, name, ttl_seconds=60, holder=None):
+        self.path = path
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.holder = holder or make_holder_id()
+
+    def acquire(self):
+        """리스 획득/갱신 (다른 프로세스가 유효한 리스를 보유 중이면 False)"""
+        with self._mutex():
+            current = self._read()
+            if current and current['holder'] != self.holder and current['expires_at'] > time.time():
+                return False
+
+            self._write({'name': self.name, 'holder': self.holder, 'expires_at': time.time() + self.ttl_seconds})
+            return True
+
+    def release(self):
+        with self._mutex():
+            current = self._read()
+            if current and current['holder'] == self.holder:
+                os.remove(self.path)
+
+    def state(self):
+        current = self._read()
+        if not current:
+            return {'holder': None, 'expires_at': None}
+        return {
+            'holder': current['holder'],
+            'expires_at': datetime.fromtimestamp(current['expires_at'], timezone.utc).isoformat()
+        }
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, data):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+    def _mutex(self):
+        return _ExclusiveFile(f"{self.path}.lock")
+
+
+class _ExclusiveFile:
+    """읽기-확인-쓰기 구간을 보호하는 짧은 잠금 (파일 배타 생성, 10초 이상 남은 잠금 파일은 제거)"""
+
+    STALE_SECONDS = 10
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.STALE_SECONDS:
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(0.05)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class SupabaseLease:
+    backend = 'supabase'
+
+    def __init__(self, supabase, name, ttl_seconds=60, holder=None):
+        self.supabase = supabase
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.holder = holder or make_holder_id()
+
+    def acquire(self):
+        """리스 획득/갱신 (DB 함수에서 원자적으로 처리)"""
+        result = self.supabase.rpc('acquire_scheduler_lease', {
+            'p_name': self.name,
+            'p_holder': self.holder,
+            'p_ttl_seconds': self.ttl_seconds
+        }).execute()
+        return bool(result.data)
+
+    def release(self):
+        self.supabase.rpc('release_scheduler_lease', {
+            'p_name': self.name,
+            'p_holder': self.holder
+        }).execute()
+
+    def state(self):
+        result = self.supabase.table('scheduler_leases')\
+            .select('holder, expires_at')\
+            .eq('name', self.name)\
+            .execute()
+        if not result.data:
+            return {'holder': None, 'expires_at': None}
+        return result.data[0]
+
+
+class LeaseKeeper:
+    """주기적으로 리스를 획득/갱신하여 현재 프로세스가 실행 담당인지 유지"""
+
+    def __init__(self, lease, renew_interval=None):
+        self.lease = lease
+        self.renew_interval = renew_interval or max(1.0, lease.ttl_seconds / 3)
+        self._leader = False
+        self._last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, name=f"lease-{self.lease.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """갱신 중단 후 보유 중인 리스 반환 (다른 프로세스가 바로 이어받을 수 있도록)"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._leader:
+            try:
+                self.lease.release()
+            except Exception as e:
+                print(f"⚠️ 리스 반환 실패: {e}")
+            self._leader = False
+
+    def is_leader(self):
+        """지금 실행 담당인지 (작업 직전에 한 번 더 갱신하여 확인)"""
+        self._refresh()
+        return self._leader
+
+    def status(self):
+        try:
+            current = self.lease.state()
+        except Exception as e:
+            current = {'holder': None, 'expires_at': None, 'error': str(e)}
+
+        return {
+            'backend': self.lease.backend,
+            'name': self.lease.name,
+            'holder': self.lease.holder,
+            'is_leader': self._leader,
+            'lease_holder': current.get('holder'),
+            'lease_expires_at': current.get('expires_at'),
+            'last_error': self._last_error
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._refresh()
+            self._stop.wait(self.renew_interval)
+
+    def _refresh(self):
+        try:
+            leader = self.lease.acquire()
+            self._last_error = None
+        except Exception as e:
+            leader = False
+            self._last_error = str(e)
+            print(f"⚠️ 리스 갱신 실패 ({self.lease.name}): {e}")
+
+        if leader != self._leader:
+            print(f"👑 {self.lease.name}: 실행 담당 {'획득' if leader else '해제'} ({self.lease.holder})")
+        self._leader = leader
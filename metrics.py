@@ -0,0 +1,248 @@
+# metrics.py
+# 단계별 소요 시간(히스토그램)/건수(카운터) 수집, Prometheus 텍스트 형식 출력, 실행별 기록 저장
+#
+# 모듈 전역 registry 하나를 모든 모듈이 공유한다.
+#   metrics.registry.histogram('law_api_request_seconds', '...').observe(0.3, endpoint='lawService')
+#   metrics.registry.counter('laws_checked_total', '...').inc(result='changed')
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return {key: value for key, value in self._values.items()}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.snapshot().items()):
+            lines.append(f"{self.name}{_format_labels(key)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+                self._values[key] = entry
+            entry['counts'][bisect.bisect_left(self.buckets, value)] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 소요 시간(초) 기록 (예외가 발생해도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: {'counts': list(entry['counts']), 'sum': entry['sum'], 'count': entry['count']}
+                for key, entry in self._values.items()
+            }
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, entry in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), entry['counts']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_number(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_number(entry['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {entry['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text=''):
+        return self._get_or_create(name, lambda: Counter(name, help_text))
+
+    def histogram(self, name, help_text='', buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(name, lambda: Histogram(name, help_text, buckets))
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식 (/metrics 응답)"""
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """현재 누적값 ({이름: {라벨: 값}})"""
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {name: metric.snapshot() for name, metric in metrics.items()}
+
+    def summarize_since(self, before):
+        """before(snapshot()) 이후 증가분 요약
+
+        카운터: {라벨 문자열: 증가량}
+        히스토그램: {라벨 문자열: {'count', 'sum', 'avg'}}
+        """
+        summary = {}
+        for name, values in self.snapshot().items():
+            previous = before.get(name, {})
+            entries = {}
+            for key, value in values.items():
+                old = previous.get(key)
+                label = _format_labels(key) or '{}'
+                if isinstance(value, dict):
+                    count = value['count'] - (old['count'] if old else 0)
+                    total = value['sum'] - (old['sum'] if old else 0.0)
+                    if count:
+                        entries[label] = {'count': count, 'sum': round(total, 4), 'avg': round(total / count, 4)}
+                else:
+                    delta = value - (old or 0)
+                    if delta:
+                        entries[label] = delta
+            if entries:
+                summary[name] = entries
+        return summary
+
+    def _get_or_create(self, name, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            return metric
+
+
+registry = MetricsRegistry()
+
+
+def record_run(path, run_name, before, **extra):
+    """실행 한 번의 측정값 증가분을 JSON Lines 파일에 추가하고 반환"""
+    record = {
+        'run': run_name,
+        'finished_at': datetime.now().isoformat(),
+        **extra,
+        'metrics': registry.summarize_since(before)
+    }
+
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    except OSError as e:
+        print(f"⚠️  실행 측정값 저장 실패: {e}")
+    return record
+
+
+def print_stage_summary(record):
+    """실행 기록에서 단계별 총 소요 시간 출력 (큰 순서)"""
+    stages = []
+    for name, entries in record['metrics'].items():
+        if not name.endswith('_seconds'):
+            continue
+        for label, value in entries.items():
+            stages.append((value['sum'], name, label, value['count']))
+
+    if not stages:
+        return
+    print("단계별 소요 시간 (동시 실행 시 합계는 실제 시간보다 클 수 있음):")
+    for total, name, label, count in sorted(stages, reverse=True)[:10]:
+        print(f"  {name}{'' if label == '{}' else label}: {total:.2f}초 / {count}회")
+
+
+class InstrumentedSupabase:
+    """Supabase 클라이언트 래퍼: 테이블/함수별 execute() 왕복 시간 기록"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name):
+        return _TimedQuery(self._client.table(name), name)
+
+    def rpc(self, name, *args, **kwargs):
+        return _TimedQuery(self._client.rpc(name, *args, **kwargs), f"rpc:{name}")
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class _TimedQuery:
+    """쿼리 빌더 메서드 체인을 그대로 전달하고 execute()만 시간 측정"""
+
+    def __init__(self, builder, table):
+        self._builder = builder
+        self._table = table
+
+    def execute(self):
+        histogram = registry.histogram('supabase_request_seconds', 'Supabase 요청 왕복 시간 (테이블별)')
+        try:
+            with histogram.time(table=self._table):
+                return self._builder.execute()
+        except Exception:
+            registry.counter('supabase_errors_total', 'Supabase 요청 오류 수').inc(table=self._table)
+            raise
+
+    def __getattr__(self, name):
+        value = getattr(self._builder, name)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            result = value(*args, **kwargs)
+            return _TimedQuery(result, self._table) if hasattr(result, 'execute') else result
+        return call
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key):
+    if not key:
+        return ''
+    escaped = (
+        (name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in key
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
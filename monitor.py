@@ -1,165 +1,239 @@
 # monitor.py
 from supabase import create_client
 from datetime import datetime, timedelta
-from law_api import LawAPI
 from ai_analyzer import AIAnalyzer
-from config import SUPABASE_URL, SUPABASE_KEY
+from analysis_queue import AnalysisQueue, ANALYSIS_PENDING_SUMMARY
+from law_diff import split_articles, diff_articles, has_changes, render_diff
+from snapshot_store import LawSnapshotStore
+from detection_engine import DetectionEngine, LawMasterSchema
+from law_id_index import LawIdResolver
+import metrics
+from config import (
+    SUPABASE_URL, SUPABASE_KEY, MONITOR_MAX_WORKERS,
+    ANALYSIS_WORKERS, ANALYSIS_REQUESTS_PER_MINUTE, ANALYSIS_MAX_RETRIES,
+    LAW_SNAPSHOT_PATH, METRICS_RUNS_PATH, LAW_ID_INDEX_PATH
+)
+import argparse
 import time
 
 class LawMonitor:
     def __init__(self):
-        self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-        self.law_api = LawAPI()
+        self.supabase = metrics.InstrumentedSupabase(create_client(SUPABASE_URL, SUPABASE_KEY))
+        self.schema = LawMasterSchema(pending_summary=ANALYSIS_PENDING_SUMMARY)
+        self.engine = DetectionEngine(
+            self.supabase,
+            self.schema,
+            on_amendment=self._on_amendment,
+            on_unchanged=self._on_unchanged,
+            get_version=self._get_law_version
+        )
+        # 법제처 API/일괄 저장/법령ID 매핑은 감지 엔진과 공유
+        self.law_api = self.engine.law_api
+        self.writer = self.engine.writer
+        self.resolver = self.engine.resolver
         self.ai_analyzer = AIAnalyzer()
+        self.snapshot_store = LawSnapshotStore(LAW_SNAPSHOT_PATH)
+        self.analysis_queue = AnalysisQueue(
+            self.ai_analyzer,
+            on_complete=self._on_analysis_complete,
+            on_failure=self._on_analysis_failure,
+            workers=ANALYSIS_WORKERS,
+            requests_per_minute=ANALYSIS_REQUESTS_PER_MINUTE,
+            max_retries=ANALYSIS_MAX_RETRIES
+        )
     
-    def check_all_laws(self):
-        """모든 활성 법령 확인"""
+    def check_all_laws(self, max_workers=None, full=False):
+        """모든 활성 법령 확인 (max_workers개 법령을 동시에 확인)
+
+        지난 성공 실행 이후 공포된 법령 목록을 한 번에 조회하여 일치하는 법령만 확인.
+        full=True이거나 기준 시점이 없으면 모든 법령을 개별 조회.
+        """
+        max_workers = max_workers or MONITOR_MAX_WORKERS
+        
         print(f"\n{'='*50}")
         print(f"법령 모니터링 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*50}\n")
         
-        start_time = time.time()
+        metrics_before = metrics.registry.snapshot()
         
         try:
             # 활성화된 법령 목록 조회
-            result = self.supabase.table('law_master')\
-                .select('*')\
-                .eq('is_active', True)\
-                .execute()
-            
-            laws = result.data
+            laws = self.schema.load_laws(self.supabase)
             
             if not laws:
                 print("모니터링할 법령이 없습니다.")
                 return
             
-            print(f"총 {len(laws)}개 법령 확인 중...\n")
-            
-            changes_found = 0
+            self._requeue_pending_analyses(laws)
             
-            for law in laws:
-                print(f"📋 {law['law_name']} 확인 중...")
-                
-                try:
-                    has_changes = self.check_law(law)
-                    if has_changes:
-                        changes_found += 1
-                        print(f"  ✅ 변경사항 발견!")
-                    else:
-                        print(f"  ⏺️  변경사항 없음")
-                    
-                    # 마지막 확인일 업데이트
-                    self.supabase.table('law_master')\
-                        .update({'last_check_date': datetime.now().isoformat()})\
-                        .eq('id', law['id'])\
-                        .execute()
-                    
-                except Exception as e:
-                    print(f"  ❌ 오류: {e}")
-                    self._log_error(law['law_code'], str(e))
-                
-                print()
+            result = self.engine.run(laws, full=full, max_workers=max_workers)
             
-            execution_time = int(time.time() - start_time)
+            # 남은 AI 분석이 끝날 때까지 대기 (변경 감지는 이미 완료)
+            if self.analysis_queue.pending_count():
+                print(f"\n🤖 남은 AI 분석 {self.analysis_queue.pending_count()}건 처리 대기 중...")
+            self.analysis_queue.join()
             
-            # 모니터링 로그 기록
-            self.supabase.table('monitoring_logs').insert({
-                'check_date': datetime.now().isoformat(),
-                'law_code': 'ALL',
-                'status': 'success',
-                'changes_detected': changes_found > 0,
-                'execution_time': execution_time
-            }).execute()
+            # 모아둔 확인일/후속 업무 일괄 저장 후 실행 기록
+            write_failures = self.engine.finish(result)
+            execution_time = int(time.time() - result['started_at'])
+            run_record = metrics.record_run(
+                METRICS_RUNS_PATH, 'monitor', metrics_before,
+                laws=result['laws'], changes=result['changes'], execution_time=execution_time
+            )
             
-            print(f"{'='*50}")
-            print(f"모니터링 완료: 총 {changes_found}건의 변경사항 발견")
+            print(f"\n{'='*50}")
+            print(f"모니터링 완료: 총 {result['changes']}건의 변경사항 발견")
             print(f"실행 시간: {execution_time}초")
+            if write_failures:
+                print(f"저장 실패: {len(write_failures)}건")
+            self._print_cache_stats()
+            metrics.print_stage_summary(run_record)
             print(f"{'='*50}\n")
             
         except Exception as e:
             print(f"모니터링 오류: {e}")
             self._log_error('ALL', str(e))
     
-    def check_law(self, law_data):
+    def check_law(self, law_data, law_info=None):
         """개별 법령 확인"""
-        law_code = law_data['law_code']
-        law_name = law_data['law_name']
-        last_amendment = law_data.get('last_amendment_date')
+        return self.engine.check_law(law_data, law_info)
+    
+    def _print_cache_stats(self):
+        """법제처 API 응답/AI 분석 캐시 통계 출력"""
+        stats = self.law_api.cache_stats()
+        if stats:
+            print(f"API 캐시: 적중 {stats['hits']}건, 재검증 {stats['revalidated']}건, "
+                  f"미적중 {stats['misses']}건 (적중률 {stats['hit_rate']:.0%})")
         
-        # 법령 검색
-        search_results = self.law_api.search_law(law_name)
+        analysis_stats = self.ai_analyzer.cache_stats()
+        if analysis_stats:
+            print(f"AI 분석 캐시: 적중 {analysis_stats['hits']}건, 미적중 {analysis_stats['misses']}건")
+    
+    def _on_amendment(self, law_data, amendment_info, amendment_id):
+        """신규 개정 저장 후 AI 분석 대기열에 추가"""
+        self._queue_analysis(amendment_id, law_data, self._build_analysis_content(amendment_info))
+    
+    def _on_unchanged(self, law_data, law_info):
+        """변경사항 없음 (다음 개정과 비교할 기준본이 없으면 지금 저장)"""
+        self._seed_snapshot(law_info.get('law_id'), law_info)
+    
+    def _get_law_version(self, law_id, amend_date):
+        """법령 상세 정보 (로컬 저장소에 이미 있는 버전이면 요청하지 않음)"""
+        if not self.snapshot_store.has_changed(law_id, amend_date):
+            stored = self.snapshot_store.get_law_info(law_id, amend_date)
+            if stored:
+                return stored
         
-        if not search_results:
-            print(f"  ⚠️  법령 검색 결과 없음")
-            return False
+        return self.law_api.get_law_info(law_id)
+    
+    def _build_analysis_content(self, amendment_info):
+        """AI 분석에 보낼 내용 (이전 버전 대비 변경된 조문만, 기준본이 없으면 앞부분)"""
+        if amendment_info.get('law_id') and amendment_info.get('full_text'):
+            self.snapshot_store.put(amendment_info)
+        return self._render_analysis_content(amendment_info)
+    
+    def _render_analysis_content(self, amendment_info):
+        """저장소의 직전 버전과 비교한 변경 조문 (저장 없이 계산하므로 다시 분석할 때도 사용)"""
+        law_id = amendment_info.get('law_id')
+        full_text = amendment_info.get('full_text')
+        content = amendment_info.get('content') or ''
         
-        # 첫 번째 결과 사용
-        law_info = search_results[0]
-        current_amend_date = law_info.get('amend_date')
+        if not law_id or not full_text:
+            return content[:5000]
         
-        if not current_amend_date:
-            return False
+        previous_meta, previous_units = self.snapshot_store.latest_units(law_id, before=amendment_info.get('amend_date'))
         
-        # 날짜 비교
-        current_date = self._parse_date(current_amend_date)
+        if not previous_units:
+            return full_text[:5000]
         
-        if last_amendment:
-            last_date = self._parse_date(last_amendment)
-            if current_date <= last_date:
-                return False  # 변경사항 없음
+        units = split_articles(full_text)
+        diff = diff_articles(previous_units, units)
+        if not has_changes(diff):
+            return '[조문 변경 없음] 부칙 등 조문 외 부분이 개정되었습니다.\n\n' + full_text[:4000]
         
-        # 새로운 개정 발견!
-        print(f"  🆕 새 개정 발견: {current_amend_date}")
+        print(f"  📝 [{amendment_info.get('law_name')}] {previous_meta.get('amend_date')} 대비 변경 조문: "
+              f"변경 {len(diff['changed'])}, 신설 {len(diff['added'])}, 삭제 {len(diff['removed'])}")
+        return render_diff(diff, max_chars=5000)
+    
+    def _seed_snapshot(self, law_id, law_info=None):
+        """기준본이 없는 법령은 현재 버전을 한 번 저장 (law_info가 상세 정보면 그대로 사용)"""
+        if not law_id or self.snapshot_store.has_version(law_id):
+            return
         
-        # 상세 정보 조회
-        law_id = law_info.get('law_id')
-        if law_id:
+        if law_info and 'full_text' in law_info:
+            detail_info = law_info
+        else:
             detail_info = self.law_api.get_law_info(law_id)
-            if detail_info:
-                self._save_amendment(law_data, detail_info)
-        
-        # 최종 개정일 업데이트
-        self.supabase.table('law_master')\
-            .update({'last_amendment_date': current_date.date().isoformat()})\
-            .eq('law_code', law_code)\
-            .execute()
-        
-        return True
+        if detail_info:
+            self.snapshot_store.put(detail_info)
     
-    def _save_amendment(self, law_data, amendment_info):
-        """개정 정보 저장 및 분석"""
-        law_code = law_data['law_code']
+    def _queue_analysis(self, amendment_id, law_data, content):
+        """AI 분석 작업 추가 (content는 변경 조문 등 분석할 내용)"""
+        print(f"  🤖 [{law_data['law_name']}] AI 분석 대기열에 추가")
+        self.analysis_queue.start()
+        self.analysis_queue.submit({
+            'amendment_id': amendment_id,
+            'law_data': law_data,
+            'law_name': law_data['law_name'],
+            'content': content[:5000]  # 최대 5000자까지만
+        })
+    
+    def _requeue_pending_analyses(self, laws):
+        """이전 실행에서 분석되지 못한 개정 이력을 다시 대기열에 추가"""
+        laws_by_code = {law['law_code']: law for law in laws}
         
-        # 원문 내용
-        content = amendment_info.get('content', '')
+        try:
+            result = self.supabase.table('law_amendments')\
+                .select('id, law_code, amendment_date, amendment_no, original_text')\
+                .eq('summary', ANALYSIS_PENDING_SUMMARY)\
+                .execute()
+        except Exception as e:
+            print(f"⚠️  분석 대기 목록 조회 실패: {e}")
+            return
         
-        # AI 분석
-        print(f"  🤖 AI 분석 중...")
-        analysis = self.ai_analyzer.analyze_amendment(
-            law_data['law_name'],
-            content[:5000]  # 최대 5000자까지만
-        )
+        requeued = 0
+        for row in result.data or []:
+            law_data = laws_by_code.get(row.get('law_code'))
+            if law_data:
+                self._queue_analysis(row['id'], law_data, self._pending_analysis_content(row))
+                requeued += 1
         
-        # 개정 이력 저장
-        amendment_data = {
-            'law_code': law_code,
-            'amendment_date': self._parse_date(amendment_info.get('amend_date')).date().isoformat(),
-            'enforcement_date': self._parse_date(amendment_info.get('enf_date')).date().isoformat() if amendment_info.get('enf_date') else None,
-            'amendment_no': amendment_info.get('amend_no'),
-            'amendment_type': amendment_info.get('law_type'),
-            'original_text': content,
-            'summary': analysis['summary'],
-            'impact_analysis': analysis['impact_analysis'],
-            'is_reviewed': False
-        }
+        if requeued:
+            print(f"⏳ 분석 대기 중이던 개정 이력 {requeued}건을 다시 분석합니다.\n")
+    
+    def _pending_analysis_content(self, row):
+        """다시 분석할 개정 이력의 분석 내용 (저장소에 그 버전이 있으면 변경 조문, 없으면 저장된 원문)"""
+        law_id = self.resolver.get(row['law_code'])
+        stored = None
+        if law_id and row.get('amendment_date'):
+            stored = self.snapshot_store.get_law_info(law_id, row['amendment_date'], row.get('amendment_no'))\
+                or self.snapshot_store.get_law_info(law_id, row['amendment_date'])
         
-        result = self.supabase.table('law_amendments').insert(amendment_data).execute()
+        if not stored:
+            return row.get('original_text') or ''
+        return self._render_analysis_content(stored)
+    
+    def _on_analysis_complete(self, job, analysis):
+        """분석 결과를 개정 이력에 반영하고 후속 업무 생성"""
+        self.supabase.table('law_amendments')\
+            .update({
+                'summary': analysis['summary'],
+                'impact_analysis': analysis['impact_analysis']
+            })\
+            .eq('id', job['amendment_id'])\
+            .execute()
         
-        if result.data:
-            amendment_id = result.data[0]['id']
-            
-            # 후속 업무 생성
-            self._create_follow_up_tasks(amendment_id, analysis['tasks'], law_data)
+        self._create_follow_up_tasks(job['amendment_id'], analysis['tasks'], job['law_data'])
+        print(f"  ✅ [{job['law_name']}] AI 분석 완료")
+    
+    def _on_analysis_failure(self, job, error):
+        """재시도 후에도 실패한 분석 기록"""
+        self.supabase.table('law_amendments')\
+            .update({'summary': f'분석 오류: {error}'})\
+            .eq('id', job['amendment_id'])\
+            .execute()
+        
+        self._log_error(job['law_data']['law_code'], f"AI 분석 실패: {error}")
     
     def _create_follow_up_tasks(self, amendment_id, tasks, law_data):
         """후속 업무 생성"""
@@ -188,35 +262,38 @@ class LawMonitor:
                 'status': 'pending'
             }
             
-            self.supabase.table('follow_up_tasks').insert(task_data).execute()
-    
-    def _parse_date(self, date_str):
-        """날짜 문자열 파싱"""
-        if not date_str:
-            return datetime.now()
-        
-        # YYYYMMDD 형식
-        date_str = date_str.replace('-', '').replace('.', '').replace('/', '')
-        
-        try:
-            return datetime.strptime(date_str[:8], '%Y%m%d')
-        except:
-            return datetime.now()
+            self.writer.insert('follow_up_tasks', task_data)
     
     def _log_error(self, law_code, error_message):
         """오류 로그 기록"""
-        self.supabase.table('monitoring_logs').insert({
-            'check_date': datetime.now().isoformat(),
-            'law_code': law_code,
-            'status': 'error',
-            'changes_detected': False,
-            'error_message': error_message
-        }).execute()
+        self.schema.log_error(self.supabase, law_code, error_message)
+
+def print_text_as_of(law, date):
+    """로컬 저장소에서 date 시점의 법령 전문 출력 (law: law_master.law_code 또는 법제처 법령ID)"""
+    law_id = LawIdResolver(None, LAW_ID_INDEX_PATH).get(law) or law
+    text = LawSnapshotStore(LAW_SNAPSHOT_PATH).text_as_of(law_id, date)
+    if text is None:
+        print(f"❌ [{law}] {date} 시점에 저장된 버전이 없습니다.")
+        return 1
+    print(text)
+    return 0
 
 def main():
     """메인 실행"""
+    parser = argparse.ArgumentParser(description='법령 개정 모니터링')
+    parser.add_argument('--full', action='store_true', help='증분 조회 없이 모든 법령을 개별 확인')
+    parser.add_argument('--workers', type=int, help='동시에 확인할 법령 수')
+    parser.add_argument('--as-of', metavar='YYYY-MM-DD', help='모니터링 대신 --law 법령의 해당 날짜 시점 전문 출력')
+    parser.add_argument('--law', help='--as-of로 조회할 법령 (law_code 또는 법제처 법령ID)')
+    args = parser.parse_args()
+    
+    if args.as_of:
+        if not args.law:
+            parser.error('--as-of에는 --law가 필요합니다.')
+        raise SystemExit(print_text_as_of(args.law, args.as_of))
+    
     monitor = LawMonitor()
-    monitor.check_all_laws()
+    monitor.check_all_laws(max_workers=args.workers, full=args.full)
 
 if __name__ == "__main__":
     main()
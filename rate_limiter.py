@@ -0,0 +1,136 @@
+# rate_limiter.py
+# 외부 API 호출용 적응형 요청 속도 제한 (토큰 버킷) 및 서킷 브레이커
+
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """장애로 판단되어 호출을 일시 중단한 상태"""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} 호출 일시 중단 ({retry_after:.0f}초 후 재시도)")
+        self.retry_after = retry_after
+
+
+class AdaptiveRateLimiter:
+    """토큰 버킷 속도 제한
+
+    429/5xx/시간 초과가 발생하면 속도를 절반으로 줄이고, 성공이 이어지면 최대 속도까지 천천히 회복한다.
+    """
+
+    def __init__(self, rate_per_second, burst=None, min_rate=0.5, recovery_step=0.1):
+        self.max_rate = rate_per_second
+        self.min_rate = min(min_rate, rate_per_second)
+        self.recovery_step = recovery_step
+        self.rate = rate_per_second
+        self.burst = burst or max(1, int(rate_per_second))
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def acquire(self):
+        """토큰이 생길 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.recovery_step)
+
+    def on_throttle(self, retry_after=None):
+        """속도 제한/장애 응답 시 속도 감소 (Retry-After가 있으면 그동안 요청 중단)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class CircuitBreaker:
+    """연속 실패가 failure_threshold회 이상이면 reset_timeout초 동안 호출 차단
+
+    차단 시간이 지나면 한 번만 시험 호출을 허용하고, 성공하면 정상 상태로 돌아간다.
+    시험 호출 결과가 reset_timeout초 안에 기록되지 않으면 다음 호출을 새 시험 호출로 허용한다.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._trial_started = 0.0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def before_call(self):
+        """호출 가능 여부 확인 (차단 중이면 CircuitOpenError)"""
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == 'closed':
+                return
+            trial_stale = now - self._trial_started >= self.reset_timeout
+            if state == 'half_open' and (not self._trial_running or trial_stale):
+                self._trial_running = True
+                self._trial_started = now
+                return
+            raise CircuitOpenError(self.name, self._retry_after(now))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_running:
+                    print(f"⛔ {self.name}: 연속 {self._failures}회 실패, {self.reset_timeout:.0f}초간 호출 중단")
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def retry_after(self):
+        """다시 호출할 수 있을 때까지 남은 시간 (초)"""
+        with self._lock:
+            return self._retry_after(time.monotonic())
+
+    def _state(self, now):
+        if self._opened_at is None:
+            return 'closed'
+        if now - self._opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def _retry_after(self, now):
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - now)
@@ -0,0 +1,218 @@
+# snapshot_store.py
+# 법령 버전별 전문 로컬 저장소 (조문 단위 내용 주소 청크 + zlib 압축)
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from law_diff import split_articles
+
+# 버전 메타데이터로 저장할 get_law_info 필드 (본문 제외)
+META_FIELDS = ('law_id', 'law_name', 'law_type', 'amend_date', 'enf_date', 'amend_no')
+
+
+class LawSnapshotStore:
+    def __init__(self, path):
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS chunks (
+                hash TEXT PRIMARY KEY,
+                data BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS versions (
+                law_id TEXT NOT NULL,
+                amend_date TEXT NOT NULL,
+                amend_no TEXT NOT NULL,
+                meta TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                content_chunk TEXT,
+                manifest TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (law_id, amend_date, amend_no)
+            );
+        ''')
+        self._conn.commit()
+
+    def put(self, law_info):
+        """get_law_info 결과 저장 (이미 있는 조문은 다시 저장하지 않음), 저장했으면 True"""
+        law_id = law_info.get('law_id')
+        full_text = law_info.get('full_text') or law_info.get('content') or ''
+        if not law_id or not law_info.get('amend_date'):
+            return False
+
+        units = split_articles(full_text)
+        manifest = [[key, self._hash(text)] for key, text in units.items()]
+        content = law_info.get('content')
+        chunks = {chunk_hash: units[key] for key, chunk_hash in manifest}
+        content_chunk = None
+        if content:
+            content_chunk = self._hash(content)
+            chunks[content_chunk] = content
+
+        with self._lock:
+            # 같은 내용의 조문은 해시가 같으므로 버전이 달라도 한 번만 저장됨
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO chunks (hash, data) VALUES (?, ?)',
+                [(h, zlib.compress(text.encode('utf-8'))) for h, text in chunks.items()]
+            )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO versions '
+                '(law_id, amend_date, amend_no, meta, content_hash, content_chunk, manifest, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    law_id,
+                    _normalize_date(law_info['amend_date']),
+                    law_info.get('amend_no') or '',
+                    json.dumps({field: law_info.get(field) for field in META_FIELDS}, ensure_ascii=False),
+                    self._hash(' '.join(full_text.split())),
+                    content_chunk,
+                    json.dumps(manifest, ensure_ascii=False),
+                    time.time()
+                )
+            )
+            self._conn.commit()
+
+        return True
+
+    def has_version(self, law_id):
+        """저장된 버전이 하나라도 있는지"""
+        with self._lock:
+            row = self._conn.execute('SELECT 1 FROM versions WHERE law_id = ? LIMIT 1', (law_id,)).fetchone()
+        return row is not None
+
+    def has_changed(self, law_id, amend_date, amend_no=None):
+        """네트워크 요청 없이 확인: 저장된 최신 버전보다 새로운 공포일자(또는 공포번호)인지"""
+        latest = self._latest_row(law_id)
+        if not latest:
+            return True
+
+        latest_date, latest_no = latest[0], latest[1]
+        amend_date = _normalize_date(amend_date)
+        if amend_date != latest_date:
+            return amend_date > latest_date
+        return bool(amend_no) and amend_no != latest_no
+
+    def get_law_info(self, law_id, amend_date=None, amend_no=None):
+        """저장된 버전을 get_law_info 형식으로 반환 (amend_date 미지정 시 최신), 없으면 None"""
+        with self._lock:
+            if amend_date is None:
+                row = self._conn.execute(
+                    'SELECT meta, content_chunk, manifest FROM versions WHERE law_id = ? '
+                    'ORDER BY amend_date DESC, created_at DESC LIMIT 1',
+                    (law_id,)
+                ).fetchone()
+            elif amend_no:
+                row = self._conn.execute(
+                    'SELECT meta, content_chunk, manifest FROM versions '
+                    'WHERE law_id = ? AND amend_date = ? AND amend_no = ?',
+                    (law_id, _normalize_date(amend_date), amend_no)
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    'SELECT meta, content_chunk, manifest FROM versions '
+                    'WHERE law_id = ? AND amend_date = ? ORDER BY created_at DESC LIMIT 1',
+                    (law_id, _normalize_date(amend_date))
+                ).fetchone()
+
+        return self._build_law_info(row) if row else None
+
+    def text_as_of(self, law_id, date):
+        """date 시점의 법령 전문 (그 이전 마지막 공포 버전), 없으면 None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT meta, content_chunk, manifest FROM versions '
+                'WHERE law_id = ? AND amend_date <= ? '
+                'ORDER BY amend_date DESC, created_at DESC LIMIT 1',
+                (law_id, _normalize_date(date))
+            ).fetchone()
+
+        if not row:
+            return None
+        return self._build_law_info(row)['full_text']
+
+    def latest_units(self, law_id, before=None):
+        """최신 버전(before 지정 시 그 이전 버전)의 (메타데이터, {조문 키: 텍스트}), 없으면 (None, None)"""
+        query = 'SELECT meta, content_chunk, manifest FROM versions WHERE law_id = ?'
+        params = [law_id]
+        if before:
+            query += ' AND amend_date < ?'
+            params.append(_normalize_date(before))
+        query += ' ORDER BY amend_date DESC, created_at DESC LIMIT 1'
+
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+
+        if not row:
+            return None, None
+
+        meta, _, manifest = row
+        return json.loads(meta), self._load_units(json.loads(manifest))
+
+    def stats(self):
+        """저장 용량 확인용 (버전 수, 청크 수, 압축 후 바이트)"""
+        with self._lock:
+            versions = self._conn.execute('SELECT COUNT(*) FROM versions').fetchone()[0]
+            chunks, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM chunks'
+            ).fetchone()
+        return {'versions': versions, 'chunks': chunks, 'bytes': size}
+
+    def _latest_row(self, law_id):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT amend_date, amend_no FROM versions WHERE law_id = ? '
+                'ORDER BY amend_date DESC, created_at DESC LIMIT 1',
+                (law_id,)
+            ).fetchone()
+
+    def _build_law_info(self, row):
+        meta, content_chunk, manifest = row
+        law_info = json.loads(meta)
+        units = self._load_units(json.loads(manifest))
+        law_info['full_text'] = '\n'.join(units.values()) or None
+
+        content = self._load_chunks([content_chunk]).get(content_chunk) if content_chunk else None
+        law_info['content'] = content
+        return law_info
+
+    def _load_units(self, manifest):
+        texts = self._load_chunks([chunk_hash for _, chunk_hash in manifest])
+        return {key: texts[chunk_hash] for key, chunk_hash in manifest if chunk_hash in texts}
+
+    def _load_chunks(self, hashes):
+        hashes = list(dict.fromkeys(hashes))
+        if not hashes:
+            return {}
+
+        texts = {}
+        with self._lock:
+            # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for i in range(0, len(hashes), 500):
+                part = hashes[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT hash, data FROM chunks WHERE hash IN ({','.join('?' * len(part))})",
+                    part
+                ).fetchall()
+                for chunk_hash, data in rows:
+                    texts[chunk_hash] = zlib.decompress(data).decode('utf-8')
+        return texts
+
+    def _hash(self, text):
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _normalize_date(value):
+    """datetime / '2024-01-09' / '20240109' -> '20240109'"""
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y%m%d')
+    return ''.join(ch for ch in str(value or '') if ch.isdigit())[:8]
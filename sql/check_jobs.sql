@@ -0,0 +1,53 @@
+-- 개정사항 확인 작업 기록 (jobs.py SupabaseJobStore, 여러 gunicorn 작업자/서버 간 공유)
+-- Supabase SQL Editor에서 실행
+
+create table if not exists check_jobs (
+  id text primary key,
+  kind text not null,
+  trigger text not null,
+  status text not null default 'running',
+  holder text not null,
+  started_at timestamptz not null default now(),
+  finished_at timestamptz,
+  heartbeat_at timestamptz not null default now(),
+  progress jsonb not null default '{"done": 0, "total": null, "found": 0}',
+  result jsonb,
+  error text
+);
+
+-- 종류별로 실행 중인 작업은 하나만
+create unique index if not exists check_jobs_running_idx
+  on check_jobs (kind)
+  where status = 'running';
+
+create index if not exists check_jobs_started_idx
+  on check_jobs (started_at desc);
+
+-- 실행 중인 작업이 없으면 새 작업을 시작하고, 있으면 그 작업을 반환
+-- (갱신이 p_stale_seconds 이상 멈춘 작업은 프로세스가 종료된 것으로 보고 실패 처리)
+create or replace function claim_check_job(p_id text, p_kind text, p_trigger text, p_holder text, p_stale_seconds integer)
+returns setof check_jobs
+language plpgsql
+as $$
+begin
+  update check_jobs
+     set status = 'failed',
+         error = '작업 프로세스 응답 없음',
+         finished_at = now()
+   where kind = p_kind
+     and status = 'running'
+     and heartbeat_at < now() - make_interval(secs => p_stale_seconds);
+
+  insert into check_jobs (id, kind, trigger, holder)
+  values (p_id, p_kind, p_trigger, p_holder)
+  on conflict do nothing;
+
+  return query
+    select * from check_jobs
+     where kind = p_kind and status = 'running'
+     limit 1;
+end;
+$$;
+
+-- 오래된 작업 기록 정리 (필요할 때 실행)
+-- delete from check_jobs where status <> 'running' and started_at < now() - interval '30 days';
@@ -0,0 +1,19 @@
+-- 대시보드 통계 (/api/stats)를 한 번의 호출로 집계
+-- Supabase SQL Editor에서 실행
+
+create or replace function dashboard_stats()
+returns json
+language sql
+stable
+as $$
+  select json_build_object(
+    'monitored_laws', (select count(*) from monitored_laws where is_active),
+    'unread_amendments', (select count(*) from law_amendments where not "읽음여부"),
+    'total_amendments', (select count(*) from law_amendments)
+  );
+$$;
+
+-- 미확인 개정 수는 부분 인덱스만 읽도록
+create index if not exists law_amendments_unread_idx
+  on law_amendments (id)
+  where not "읽음여부";
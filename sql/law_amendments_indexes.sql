@@ -0,0 +1,9 @@
+-- /api/amendments 키셋 페이지네이션용 인덱스
+-- Supabase SQL Editor에서 실행
+
+create index if not exists law_amendments_date_id_idx
+  on law_amendments ("공포일자" desc, id desc);
+
+-- 법령별 조회
+create index if not exists law_amendments_law_date_idx
+  on law_amendments (law_name, "공포일자" desc, id desc);
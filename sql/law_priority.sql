@@ -0,0 +1,11 @@
+-- 법령별 중요도 (예약 확인 우선순위, adaptive_scheduler.py)
+-- Supabase SQL Editor에서 실행
+-- high: 2배 자주 확인, medium: 기본, low: 절반 빈도
+
+alter table monitored_laws
+  add column if not exists priority text not null default 'medium'
+  check (priority in ('high', 'medium', 'low'));
+
+alter table law_master
+  add column if not exists priority text not null default 'medium'
+  check (priority in ('high', 'medium', 'low'));
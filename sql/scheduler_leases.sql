@@ -0,0 +1,36 @@
+-- 예약 작업 실행 담당 리스 (여러 gunicorn 작업자/서버 중 하나만 실행)
+-- Supabase SQL Editor에서 실행
+
+create table if not exists scheduler_leases (
+  name text primary key,
+  holder text not null,
+  expires_at timestamptz not null
+);
+
+-- 리스가 없거나 만료되었거나 이미 보유 중이면 획득/갱신하고 true 반환
+create or replace function acquire_scheduler_lease(p_name text, p_holder text, p_ttl_seconds integer)
+returns boolean
+language sql
+as $$
+  with acquired as (
+    insert into scheduler_leases (name, holder, expires_at)
+    values (p_name, p_holder, now() + make_interval(secs => p_ttl_seconds))
+    on conflict (name) do update
+      set holder = excluded.holder,
+          expires_at = excluded.expires_at
+      where scheduler_leases.expires_at < now()
+         or scheduler_leases.holder = excluded.holder
+    returning 1
+  )
+  select exists (select 1 from acquired);
+$$;
+
+-- 보유 중인 리스를 즉시 만료 (종료 시 다른 프로세스가 바로 이어받도록)
+create or replace function release_scheduler_lease(p_name text, p_holder text)
+returns void
+language sql
+as $$
+  update scheduler_leases
+     set expires_at = now()
+   where name = p_name and holder = p_holder;
+$$;
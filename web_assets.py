@@ -0,0 +1,116 @@
+# web_assets.py
+# Flask 응답 압축(gzip/brotli), ETag 조건부 응답(304), 대시보드 정적 파일 버전 URL
+
+import gzip
+import hashlib
+import os
+import re
+import threading
+
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # brotli 패키지가 없으면 gzip만 사용
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'application/json', 'text/html', 'text/css', 'text/plain',
+    'application/javascript', 'text/javascript', 'image/svg+xml'
+)
+MIN_COMPRESS_BYTES = 500
+STATIC_MAX_AGE = 365 * 24 * 3600  # 버전 URL로 요청한 정적 파일은 1년간 캐시
+
+# index.html 안의 로컬 js/css 참조 (외부 URL 제외)
+ASSET_REFERENCE = re.compile(r'''(src|href)="(?!https?:|//)([^"?#]+\.(?:js|css))"''')
+
+_fingerprints = {}
+_fingerprints_lock = threading.Lock()
+
+
+def init_app(app):
+    """모든 응답에 압축/ETag 처리 적용"""
+    app.after_request(_finalize_response)
+
+
+def index_response(directory, filename='index.html'):
+    """로컬 js/css 참조를 버전 URL(?v=해시)로 바꾼 HTML 응답 (HTML 자체는 매번 재검증)"""
+    response = send_from_directory(directory, filename)
+    response.direct_passthrough = False
+
+    html = response.get_data(as_text=True)
+    html = ASSET_REFERENCE.sub(
+        lambda match: f'{match.group(1)}="{match.group(2)}?v={fingerprint(directory, match.group(2))}"',
+        html
+    )
+    response.set_data(html)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def static_response(directory, path):
+    """정적 파일 응답 (현재 버전 URL이면 장기 캐시, 아니면 ETag로 재검증)"""
+    response = send_from_directory(directory, path)
+
+    version = request.args.get('v')
+    if version and version == fingerprint(directory, path):
+        response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}, immutable'
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def fingerprint(directory, path):
+    """파일 내용 해시 앞 12자리 (수정 시각/크기가 같으면 다시 계산하지 않음), 파일이 없으면 ''"""
+    full_path = os.path.join(directory, path)
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        return ''
+
+    cache_key = (os.path.abspath(full_path), stat.st_mtime_ns, stat.st_size)
+    with _fingerprints_lock:
+        cached = _fingerprints.get(cache_key)
+    if cached:
+        return cached
+
+    with open(full_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    with _fingerprints_lock:
+        _fingerprints[cache_key] = digest
+    return digest
+
+
+def _finalize_response(response):
+    """GET 성공 응답을 압축하고 강한 ETag를 붙여 변경이 없으면 304로 응답"""
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+        return response
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+
+    # send_from_directory 응답은 파일 스트림이므로 본문을 읽어서 처리
+    response.direct_passthrough = False
+    data = response.get_data()
+
+    encoding = _choose_encoding() if len(data) >= MIN_COMPRESS_BYTES else None
+    if encoding and 'Content-Encoding' not in response.headers:
+        if encoding == 'br':
+            data = brotli.compress(data)
+        else:
+            data = gzip.compress(data, compresslevel=6, mtime=0)
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+
+    # 압축 결과도 내용이 같으면 항상 같으므로 압축 후 본문으로 ETag 계산
+    response.set_etag(hashlib.sha256(data).hexdigest()[:32])
+    return response.make_conditional(request)
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted.quality('br') > 0:
+        return 'br'
+    if accepted.quality('gzip') > 0:
+        return 'gzip'
+    return None